@@ -18,12 +18,15 @@ from app.models import (
     Enrollment,
     Persona,
     Rubric,
+    RubricVersion,
     Scenario,
     Assignment,
     Conversation,
     Message,
     Grade,
     DailyAnalytics,
+    RollupState,
+    RollupTouchedDay,
 )
 
 # Alembic Config object
@@ -0,0 +1,48 @@
+"""Running grading ledger on conversations
+
+The schema is otherwise created by ``Base.metadata.create_all`` (see
+app/scripts/seed.py); this adds the ledger columns to databases seeded
+before them.
+
+Revision ID: 1c7d2e9a4b10
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1c7d2e9a4b10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns() -> set[str]:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns("conversations")}
+
+
+def upgrade() -> None:
+    # Databases created by create_all may already have these
+    existing = _columns()
+    if "grading_ledger" not in existing:
+        op.add_column(
+            "conversations", sa.Column("grading_ledger", postgresql.JSONB(), nullable=True)
+        )
+    if "ledger_message_count" not in existing:
+        op.add_column(
+            "conversations",
+            sa.Column("ledger_message_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    existing = _columns()
+    for name in ("ledger_message_count", "grading_ledger"):
+        if name in existing:
+            op.drop_column("conversations", name)
@@ -0,0 +1,61 @@
+"""Performance indexes for hot query paths
+
+Only indexes: the schema is created by ``Base.metadata.create_all`` (see
+app/scripts/seed.py) and the earlier revisions. The indexes are built with
+CREATE INDEX CONCURRENTLY so a live database keeps accepting writes, and use
+IF NOT EXISTS because a freshly seeded database already has them from the
+model definitions.
+
+Revision ID: 3f9a1c2b7d4e
+Revises: 9a4f6c1d8e23
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c2b7d4e"
+down_revision: Union[str, None] = "9a4f6c1d8e23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    # Student conversation lists and dashboards, newest first
+    ("ix_conversations_user_started", "conversations", ["user_id", "started_at"], None),
+    # Assignment submissions and per-student attempt counts
+    ("ix_conversations_assignment_user", "conversations", ["assignment_id", "user_id"], None),
+    # Transcript loads ordered by time
+    ("ix_messages_conversation_created", "messages", ["conversation_id", "created_at"], None),
+    # Instructor review queue
+    (
+        "ix_grades_needs_review",
+        "grades",
+        [sa.text("feature_anomaly DESC"), "ai_confidence", sa.text("graded_at DESC")],
+        "instructor_override = false AND (ai_confidence < 0.7 OR feature_anomaly = true)",
+    ),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
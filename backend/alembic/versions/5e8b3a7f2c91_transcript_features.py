@@ -0,0 +1,42 @@
+"""Transcript features and anomaly flag on grades
+
+Revision ID: 5e8b3a7f2c91
+Revises: 1c7d2e9a4b10
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b3a7f2c91"
+down_revision: Union[str, None] = "1c7d2e9a4b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns() -> set[str]:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns("grades")}
+
+
+def upgrade() -> None:
+    # Databases created by create_all may already have these
+    existing = _columns()
+    if "transcript_features" not in existing:
+        op.add_column("grades", sa.Column("transcript_features", postgresql.JSONB(), nullable=True))
+    if "feature_anomaly" not in existing:
+        op.add_column(
+            "grades",
+            sa.Column("feature_anomaly", sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+
+
+def downgrade() -> None:
+    existing = _columns()
+    for name in ("feature_anomaly", "transcript_features"):
+        if name in existing:
+            op.drop_column("grades", name)
@@ -0,0 +1,40 @@
+"""Keyset index for assignment submission pages
+
+Revision ID: 8b2e6d41c9a7
+Revises: 3f9a1c2b7d4e
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e6d41c9a7"
+down_revision: Union[str, None] = "3f9a1c2b7d4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Submission pages seek on (started_at, id) within one assignment
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversations_assignment_started",
+            "conversations",
+            ["assignment_id", "started_at", "id"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_conversations_assignment_started",
+            table_name="conversations",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
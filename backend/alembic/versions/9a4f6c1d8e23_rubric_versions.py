@@ -0,0 +1,55 @@
+"""Rubric versions and the version each grade was graded under
+
+Revision ID: 9a4f6c1d8e23
+Revises: 5e8b3a7f2c91
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4f6c1d8e23"
+down_revision: Union[str, None] = "5e8b3a7f2c91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all may already have these
+    inspector = sa.inspect(op.get_bind())
+    if "version" not in {c["name"] for c in inspector.get_columns("rubrics")}:
+        op.add_column(
+            "rubrics", sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+        )
+    if "rubric_version" not in {c["name"] for c in inspector.get_columns("grades")}:
+        op.add_column("grades", sa.Column("rubric_version", sa.Integer(), nullable=True))
+    # Rubrics get their first snapshot when next edited
+    if "rubric_versions" not in inspector.get_table_names():
+        op.create_table(
+            "rubric_versions",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "rubric_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("rubrics.id"),
+                nullable=False,
+            ),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("criteria", postgresql.JSONB(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.UniqueConstraint("rubric_id", "version", name="uq_rubric_version"),
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "rubric_versions" in inspector.get_table_names():
+        op.drop_table("rubric_versions")
+    if "rubric_version" in {c["name"] for c in inspector.get_columns("grades")}:
+        op.drop_column("grades", "rubric_version")
+    if "version" in {c["name"] for c in inspector.get_columns("rubrics")}:
+        op.drop_column("rubrics", "version")
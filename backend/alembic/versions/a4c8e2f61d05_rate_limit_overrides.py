@@ -0,0 +1,34 @@
+"""Per-course and per-scenario rate limit overrides
+
+Revision ID: a4c8e2f61d05
+Revises: e7c41f0a9b36
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e2f61d05"
+down_revision: Union[str, None] = "e7c41f0a9b36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("courses", "scenarios")
+
+
+def upgrade() -> None:
+    # Databases created by create_all may already have these
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        if "rate_limits" not in {c["name"] for c in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("rate_limits", postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "rate_limits")
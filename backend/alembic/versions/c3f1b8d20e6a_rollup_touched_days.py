@@ -0,0 +1,33 @@
+"""Days marked for the analytics rollup by deletes
+
+Revision ID: c3f1b8d20e6a
+Revises: a4c8e2f61d05
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f1b8d20e6a"
+down_revision: Union[str, None] = "a4c8e2f61d05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all may already have this
+    inspector = sa.inspect(op.get_bind())
+    if "rollup_touched_days" not in inspector.get_table_names():
+        op.create_table(
+            "rollup_touched_days",
+            sa.Column("date", sa.Date(), primary_key=True),
+            sa.Column("touched_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_touched_days")
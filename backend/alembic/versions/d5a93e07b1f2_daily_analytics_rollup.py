@@ -0,0 +1,62 @@
+"""Daily analytics rollup watermark and indexes
+
+Revision ID: d5a93e07b1f2
+Revises: 8b2e6d41c9a7
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a93e07b1f2"
+down_revision: Union[str, None] = "8b2e6d41c9a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all may already have these
+    inspector = sa.inspect(op.get_bind())
+    if "rollup_state" not in inspector.get_table_names():
+        op.create_table(
+            "rollup_state",
+            sa.Column("name", sa.String(100), primary_key=True),
+            sa.Column("watermark", sa.DateTime(), nullable=True),
+            sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        )
+    if "total_scored" not in {c["name"] for c in inspector.get_columns("daily_analytics")}:
+        op.add_column(
+            "daily_analytics",
+            sa.Column("total_scored", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # The rollup finds touched days by recent conversations and grades
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversations_started",
+            "conversations",
+            ["started_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_grades_graded_at",
+            "grades",
+            ["graded_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_grades_graded_at", table_name="grades", if_exists=True,
+                      postgresql_concurrently=True)
+        op.drop_index("ix_conversations_started", table_name="conversations", if_exists=True,
+                      postgresql_concurrently=True)
+    op.drop_column("daily_analytics", "total_scored")
+    op.drop_table("rollup_state")
@@ -0,0 +1,85 @@
+"""Partition messages by month on created_at
+
+Revision ID: e7c41f0a9b36
+Revises: d5a93e07b1f2
+Create Date: 2026-10-19 16:00:00.000000
+
+Rebuilds ``messages`` as a range-partitioned table and copies the rows
+across, so it takes a lock on messages for the duration of the copy.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.message_partitions import ensure_partitions, is_partitioned
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7c41f0a9b36"
+down_revision: Union[str, None] = "d5a93e07b1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, conversation_id, role, content, created_at"
+
+
+def _rename_old_table(suffix: str) -> str:
+    """Move the current messages table (and its index names) out of the way."""
+    old = f"messages_{suffix}"
+    op.execute(f"ALTER TABLE messages RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT messages_pkey TO {old}_pkey")
+    op.execute(
+        "ALTER INDEX IF EXISTS ix_messages_conversation_created "
+        f"RENAME TO ix_{old}_conversation_created"
+    )
+    return old
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # Databases created by create_all are already partitioned
+    if is_partitioned(conn):
+        return
+
+    old = _rename_old_table("unpartitioned")
+    op.execute(f"""
+        CREATE TABLE messages (
+            id UUID NOT NULL,
+            conversation_id UUID NOT NULL REFERENCES conversations (id),
+            role messagerole NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute(
+        "CREATE INDEX ix_messages_conversation_created ON messages (conversation_id, created_at)"
+    )
+
+    # One partition per month from the oldest message on
+    oldest = conn.scalar(sa.text(f"SELECT min(created_at) FROM {old}"))
+    ensure_partitions(conn, since=oldest.date() if oldest else None)
+
+    op.execute(f"INSERT INTO messages ({COLUMNS}) SELECT {COLUMNS} FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+    op.execute("ANALYZE messages")
+
+
+def downgrade() -> None:
+    old = _rename_old_table("partitioned")
+    op.execute("""
+        CREATE TABLE messages (
+            id UUID NOT NULL PRIMARY KEY,
+            conversation_id UUID NOT NULL REFERENCES conversations (id),
+            role messagerole NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        )
+    """)
+    op.execute(
+        "CREATE INDEX ix_messages_conversation_created ON messages (conversation_id, created_at)"
+    )
+    op.execute(f"INSERT INTO messages ({COLUMNS}) SELECT {COLUMNS} FROM {old}")
+    # Drops the attached partitions too; archived ones are left alone
+    op.execute(f"DROP TABLE {old}")
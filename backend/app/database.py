@@ -1,32 +1,255 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
+import threading
+import time
+from uuid import UUID, uuid4
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
 
 settings = get_settings()
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
+
+def _async_database_url(url: str) -> str:
+    """Point a postgresql:// URL at the asyncpg driver."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# Checkouts slower than this are counted as waits on a saturated pool
+SLOW_CHECKOUT_SECONDS = 0.1
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait.
+
+    Counts checkouts, total wait, slow checkouts and timeouts, and tracks
+    the peak number of connections checked out at once; see ``stats``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the pool with zeroed counters."""
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Zero the checkout counters."""
+        with self._stats_lock:
+            self.checkouts = 0
+            self.wait_seconds = 0.0
+            self.slow_checkouts = 0
+            self.timeouts = 0
+            self.peak_checked_out = 0
+
+    def connect(self):
+        """Check out a connection, timing how long the caller waited."""
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_seconds += waited
+            if waited >= SLOW_CHECKOUT_SECONDS:
+                self.slow_checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+        return connection
+
+    def stats(self) -> dict:
+        """Occupancy and checkout counters; saturation is checked out / capacity."""
+        capacity = self.size() + max(self._max_overflow, 0)
+        checked_out = self.checkedout()
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": checked_out,
+                "saturation": round(checked_out / capacity, 4) if capacity else None,
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "avg_wait_ms": (
+                    round(self.wait_seconds * 1000 / self.checkouts, 2) if self.checkouts else None
+                ),
+                "slow_checkouts": self.slow_checkouts,
+                "timeouts": self.timeouts,
+            }
+
+
+def _pool_options() -> dict:
+    """Engine keyword arguments for the configured pool."""
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def _async_engine_options() -> dict:
+    """Keyword arguments for an API engine with an instrumented pool."""
+    options = {**_pool_options(), "poolclass": InstrumentedPool}
+    if settings.db_pgbouncer_transaction_mode:
+        # Transaction pooling hands each transaction a different server
+        # connection, so server-side prepared statements must not be reused
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
+
+# Synchronous engine for scripts and migrations (seed, alembic)
+engine = create_engine(settings.database_url, **_pool_options())
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API so queries never block the event loop
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    **_async_engine_options(),
+)
+
+# Objects stay usable after commit; relationships must be loaded explicitly
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read replica for read-only endpoints; falls back to the primary when unset
+if settings.database_read_url:
+    read_async_engine = create_async_engine(
+        _async_database_url(settings.database_read_url),
+        **_async_engine_options(),
+    )
+    ReadSessionLocal = async_sessionmaker(
+        read_async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    read_async_engine = None
+    ReadSessionLocal = None
+
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session."""
-    db = SessionLocal()
-    try:
+class RecentWriters:
+    """Users who committed a write recently, so their reads skip the replica.
+
+    Per process; each worker tracks the writes it served. A user's writes
+    and follow-up reads normally hit the same worker within the window,
+    and replica lag is expected to stay well under it.
+    """
+
+    def __init__(self, window_seconds: float):
+        """Initialize an empty tracker with the given window."""
+        self.window_seconds = window_seconds
+        self._expires: dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: UUID) -> None:
+        """Record that ``user_id`` just committed a write."""
+        now = time.monotonic()
+        with self._lock:
+            self._expires[user_id] = now + self.window_seconds
+            # Drop expired entries so the map only holds active writers
+            if len(self._expires) > 1000:
+                self._expires = {k: v for k, v in self._expires.items() if v > now}
+
+    def is_recent(self, user_id: UUID) -> bool:
+        """Whether ``user_id`` committed a write within the window."""
+        with self._lock:
+            return self._expires.get(user_id, 0) > time.monotonic()
+
+    def clear(self) -> None:
+        """Forget all writers."""
+        with self._lock:
+            self._expires.clear()
+
+
+recent_writers = RecentWriters(settings.read_your_writes_seconds)
+
+
+@event.listens_for(Session, "after_commit")
+def _flag_commit(session: Session) -> None:
+    session.info["committed"] = True
+
+
+async def _request_user_id(request: Request) -> UUID:
+    """The id of the user making the request.
+
+    ``get_authenticated_user`` records it on the request; if it has not
+    run yet it is resolved here (both lookups are cached).
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        # Imported here: auth loads users through this module's sessions
+        from app.routers.auth import get_authenticated_user
+
+        user = await get_authenticated_user(
+            request,
+            request.query_params.get("user_key"),
+            request.headers.get("authorization"),
+        )
+        user_id = user.id
+    return user_id
+
+
+async def get_db(request: Request):
+    """Dependency to get an async database session on the primary.
+
+    Users whose request commits are remembered so their reads stay on the
+    primary for ``read_your_writes_seconds`` (see ``get_read_db``).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+        # Committing endpoints authenticate, so the user is known by now
+        user_id = getattr(request.state, "user_id", None)
+        if user_id is not None and db.sync_session.info.get("committed"):
+            recent_writers.mark(user_id)
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """Return the session's connection to the pool before a long await.
+
+    Ends the current transaction without committing and detaches loaded
+    objects; they stay readable (``expire_on_commit=False``). The session
+    checks out a new connection on next use, so ``add`` any object that
+    should be updated afterwards. Call this before LLM requests so a
+    connection is not held idle for seconds per request.
+    """
+    await db.close()
+
+
+async def get_read_db(request: Request):
+    """Dependency to get a session for read-only endpoints.
+
+    Uses the read replica when one is configured, unless the user wrote
+    recently and the replica may not have caught up yet.
+    """
+    if ReadSessionLocal is None or recent_writers.is_recent(await _request_user_id(request)):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = ReadSessionLocal
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
@@ -1,13 +1,48 @@
 """StakeholderSim API - Main FastAPI Application."""
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.config import get_settings
 from app.routers import auth, health, conversations, grades, dashboard, assignments
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.rate_limit import RateLimitExceeded
+from app.services.redis_client import close_redis
+from app.services.responses import CompressionMiddleware
+from app.services.warmup import run_warmup
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up (and warm up) the worker, then shut it down."""
+    print("=" * 50)
+    print("StakeholderSim API Starting...")
+    print(f"Environment: {settings.env}")
+    print(f"Debug Mode: {settings.debug}")
+    if settings.env == "development":
+        print("")
+        print("  WARNING: Using MOCK AUTHENTICATION")
+        print("  See PRE_DEPLOYMENT_CHECKLIST.md before production")
+    print("=" * 50)
+
+    # Serve health checks while warming up; /health/ready waits for it
+    warmup = asyncio.create_task(run_warmup())
+
+    yield
+
+    print("StakeholderSim API Shutting down...")
+    warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup
+    await close_redis()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="StakeholderSim API",
@@ -15,6 +50,8 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -24,8 +61,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Retry-After"],
 )
 
+# Gzip large responses; most of the payload is transcript text
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.gzip_minimum_size,
+    compresslevel=settings.gzip_compress_level,
+)
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """Answer over-limit requests with 429 and when to retry."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
@@ -34,22 +89,3 @@ app.include_router(grades.router, prefix="/api/v1/grades", tags=["Grading"])
 app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
 app.include_router(assignments.router, prefix="/api/v1/assignments", tags=["Assignments"])
 
-
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    print("=" * 50)
-    print("StakeholderSim API Starting...")
-    print(f"Environment: {settings.env}")
-    print(f"Debug Mode: {settings.debug}")
-    if settings.env == "development":
-        print("")
-        print("  WARNING: Using MOCK AUTHENTICATION")
-        print("  See PRE_DEPLOYMENT_CHECKLIST.md before production")
-    print("=" * 50)
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    print("StakeholderSim API Shutting down...")
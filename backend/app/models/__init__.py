@@ -3,12 +3,12 @@
 from app.models.user import User
 from app.models.course import Course, Enrollment
 from app.models.persona import Persona
-from app.models.rubric import Rubric
+from app.models.rubric import Rubric, RubricVersion
 from app.models.scenario import Scenario
 from app.models.assignment import Assignment
 from app.models.conversation import Conversation, Message
 from app.models.grade import Grade
-from app.models.analytics import DailyAnalytics
+from app.models.analytics import DailyAnalytics, RollupState, RollupTouchedDay
 
 __all__ = [
     "User",
@@ -16,10 +16,13 @@ __all__ = [
     "Enrollment",
     "Persona",
     "Rubric",
+    "RubricVersion",
     "Scenario",
     "Assignment",
     "Conversation",
     "Message",
     "Grade",
     "DailyAnalytics",
+    "RollupState",
+    "RollupTouchedDay",
 ]
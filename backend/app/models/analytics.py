@@ -1,6 +1,6 @@
 """Daily analytics model for course performance tracking."""
 
-from sqlalchemy import Column, Integer, Date, ForeignKey, UniqueConstraint, Numeric
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, String, UniqueConstraint, Numeric
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -19,11 +19,41 @@ class DailyAnalytics(Base, UUIDMixin):
     total_conversations = Column(Integer, default=0, nullable=False)
     total_practice = Column(Integer, default=0, nullable=False)
     total_graded = Column(Integer, default=0, nullable=False)
+    total_scored = Column(Integer, default=0, nullable=False)  # Grades behind avg_score
     avg_score = Column(Numeric(5, 2), nullable=True)
-    common_struggles = Column(JSONB, nullable=True)  # AI-identified patterns
+    common_struggles = Column(JSONB, nullable=True)  # [{"criterion": ..., "count": ...}]
 
     # Relationships
     course = relationship("Course", back_populates="daily_analytics")
 
     def __repr__(self):
         return f"<DailyAnalytics {self.course_id} {self.date}>"
+
+
+class RollupState(Base):
+    """Watermark for an incremental rollup job."""
+
+    __tablename__ = "rollup_state"
+
+    name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime, nullable=True)  # Changes before this are rolled up
+    last_run_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<RollupState {self.name} {self.watermark}>"
+
+
+class RollupTouchedDay(Base):
+    """A day whose rollup rows must be rebuilt though no timestamp shows it.
+
+    Deleting a grade (or conversation) leaves nothing for the rollup to
+    find by time, so deletes record the conversation's day here.
+    """
+
+    __tablename__ = "rollup_touched_days"
+
+    date = Column(Date, primary_key=True)
+    touched_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<RollupTouchedDay {self.date} {self.touched_at}>"
@@ -1,14 +1,15 @@
 """Conversation and Message models."""
 
+import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum, event
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import enum
 
 from app.database import Base
-from app.models.base import UUIDMixin, TimestampMixin
+from app.models.base import UUIDMixin
 
 
 class ConversationMode(str, enum.Enum):
@@ -37,6 +38,12 @@ class Conversation(Base, UUIDMixin):
     """Conversation model - a role-play session."""
 
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_user_started", "user_id", "started_at"),
+        Index("ix_conversations_assignment_user", "assignment_id", "user_id"),
+        Index("ix_conversations_assignment_started", "assignment_id", "started_at", "id"),
+        Index("ix_conversations_started", "started_at"),
+    )
 
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     scenario_id = Column(UUID(as_uuid=True), ForeignKey("scenarios.id"), nullable=False)
@@ -49,6 +56,8 @@ class Conversation(Base, UUIDMixin):
     started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
     turn_count = Column(Integer, default=0, nullable=False)
+    grading_ledger = Column(JSONB, nullable=True)  # Running per-criterion evidence
+    ledger_message_count = Column(Integer, default=0, nullable=False)  # Messages covered
 
     # Relationships
     user = relationship("User", back_populates="conversations")
@@ -69,11 +78,22 @@ class Conversation(Base, UUIDMixin):
         return "\n\n".join(lines)
 
 
-class Message(Base, UUIDMixin, TimestampMixin):
-    """Message within a conversation."""
+class Message(Base):
+    """Message within a conversation.
+
+    The table is range-partitioned by month on ``created_at`` (see
+    app.services.message_partitions), so the partition key is part of the
+    primary key.
+    """
 
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
     conversation_id = Column(
         UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False
     )
@@ -86,3 +106,12 @@ class Message(Base, UUIDMixin, TimestampMixin):
     def __repr__(self):
         preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
         return f"<Message {self.role.value}: {preview}>"
+
+
+@event.listens_for(Message.__table__, "after_create")
+def _create_message_partitions(target, connection, **kw):
+    """Give a freshly created messages table its default and monthly partitions."""
+    if connection.dialect.name == "postgresql":
+        from app.services.message_partitions import ensure_partitions
+
+        ensure_partitions(connection)
@@ -1,7 +1,7 @@
 """Course and Enrollment models."""
 
 from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import enum
 
@@ -24,6 +24,8 @@ class Course(Base, UUIDMixin, TimestampMixin):
 
     name = Column(String(255), nullable=False)
     instructor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    # LLM rate limit overrides, e.g. {"message": "30/minute", "course": "1000/minute"}
+    rate_limits = Column(JSONB, nullable=True)
 
     # Relationships
     instructor = relationship("User", back_populates="courses_taught")
@@ -1,6 +1,9 @@
 """Grade model for conversation evaluation."""
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Numeric
+from sqlalchemy import (
+    Column, String, Text, Boolean, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum, Numeric,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -33,11 +36,25 @@ class Grade(Base, UUIDMixin):
     """
 
     __tablename__ = "grades"
+    __table_args__ = (
+        Index("ix_grades_graded_at", "graded_at"),
+        # Review queue: only unreviewed low-confidence or anomalous grades, in queue order
+        Index(
+            "ix_grades_needs_review",
+            text("feature_anomaly DESC"),
+            "ai_confidence",
+            text("graded_at DESC"),
+            postgresql_where=text(
+                "instructor_override = false AND (ai_confidence < 0.7 OR feature_anomaly = true)"
+            ),
+        ),
+    )
 
     conversation_id = Column(
         UUID(as_uuid=True), ForeignKey("conversations.id"), unique=True, nullable=False
     )
     rubric_id = Column(UUID(as_uuid=True), ForeignKey("rubrics.id"), nullable=False)
+    rubric_version = Column(Integer, nullable=True)  # NULL = graded before versioning (v1)
     criteria_scores = Column(JSONB, nullable=False)
     total_score = Column(Numeric(5, 2), nullable=False)
     overall_feedback = Column(Text, nullable=True)
@@ -48,6 +65,8 @@ class Grade(Base, UUIDMixin):
     instructor_override = Column(Boolean, default=False, nullable=False)
     override_reason = Column(Text, nullable=True)
     graded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    transcript_features = Column(JSONB, nullable=True)  # Local pre-scoring features
+    feature_anomaly = Column(Boolean, default=False, nullable=False)  # AI vs features mismatch
 
     # Relationships
     conversation = relationship("Conversation", back_populates="grade")
@@ -58,7 +77,13 @@ class Grade(Base, UUIDMixin):
 
     @property
     def needs_review(self) -> bool:
-        """Check if grade needs instructor review based on AI confidence."""
+        """Check if grade needs instructor review.
+
+        Based on AI confidence, or on the AI score disagreeing with the
+        transcript feature prediction.
+        """
+        if self.feature_anomaly:
+            return True
         if self.ai_confidence is None:
             return True
         return float(self.ai_confidence) < 0.7
@@ -1,6 +1,6 @@
 """Rubric model for grading criteria."""
 
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -33,11 +33,15 @@ class Rubric(Base, UUIDMixin, TimestampMixin):
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=True)
     name = Column(String(255), nullable=False)
     criteria = Column(JSONB, nullable=False)  # Array of criterion objects
+    version = Column(Integer, default=1, nullable=False)  # Current RubricVersion number
 
     # Relationships
     course = relationship("Course", back_populates="rubrics")
     scenarios = relationship("Scenario", back_populates="rubric")
     grades = relationship("Grade", back_populates="rubric")
+    versions = relationship(
+        "RubricVersion", back_populates="rubric", order_by="RubricVersion.version"
+    )
 
     def __repr__(self):
         return f"<Rubric {self.name}>"
@@ -62,3 +66,25 @@ class Rubric(Base, UUIDMixin, TimestampMixin):
             lines.append("")
 
         return "\n".join(lines)
+
+
+class RubricVersion(Base, UUIDMixin, TimestampMixin):
+    """Immutable snapshot of a rubric's criteria.
+
+    A new version is written every time the rubric's criteria change;
+    grades record the version they were graded against.
+    """
+
+    __tablename__ = "rubric_versions"
+    __table_args__ = (UniqueConstraint("rubric_id", "version", name="uq_rubric_version"),)
+
+    rubric_id = Column(UUID(as_uuid=True), ForeignKey("rubrics.id"), nullable=False)
+    version = Column(Integer, nullable=False)
+    name = Column(String(255), nullable=False)
+    criteria = Column(JSONB, nullable=False)
+
+    # Relationships
+    rubric = relationship("Rubric", back_populates="versions")
+
+    def __repr__(self):
+        return f"<RubricVersion {self.rubric_id} v{self.version}>"
@@ -1,7 +1,7 @@
 """Scenario model combining persona, rubric, and settings."""
 
 from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -20,6 +20,8 @@ class Scenario(Base, UUIDMixin, TimestampMixin):
     rubric_id = Column(UUID(as_uuid=True), ForeignKey("rubrics.id"), nullable=False)
     is_practice = Column(Boolean, default=True, nullable=False)
     max_turns = Column(Integer, default=15, nullable=False)
+    # Per-user LLM rate limit overrides (take precedence over the course's)
+    rate_limits = Column(JSONB, nullable=True)
 
     # Relationships
     course = relationship("Course", back_populates="scenarios")
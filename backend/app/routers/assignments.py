@@ -4,15 +4,17 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, selectinload
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.assignment import Assignment
 from app.models.scenario import Scenario
 from app.models.persona import Persona
-from app.models.conversation import Conversation, ConversationStatus
+from app.models.conversation import Conversation, ConversationMode, ConversationStatus
+from app.models.grade import Grade
 from app.models.user import User
 from app.schemas.assignment import (
     AssignmentCreate,
@@ -22,47 +24,33 @@ from app.schemas.assignment import (
     StudentAssignment,
     AssignmentSubmission,
 )
-from app.routers.auth import MOCK_USERS
+from app.services.catalog_cache import catalog_cache
+from app.services.pagination import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    filter_conversations,
+    paginate_conversations,
+    split_page,
+)
+from app.services.responses import trusted_response
+from app.services.single_flight import SingleFlight
+from app.routers.auth import CurrentUser, get_authenticated_user, require_instructor
 
 router = APIRouter()
 
-
-def get_current_user_id(user_key: Optional[str] = None) -> UUID:
-    """Get current user ID from mock auth."""
-    if not user_key:
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return UUID(user["id"])
-
-
-def get_user_role(user_key: Optional[str] = None) -> str:
-    """Get current user's role."""
-    if not user_key:
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    return user["role"] if user else "student"
-
-
-def require_instructor(user_key: Optional[str] = None):
-    """Require instructor or admin role."""
-    role = get_user_role(user_key)
-    if role not in ["instructor", "admin"]:
-        raise HTTPException(status_code=403, detail="Instructor access required")
+assignment_list_flight = SingleFlight("assignment_list", distributed=True)
 
 
 @router.post("", response_model=AssignmentResponse)
 async def create_assignment(
     assignment_data: AssignmentCreate,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(require_instructor),
 ):
     """Create a new assignment (instructor only)."""
-    require_instructor(user_key)
 
     # Verify scenario exists
-    scenario = db.query(Scenario).filter(Scenario.id == assignment_data.scenario_id).first()
+    scenario = await catalog_cache.get(db, Scenario, assignment_data.scenario_id)
     if not scenario:
         raise HTTPException(status_code=404, detail="Scenario not found")
 
@@ -78,11 +66,11 @@ async def create_assignment(
     )
 
     db.add(assignment)
-    db.commit()
-    db.refresh(assignment)
+    await db.commit()
+    await db.refresh(assignment)
 
     # Get persona info
-    persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first()
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id)
 
     return AssignmentResponse(
         id=assignment.id,
@@ -104,30 +92,56 @@ async def create_assignment(
 async def list_assignments(
     course_id: Optional[UUID] = None,
     active_only: bool = False,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    user: CurrentUser = Depends(require_instructor),
 ):
-    """List all assignments (instructor view)."""
-    require_instructor(user_key)
+    """List all assignments (instructor view).
 
-    query = db.query(Assignment)
+    Instructors loading the list together (on any worker) share one build.
+    """
+
+    async def build():
+        items = await _list_assignments(db, course_id, active_only)
+        return [item.model_dump(mode="json") for item in items]
+
+    payload = await assignment_list_flight.do(f"{course_id}:{active_only}", build)
+    return trusted_response(payload)
+
+
+async def _list_assignments(
+    db: AsyncSession,
+    course_id: Optional[UUID],
+    active_only: bool,
+) -> list[AssignmentListItem]:
+    """Build the instructor's assignment list from the database."""
+    query = select(Assignment)
     if course_id:
-        query = query.filter(Assignment.course_id == course_id)
+        query = query.where(Assignment.course_id == course_id)
     if active_only:
-        query = query.filter(Assignment.is_active == True)
-
-    assignments = query.order_by(desc(Assignment.created_at)).all()
+        query = query.where(Assignment.is_active == True)
+
+    assignments = (await db.scalars(query.order_by(desc(Assignment.created_at)))).all()
+
+    # Submission and grade counts for every listed assignment in one query
+    counts = {}
+    if assignments:
+        rows = await db.execute(
+            select(
+                Conversation.assignment_id,
+                func.count(Conversation.id),
+                func.count(Grade.id),
+            )
+            .outerjoin(Grade, Grade.conversation_id == Conversation.id)
+            .where(Conversation.assignment_id.in_([a.id for a in assignments]))
+            .group_by(Conversation.assignment_id)
+        )
+        counts = {assignment_id: (total, graded) for assignment_id, total, graded in rows.all()}
 
     result = []
     for assignment in assignments:
-        scenario = db.query(Scenario).filter(Scenario.id == assignment.scenario_id).first()
-        persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
-
-        # Count submissions
-        submissions = db.query(Conversation).filter(
-            Conversation.assignment_id == assignment.id
-        ).all()
-        graded = len([s for s in submissions if s.grade is not None])
+        scenario = await catalog_cache.get(db, Scenario, assignment.scenario_id)
+        persona = await catalog_cache.get(db, Persona, scenario.persona_id) if scenario else None
+        total, graded = counts.get(assignment.id, (0, 0))
 
         result.append(AssignmentListItem(
             id=assignment.id,
@@ -137,7 +151,7 @@ async def list_assignments(
             due_date=assignment.due_date,
             max_attempts=assignment.max_attempts,
             is_active=assignment.is_active,
-            total_submissions=len(submissions),
+            total_submissions=total,
             graded_submissions=graded,
         ))
 
@@ -146,29 +160,37 @@ async def list_assignments(
 
 @router.get("/student", response_model=List[StudentAssignment])
 async def get_student_assignments(
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """Get assignments available to current student."""
-    user_id = get_current_user_id(user_key)
+    user_id = user.id
 
     # Get all active assignments
-    assignments = db.query(Assignment).filter(Assignment.is_active == True).all()
+    assignments = (
+        await db.scalars(select(Assignment).where(Assignment.is_active == True))
+    ).all()
 
     result = []
     for assignment in assignments:
-        scenario = db.query(Scenario).filter(Scenario.id == assignment.scenario_id).first()
+        scenario = await catalog_cache.get(db, Scenario, assignment.scenario_id)
         if not scenario:
             continue
 
-        persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first()
+        persona = await catalog_cache.get(db, Persona, scenario.persona_id)
         if not persona:
             continue
 
         # Count student's attempts
-        attempts = db.query(Conversation).filter(
-            Conversation.assignment_id == assignment.id,
-            Conversation.user_id == user_id,
+        attempts = (
+            await db.scalars(
+                select(Conversation)
+                .options(selectinload(Conversation.grade))
+                .where(
+                    Conversation.assignment_id == assignment.id,
+                    Conversation.user_id == user_id,
+                )
+            )
         ).all()
 
         attempts_used = len(attempts)
@@ -204,16 +226,16 @@ async def get_student_assignments(
 @router.get("/{assignment_id}", response_model=AssignmentResponse)
 async def get_assignment(
     assignment_id: UUID,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """Get assignment details."""
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    assignment = await db.get(Assignment, assignment_id)
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
 
-    scenario = db.query(Scenario).filter(Scenario.id == assignment.scenario_id).first()
-    persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
+    scenario = await catalog_cache.get(db, Scenario, assignment.scenario_id)
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id) if scenario else None
 
     return AssignmentResponse(
         id=assignment.id,
@@ -235,13 +257,12 @@ async def get_assignment(
 async def update_assignment(
     assignment_id: UUID,
     update_data: AssignmentUpdate,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(require_instructor),
 ):
     """Update an assignment (instructor only)."""
-    require_instructor(user_key)
 
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    assignment = await db.get(Assignment, assignment_id)
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
 
@@ -250,11 +271,11 @@ async def update_assignment(
     for key, value in update_dict.items():
         setattr(assignment, key, value)
 
-    db.commit()
-    db.refresh(assignment)
+    await db.commit()
+    await db.refresh(assignment)
 
-    scenario = db.query(Scenario).filter(Scenario.id == assignment.scenario_id).first()
-    persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
+    scenario = await catalog_cache.get(db, Scenario, assignment.scenario_id)
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id) if scenario else None
 
     return AssignmentResponse(
         id=assignment.id,
@@ -275,19 +296,18 @@ async def update_assignment(
 @router.delete("/{assignment_id}")
 async def delete_assignment(
     assignment_id: UUID,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(require_instructor),
 ):
     """Delete an assignment (instructor only). Sets inactive instead of hard delete."""
-    require_instructor(user_key)
 
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    assignment = await db.get(Assignment, assignment_id)
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
 
     # Soft delete - set inactive
     assignment.is_active = False
-    db.commit()
+    await db.commit()
 
     return {"message": "Assignment deactivated"}
 
@@ -295,32 +315,55 @@ async def delete_assignment(
 @router.get("/{assignment_id}/submissions", response_model=List[AssignmentSubmission])
 async def get_assignment_submissions(
     assignment_id: UUID,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(require_instructor),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    mode: Optional[ConversationMode] = None,
+    status: Optional[ConversationStatus] = None,
+    persona_id: Optional[UUID] = None,
 ):
-    """Get all submissions for an assignment (instructor only)."""
-    require_instructor(user_key)
+    """Get submissions for an assignment, newest first (instructor only).
+
+    Paginated by keyset: pass the ``X-Next-Cursor`` response header back as
+    ``cursor`` to get the next page.
+    """
 
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    assignment = await db.get(Assignment, assignment_id)
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
 
-    conversations = db.query(Conversation).filter(
-        Conversation.assignment_id == assignment_id
-    ).order_by(desc(Conversation.started_at)).all()
-
-    result = []
-    for conv in conversations:
-        student = db.query(User).filter(User.id == conv.user_id).first()
-        result.append(AssignmentSubmission(
-            id=conv.id,
-            conversation_id=conv.id,
-            student_id=conv.user_id,
-            student_name=student.name if student else "Unknown",
-            started_at=conv.started_at,
-            completed_at=conv.completed_at,
-            score=float(conv.grade.total_score) if conv.grade else None,
-            status=conv.status.value,
-        ))
-
-    return result
+    query = (
+        select(Conversation, User.name, Grade.total_score)
+        .options(defer(Conversation.grading_ledger))
+        .outerjoin(User, User.id == Conversation.user_id)
+        .outerjoin(Grade, Grade.conversation_id == Conversation.id)
+        .where(Conversation.assignment_id == assignment_id)
+    )
+    query = filter_conversations(query, mode, status, persona_id)
+    try:
+        query = paginate_conversations(query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows, next_cursor = split_page((await db.execute(query)).all(), limit, key=lambda r: r[0])
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return trusted_response(
+        [
+            {
+                "id": conv.id,
+                "conversation_id": conv.id,
+                "student_id": conv.user_id,
+                "student_name": student_name or "Unknown",
+                "started_at": conv.started_at,
+                "completed_at": conv.completed_at,
+                "score": float(total_score) if total_score is not None else None,
+                "status": conv.status.value,
+            }
+            for conv, student_name, total_score in rows
+        ],
+        response,
+    )
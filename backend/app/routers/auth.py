@@ -5,15 +5,20 @@ Before production deployment, replace with real OAuth 2.0.
 See docs/PRE_DEPLOYMENT_CHECKLIST.md
 """
 
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from jose import jwt
 from pydantic import BaseModel
 
 from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.ttl_cache import TTLCache
 
 router = APIRouter()
 settings = get_settings()
@@ -47,6 +52,37 @@ MOCK_USERS = {
 }
 
 
+# Mock users by id, so token subjects resolve without a scan
+_MOCK_USERS_BY_ID = {UUID(user["id"]): user for user in MOCK_USERS.values()}
+
+# Verified JWT claims by token, and resolved users by id
+token_cache = TTLCache(
+    "auth.token_cache",
+    max_entries=settings.auth_token_cache_size,
+    ttl_seconds=settings.auth_token_cache_ttl_seconds,
+)
+user_cache = TTLCache(
+    "auth.user_cache",
+    max_entries=settings.auth_user_cache_size,
+    ttl_seconds=settings.auth_user_cache_ttl_seconds,
+)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The user a request is made by."""
+
+    id: UUID
+    email: str
+    name: str
+    role: str
+
+    @property
+    def is_instructor(self) -> bool:
+        """Whether the user has instructor (or admin) access."""
+        return self.role in ("instructor", "admin")
+
+
 class MockLoginRequest(BaseModel):
     """Request to login as a mock user."""
 
@@ -81,29 +117,114 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
 
 
+def decode_token(token: str) -> dict:
+    """Verify a JWT and return its claims.
+
+    Verified claims are memoized until the token expires (or the cache
+    TTL passes), so a token is checked once rather than on every request.
+    """
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    except jwt.JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    expires_at = claims.get("exp")
+    token_cache.set(token, claims, expires_at - time.time() if expires_at else None)
+    return claims
+
+
+def _token_subject(token: str) -> UUID:
+    """The user id a token was issued for."""
+    subject = decode_token(token).get("sub")
+    try:
+        return UUID(subject)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+
 def get_current_user_from_token(token: str) -> dict:
     """Decode and validate JWT token."""
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-            )
-        # Find user by ID
-        for user in MOCK_USERS.values():
-            if user["id"] == user_id:
-                return user
+    user = _MOCK_USERS_BY_ID.get(_token_subject(token))
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-    except jwt.JWTError:
+    return user
+
+
+async def load_user(user_id: UUID) -> Optional[CurrentUser]:
+    """Look up a user by id, through the user cache.
+
+    Mock users resolve without a query in development; anyone else is
+    read from the users table. Unknown ids are not cached.
+    """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    mock = _MOCK_USERS_BY_ID.get(user_id) if settings.env == "development" else None
+    if mock:
+        user = CurrentUser(id=user_id, email=mock["email"], name=mock["name"], role=mock["role"])
+    else:
+        async with AsyncSessionLocal() as db:
+            row = await db.get(User, user_id)
+        if row is None:
+            return None
+        user = CurrentUser(id=row.id, email=row.email, name=row.name, role=row.role.value)
+
+    user_cache.set(user_id, user)
+    return user
+
+
+async def get_authenticated_user(
+    request: Request = None,
+    user_key: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+) -> CurrentUser:
+    """Dependency resolving the user a request is made by.
+
+    Uses the bearer token when one is sent, otherwise the mock
+    ``user_key`` query parameter (student1 if missing). FastAPI resolves
+    the dependency once per request, and both the token check and the
+    user lookup are cached across requests. The user's id is recorded
+    on the request for the session dependencies' read-your-writes.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        user_id = _token_subject(token.strip())
+    else:
+        mock = MOCK_USERS.get(user_key or "student1")
+        if not mock:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
+        user_id = UUID(mock["id"])
+
+    user = await load_user(user_id)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="User not found",
         )
+    if request is not None:
+        request.state.user_id = user.id
+    return user
+
+
+async def require_instructor(
+    user: CurrentUser = Depends(get_authenticated_user),
+) -> CurrentUser:
+    """Dependency admitting only instructors and admins."""
+    if not user.is_instructor:
+        raise HTTPException(status_code=403, detail="Instructor access required")
+    return user
 
 
 @router.get("/mock-users")
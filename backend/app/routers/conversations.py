@@ -1,13 +1,25 @@
 """Conversation API endpoints."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
-from uuid import UUID
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from uuid import UUID, uuid4
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_read_db, release_connection
 from app.models.conversation import (
     Conversation,
     Message,
@@ -17,6 +29,7 @@ from app.models.conversation import (
 )
 from app.models.scenario import Scenario
 from app.models.persona import Persona
+from app.models.grade import Grade
 from app.models.user import User
 from app.schemas.conversation import (
     StartConversationRequest,
@@ -24,94 +37,164 @@ from app.schemas.conversation import (
     ConversationResponse,
     ConversationListItem,
     MessageResponse,
+    MessagesSinceResponse,
     StakeholderMessageResponse,
     EndConversationResponse,
     ScenarioResponse,
 )
+from app.services.catalog_cache import catalog_cache
 from app.services.conversation_engine import ConversationEngine
-from app.routers.auth import get_current_user_from_token, MOCK_USERS
+from app.services.dashboard_cache import student_dashboard_cache
+from app.services.etags import check_not_modified, make_etag
+from app.services.pagination import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    filter_conversations,
+    paginate_conversations,
+    split_page,
+)
+from app.services.rate_limit import rate_limiter
+from app.services.responses import trusted_response
+from app.routers.auth import CurrentUser, get_authenticated_user
+from app.routers.grades import _update_grading_ledger
 
 router = APIRouter()
+settings = get_settings()
 
 
-# Temporary helper to get user from query param (will be middleware later)
-def get_current_user_id(user_key: Optional[str] = None) -> UUID:
-    """Get current user ID from mock auth.
+def _transcript_query(conversation: Conversation):
+    """Select a conversation's messages in order.
 
-    In production, this would come from OAuth token.
+    Bounding ``created_at`` by the conversation start lets Postgres skip
+    the message partitions for earlier months.
     """
-    if not user_key:
-        # Default to student1 for development
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return UUID(user["id"])
+    return (
+        select(Message)
+        .where(
+            Message.conversation_id == conversation.id,
+            Message.created_at >= conversation.started_at,
+        )
+        .order_by(Message.created_at)
+    )
 
 
-def get_user_role(user_key: Optional[str] = None) -> str:
-    """Get current user's role."""
-    if not user_key:
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    return user["role"] if user else "student"
+def _new_message(conversation_id: UUID, role: MessageRole, content: str) -> dict:
+    """Column values for a message, with its id and timestamp set client-side."""
+    return {
+        "id": uuid4(),
+        "conversation_id": conversation_id,
+        "role": role,
+        "content": content,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _message_response(message: dict) -> MessageResponse:
+    """Build the response for a message from its column values."""
+    return MessageResponse(
+        id=message["id"],
+        role=message["role"].value,
+        content=message["content"],
+        created_at=message["created_at"],
+    )
+
+
+def _message_payload(message: Message) -> dict:
+    """A loaded message as a ``MessageResponse`` dict for ``trusted_response``."""
+    return {
+        "id": message.id,
+        "role": message.role.value,
+        "content": message.content,
+        "created_at": message.created_at,
+    }
 
 
-def is_instructor_or_admin(user_key: Optional[str] = None) -> bool:
-    """Check if user is instructor or admin."""
-    role = get_user_role(user_key)
-    return role in ["instructor", "admin"]
+async def _persist_turn(db: AsyncSession, conversation_id: UUID, messages: list[dict]) -> Optional[int]:
+    """Insert a turn's messages and increment the turn count in one statement.
+
+    The inserts run as a CTE of the UPDATE, so the turn is a single round
+    trip plus the commit. Nothing needs refreshing: ids and timestamps
+    were generated here.
+
+    Returns:
+        The new turn count, or None if the conversation is no longer in
+        progress (the caller must roll back; the CTE still ran).
+    """
+    inserted = insert(Message).values(messages).cte("inserted_messages")
+    return (
+        await db.execute(
+            update(Conversation)
+            .where(
+                Conversation.id == conversation_id,
+                Conversation.status == ConversationStatus.IN_PROGRESS,
+            )
+            .values(turn_count=Conversation.turn_count + 1)
+            .returning(Conversation.turn_count)
+            .add_cte(inserted)
+            .execution_options(synchronize_session=False)
+        )
+    ).scalar_one_or_none()
 
 
 @router.get("/scenarios", response_model=list[ScenarioResponse])
 async def list_scenarios(
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """List available scenarios for practice."""
-    scenarios = db.query(Scenario).filter(Scenario.is_practice == True).all()
-
-    result = []
-    for scenario in scenarios:
-        persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first()
-        result.append(
-            ScenarioResponse(
-                id=scenario.id,
-                name=scenario.name,
-                description=scenario.description,
-                persona_name=persona.name if persona else "Unknown",
-                persona_title=persona.title if persona else "",
-                persona_background=persona.background if persona else None,
-                is_practice=scenario.is_practice,
-                max_turns=scenario.max_turns,
-            )
+    rows = [
+        (scenario, persona)
+        for scenario, persona in await catalog_cache.list_scenarios(db)
+        if scenario.is_practice
+    ]
+
+    return [
+        ScenarioResponse(
+            id=scenario.id,
+            name=scenario.name,
+            description=scenario.description,
+            persona_name=persona.name if persona else "Unknown",
+            persona_title=persona.title if persona else "",
+            persona_background=persona.background if persona else None,
+            is_practice=scenario.is_practice,
+            max_turns=scenario.max_turns,
         )
-    return result
+        for scenario, persona in rows
+    ]
 
 
 @router.post("", response_model=ConversationResponse)
 async def start_conversation(
     request: StartConversationRequest,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """Start a new conversation with a stakeholder persona."""
-    user_id = get_current_user_id(user_key)
+    user_id = user.id
 
     # Get scenario
-    scenario = db.query(Scenario).filter(Scenario.id == request.scenario_id).first()
+    scenario = await catalog_cache.get(db, Scenario, request.scenario_id)
     if not scenario:
         raise HTTPException(status_code=404, detail="Scenario not found")
 
     # Get persona
-    persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first()
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id)
     if not persona:
         raise HTTPException(status_code=404, detail="Persona not found")
 
+    await rate_limiter.check(db, "start", user_id, scenario)
+
     # Determine mode
     mode = ConversationMode.GRADED if request.assignment_id else ConversationMode.PRACTICE
 
-    # Create conversation
+    started_at = datetime.utcnow()
+    await release_connection(db)
+
+    # Generate opening message from stakeholder
+    engine = ConversationEngine(persona=persona, context=request.context)
+    opening_message = await engine.get_opening_message()
+
+    # Create the conversation with the stakeholder's opening message
     conversation = Conversation(
         user_id=user_id,
         scenario_id=scenario.id,
@@ -119,26 +202,23 @@ async def start_conversation(
         context=request.context,
         mode=mode,
         status=ConversationStatus.IN_PROGRESS,
-        turn_count=0,
+        started_at=started_at,
+        turn_count=1,
     )
     db.add(conversation)
-    db.flush()
+    await db.flush()
 
-    # Generate opening message from stakeholder
-    engine = ConversationEngine(persona=persona, context=request.context)
-    opening_message = await engine.get_opening_message()
-
-    # Save stakeholder's opening message
     message = Message(
         conversation_id=conversation.id,
         role=MessageRole.STAKEHOLDER,
         content=opening_message,
     )
     db.add(message)
-    conversation.turn_count = 1
 
-    db.commit()
-    db.refresh(conversation)
+    await db.commit()
+    await db.refresh(conversation)
+    await db.refresh(message)
+    await student_dashboard_cache.invalidate(user_id)
 
     return ConversationResponse(
         id=conversation.id,
@@ -164,56 +244,126 @@ async def start_conversation(
 @router.get("/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
     conversation_id: UUID,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
-    """Get conversation details and message history."""
-    user_id = get_current_user_id(user_key)
+    """Get conversation details and message history.
 
-    conversation = (
-        db.query(Conversation)
-        .filter(Conversation.id == conversation_id)
-        .first()
-    )
+    The ETag is the turn count and status, which every message and the
+    end of the conversation change, so a poll that matches is answered
+    with a 304 before the transcript is read.
+    """
+    user_id = user.id
+
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Check ownership (instructors/admins can view any conversation)
-    if conversation.user_id != user_id and not is_instructor_or_admin(user_key):
+    if conversation.user_id != user_id and not user.is_instructor:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    etag = make_etag(conversation.id, conversation.turn_count, conversation.status.value)
+    not_modified = check_not_modified("conversation", request, response, etag)
+    if not_modified:
+        return not_modified
+
     # Get persona
-    scenario = db.query(Scenario).filter(Scenario.id == conversation.scenario_id).first()
-    persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first()
+    scenario = await catalog_cache.get(db, Scenario, conversation.scenario_id)
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id)
 
     # Get messages
-    messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at)
-        .all()
+    messages = (await db.scalars(_transcript_query(conversation))).all()
+
+    # Built from loaded rows, so rendered without revalidation
+    return trusted_response(
+        {
+            "id": conversation.id,
+            "scenario_id": conversation.scenario_id,
+            "persona_name": persona.name if persona else "Unknown",
+            "persona_title": persona.title if persona else "",
+            "mode": conversation.mode.value,
+            "status": conversation.status.value,
+            "context": conversation.context,
+            "turn_count": conversation.turn_count,
+            "started_at": conversation.started_at,
+            "completed_at": conversation.completed_at,
+            "messages": [_message_payload(msg) for msg in messages],
+        },
+        response,
     )
 
-    return ConversationResponse(
-        id=conversation.id,
-        scenario_id=conversation.scenario_id,
-        persona_name=persona.name if persona else "Unknown",
-        persona_title=persona.title if persona else "",
-        mode=conversation.mode.value,
-        status=conversation.status.value,
-        context=conversation.context,
-        turn_count=conversation.turn_count,
-        started_at=conversation.started_at,
-        completed_at=conversation.completed_at,
-        messages=[
-            MessageResponse(
-                id=msg.id,
-                role=msg.role.value,
-                content=msg.content,
-                created_at=msg.created_at,
+
+@router.get("/{conversation_id}/messages", response_model=MessagesSinceResponse)
+async def get_messages_since(
+    conversation_id: UUID,
+    since: datetime,
+    after: Optional[UUID] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+):
+    """Catch up on a conversation: messages after the client's last one.
+
+    Pass the ``created_at`` of the last message the client has as
+    ``since`` and its ``id`` as ``after``; messages are ordered by
+    ``(created_at, id)``, so the pair is an exact position. The payload
+    holds only the new messages plus the current status and turn count,
+    however long the transcript is. With ``has_more``, ask again from the
+    last message returned.
+    """
+    # Message times are naive UTC
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+    conversation = (
+        await db.execute(
+            select(
+                Conversation.user_id,
+                Conversation.status,
+                Conversation.turn_count,
+                Conversation.started_at,
+                Conversation.completed_at,
+            ).where(Conversation.id == conversation_id)
+        )
+    ).first()
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    if conversation.user_id != user.id and not user.is_instructor:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    # A range on the (conversation_id, created_at) index; the created_at
+    # bound also lets Postgres skip earlier monthly partitions
+    position = (
+        tuple_(Message.created_at, Message.id) > tuple_(since, after)
+        if after
+        else Message.created_at > since
+    )
+    messages = (
+        await db.scalars(
+            select(Message)
+            .where(
+                Message.conversation_id == conversation_id,
+                Message.created_at >= max(since, conversation.started_at),
+                position,
             )
-            for msg in messages
-        ],
+            .order_by(Message.created_at, Message.id)
+            .limit(limit + 1)
+        )
+    ).all()
+
+    return trusted_response(
+        {
+            "id": conversation_id,
+            "status": conversation.status.value,
+            "turn_count": conversation.turn_count,
+            "completed_at": conversation.completed_at,
+            "messages": [_message_payload(msg) for msg in messages[:limit]],
+            "has_more": len(messages) > limit,
+        }
     )
 
 
@@ -221,17 +371,18 @@ async def get_conversation(
 async def send_message(
     conversation_id: UUID,
     request: SendMessageRequest,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """Send a message and get the stakeholder's response."""
-    user_id = get_current_user_id(user_key)
+    user_id = user.id
 
     # Get conversation
-    conversation = (
-        db.query(Conversation)
-        .filter(Conversation.id == conversation_id)
-        .first()
+    conversation = await db.scalar(
+        select(Conversation)
+        .where(Conversation.id == conversation_id)
+        .options(defer(Conversation.grading_ledger))
     )
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
@@ -244,68 +395,51 @@ async def send_message(
             status_code=400, detail="Conversation is not active"
         )
 
-    # Get scenario and persona
-    scenario = db.query(Scenario).filter(Scenario.id == conversation.scenario_id).first()
-    persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first()
+    # Scenario and persona come from the catalog cache, not the database
+    scenario = await catalog_cache.get(db, Scenario, conversation.scenario_id)
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id)
 
-    # Save student message
-    student_message = Message(
-        conversation_id=conversation.id,
-        role=MessageRole.STUDENT,
-        content=request.content,
-    )
-    db.add(student_message)
-    db.flush()
+    await rate_limiter.check(db, "message", user_id, scenario)
 
-    # Load conversation history and generate response
-    existing_messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at)
-        .all()
-    )
+    # Load conversation history
+    existing_messages = (await db.scalars(_transcript_query(conversation))).all()
+
+    # Timestamped now so it sorts before the response
+    student_message = _new_message(conversation.id, MessageRole.STUDENT, request.content)
 
     engine = ConversationEngine(persona=persona, context=conversation.context)
-    engine.load_history(existing_messages[:-1])  # Exclude the message we just added
+    engine.load_history(existing_messages)
+    await release_connection(db)
 
     # Generate stakeholder response
     stakeholder_response = await engine.get_response(request.content)
-
-    # Save stakeholder message
-    stakeholder_message = Message(
-        conversation_id=conversation.id,
-        role=MessageRole.STAKEHOLDER,
-        content=stakeholder_response,
+    stakeholder_message = _new_message(
+        conversation.id, MessageRole.STAKEHOLDER, stakeholder_response
     )
-    db.add(stakeholder_message)
 
-    # Update turn count
-    conversation.turn_count += 1
+    # Save both messages and count the turn
+    turn_count = await _persist_turn(db, conversation.id, [student_message, stakeholder_message])
+    if turn_count is None:
+        # Ended by another request while we waited on the LLM
+        await db.rollback()
+        raise HTTPException(
+            status_code=400, detail="Conversation is not active"
+        )
+    await db.commit()
 
     # Check if should end
-    should_end = engine.should_end_conversation(
-        conversation.turn_count, scenario.max_turns
-    )
+    should_end = engine.should_end_conversation(turn_count, scenario.max_turns)
 
-    db.commit()
-    db.refresh(student_message)
-    db.refresh(stakeholder_message)
+    # Keep the evidence ledger current so the final grade only reconciles
+    interval = settings.progressive_grading_interval
+    if interval and turn_count % interval == 0 and not should_end:
+        background_tasks.add_task(_update_grading_ledger, conversation.id)
 
     return StakeholderMessageResponse(
-        student_message=MessageResponse(
-            id=student_message.id,
-            role=student_message.role.value,
-            content=student_message.content,
-            created_at=student_message.created_at,
-        ),
-        stakeholder_message=MessageResponse(
-            id=stakeholder_message.id,
-            role=stakeholder_message.role.value,
-            content=stakeholder_message.content,
-            created_at=stakeholder_message.created_at,
-        ),
-        conversation_status=conversation.status.value,
-        turn_count=conversation.turn_count,
+        student_message=_message_response(student_message),
+        stakeholder_message=_message_response(stakeholder_message),
+        conversation_status=ConversationStatus.IN_PROGRESS.value,
+        turn_count=turn_count,
         should_end=should_end,
     )
 
@@ -313,17 +447,13 @@ async def send_message(
 @router.post("/{conversation_id}/end", response_model=EndConversationResponse)
 async def end_conversation(
     conversation_id: UUID,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """End a conversation and trigger grading."""
-    user_id = get_current_user_id(user_key)
+    user_id = user.id
 
-    conversation = (
-        db.query(Conversation)
-        .filter(Conversation.id == conversation_id)
-        .first()
-    )
+    conversation = await db.get(Conversation, conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -336,19 +466,18 @@ async def end_conversation(
         )
 
     # Get scenario and persona for closing message
-    scenario = db.query(Scenario).filter(Scenario.id == conversation.scenario_id).first()
-    persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first()
+    scenario = await catalog_cache.get(db, Scenario, conversation.scenario_id)
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id)
+
+    # The closing message is a chat turn too
+    await rate_limiter.check(db, "message", user_id, scenario)
 
     # Generate closing message
-    existing_messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at)
-        .all()
-    )
+    existing_messages = (await db.scalars(_transcript_query(conversation))).all()
 
     engine = ConversationEngine(persona=persona, context=conversation.context)
     engine.load_history(existing_messages)
+    await release_connection(db)
 
     closing_message_text = await engine.get_closing_message()
 
@@ -361,11 +490,13 @@ async def end_conversation(
     db.add(closing_message)
 
     # Update conversation status
+    db.add(conversation)
     conversation.status = ConversationStatus.COMPLETED
     conversation.completed_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(closing_message)
+    await db.commit()
+    await db.refresh(closing_message)
+    await student_dashboard_cache.invalidate(user_id)
 
     # TODO: Trigger grading in background
 
@@ -385,45 +516,55 @@ async def end_conversation(
 
 @router.get("", response_model=list[ConversationListItem])
 async def list_conversations(
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    mode: Optional[ConversationMode] = None,
+    status_filter: Optional[ConversationStatus] = Query(None, alias="status"),
+    persona_id: Optional[UUID] = None,
 ):
-    """List user's conversations."""
-    user_id = get_current_user_id(user_key)
-
-    conversations = (
-        db.query(Conversation)
-        .filter(Conversation.user_id == user_id)
-        .order_by(Conversation.started_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+    """List user's conversations, newest first.
 
-    result = []
-    for conv in conversations:
-        scenario = db.query(Scenario).filter(Scenario.id == conv.scenario_id).first()
-        persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
-
-        # Get score if graded
-        score = None
-        if conv.grade:
-            score = float(conv.grade.total_score)
-
-        result.append(
-            ConversationListItem(
-                id=conv.id,
-                scenario_id=conv.scenario_id,
-                persona_name=persona.name if persona else "Unknown",
-                mode=conv.mode.value,
-                status=conv.status.value,
-                turn_count=conv.turn_count,
-                started_at=conv.started_at,
-                completed_at=conv.completed_at,
-                score=score,
-            )
-        )
-
-    return result
+    Paginated by keyset: pass the ``X-Next-Cursor`` response header back as
+    ``cursor`` to get the next page. The header is absent on the last page.
+    """
+    user_id = user.id
+
+    # One projected query: persona name and score come along with each row
+    query = (
+        select(Conversation, Persona.name, Grade.total_score)
+        .options(defer(Conversation.grading_ledger))
+        .outerjoin(Scenario, Scenario.id == Conversation.scenario_id)
+        .outerjoin(Persona, Persona.id == Scenario.persona_id)
+        .outerjoin(Grade, Grade.conversation_id == Conversation.id)
+        .where(Conversation.user_id == user_id)
+    )
+    query = filter_conversations(query, mode, status_filter, persona_id)
+    try:
+        query = paginate_conversations(query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows, next_cursor = split_page((await db.execute(query)).all(), limit, key=lambda r: r[0])
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return trusted_response(
+        [
+            {
+                "id": conv.id,
+                "scenario_id": conv.scenario_id,
+                "persona_name": persona_name or "Unknown",
+                "mode": conv.mode.value,
+                "status": conv.status.value,
+                "turn_count": conv.turn_count,
+                "started_at": conv.started_at,
+                "completed_at": conv.completed_at,
+                "score": float(total_score) if total_score is not None else None,
+            }
+            for conv, persona_name, total_score in rows
+        ],
+        response,
+    )
@@ -4,16 +4,19 @@ from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, desc
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Numeric, String, column, desc, distinct, func, or_, select, true
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.models.conversation import Conversation, ConversationStatus, ConversationMode
 from app.models.scenario import Scenario
 from app.models.persona import Persona
 from app.models.grade import Grade
+from app.models.analytics import DailyAnalytics
 from app.schemas.dashboard import (
     StudentStats,
     StudentDashboard,
@@ -23,45 +26,72 @@ from app.schemas.dashboard import (
     ClassStats,
     StudentSummary,
     GradeForReview,
+    TrendPoint,
+    TrendsResponse,
 )
-from app.routers.auth import MOCK_USERS
+from app.services.analytics_rollup import get_last_rollup, merge_struggles, trend_window
+from app.services.catalog_cache import catalog_cache
+from app.services.dashboard_cache import student_dashboard_cache
+from app.services.etags import check_not_modified, make_etag
+from app.services.responses import trusted_response
+from app.services.single_flight import SingleFlight
+from app.routers.auth import CurrentUser, get_authenticated_user
 
 router = APIRouter()
 
+# The instructor dashboard's "active this week" counts move with the clock,
+# not only with writes; its ETag changes at least this often.
+INSTRUCTOR_ETAG_WINDOW_SECONDS = 300
 
-def get_current_user_id(user_key: Optional[str] = None) -> UUID:
-    """Get current user ID from mock auth."""
-    if not user_key:
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return UUID(user["id"])
-
-
-def get_user_role(user_key: Optional[str] = None) -> str:
-    """Get current user's role."""
-    if not user_key:
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    return user["role"] if user else "student"
+instructor_dashboard_flight = SingleFlight("instructor_dashboard", distributed=True)
 
 
 @router.get("/student", response_model=StudentDashboard)
 async def get_student_dashboard(
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
-    """Get student dashboard with stats and recent activity."""
-    user_id = get_current_user_id(user_key)
-
-    # Get all conversations
-    conversations = (
-        db.query(Conversation)
-        .filter(Conversation.user_id == user_id)
-        .all()
+    """Get student dashboard with stats and recent activity.
+
+    Served from a per-student cache that conversation and grade writes
+    invalidate. Rebuilds read the primary so a lagging replica is never
+    cached. The cache's version counter is the ETag, so a matching poll
+    costs one Redis read.
+    """
+    user_id = user.id
+
+    version = await student_dashboard_cache.version(user_id)
+    etag = make_etag(user_id, version) if version is not None else None
+    not_modified = check_not_modified("student_dashboard", request, response, etag)
+    if not_modified:
+        return not_modified
+
+    async def build():
+        dashboard = await _build_student_dashboard(db, user_id)
+        return dashboard.model_dump(mode="json")
+
+    return StudentDashboard.model_validate(
+        await student_dashboard_cache.get_or_build(user_id, build)
     )
 
+
+async def _build_student_dashboard(db: AsyncSession, user_id: UUID) -> StudentDashboard:
+    """Compute a student's dashboard from one query over their conversations."""
+    rows = (
+        await db.execute(
+            select(Conversation, Grade.total_score)
+            .outerjoin(Grade, Grade.conversation_id == Conversation.id)
+            .where(Conversation.user_id == user_id)
+            .options(defer(Conversation.grading_ledger))
+        )
+    ).all()
+    conversations = [conv for conv, _ in rows]
+    scores_by_id = {
+        conv.id: float(score) for conv, score in rows if score is not None
+    }
+
     # Calculate stats
     total = len(conversations)
     completed = len([c for c in conversations if c.status == ConversationStatus.COMPLETED])
@@ -69,10 +99,7 @@ async def get_student_dashboard(
     graded = len([c for c in conversations if c.mode == ConversationMode.GRADED])
 
     # Get scores
-    scores = []
-    for conv in conversations:
-        if conv.grade:
-            scores.append(float(conv.grade.total_score))
+    scores = list(scores_by_id.values())
 
     avg_score = sum(scores) / len(scores) if scores else None
     best_score = max(scores) if scores else None
@@ -81,13 +108,11 @@ async def get_student_dashboard(
     improvement = None
     if len(scores) >= 2:
         # Get first score chronologically
-        graded_convs = sorted(
-            [c for c in conversations if c.grade],
-            key=lambda x: x.started_at
+        first = min(
+            (c for c in conversations if c.id in scores_by_id),
+            key=lambda c: c.started_at,
         )
-        if graded_convs:
-            first_score = float(graded_convs[0].grade.total_score)
-            improvement = best_score - first_score
+        improvement = best_score - scores_by_id[first.id]
 
     stats = StudentStats(
         total_conversations=total,
@@ -99,51 +124,41 @@ async def get_student_dashboard(
         total_improvement=round(improvement, 1) if improvement else None,
     )
 
-    # Recent conversations
-    recent_convs = (
-        db.query(Conversation)
-        .filter(Conversation.user_id == user_id)
-        .order_by(desc(Conversation.started_at))
-        .limit(5)
-        .all()
-    )
+    async def persona_name(conv: Conversation) -> str:
+        scenario = await catalog_cache.get(db, Scenario, conv.scenario_id)
+        persona = await catalog_cache.get(db, Persona, scenario.persona_id) if scenario else None
+        return persona.name if persona else "Unknown"
 
+    # Recent conversations
     recent = []
-    for conv in recent_convs:
-        scenario = db.query(Scenario).filter(Scenario.id == conv.scenario_id).first()
-        persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
-
+    for conv in sorted(conversations, key=lambda c: c.started_at, reverse=True)[:5]:
         recent.append(RecentConversation(
             id=conv.id,
-            persona_name=persona.name if persona else "Unknown",
+            persona_name=await persona_name(conv),
             status=conv.status.value,
-            score=float(conv.grade.total_score) if conv.grade else None,
+            score=scores_by_id.get(conv.id),
             started_at=conv.started_at,
             completed_at=conv.completed_at,
         ))
 
     # Progress history (for chart)
     progress = []
-    graded_conversations = (
-        db.query(Conversation)
-        .filter(Conversation.user_id == user_id)
-        .filter(Conversation.status == ConversationStatus.COMPLETED)
-        .join(Grade)
-        .order_by(Conversation.completed_at)
-        .all()
+    graded_conversations = sorted(
+        (
+            c for c in conversations
+            if c.status == ConversationStatus.COMPLETED
+            and c.completed_at
+            and c.id in scores_by_id
+        ),
+        key=lambda c: c.completed_at,
     )
-
     for conv in graded_conversations:
-        if conv.grade and conv.completed_at:
-            scenario = db.query(Scenario).filter(Scenario.id == conv.scenario_id).first()
-            persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
-
-            progress.append(ProgressPoint(
-                date=conv.completed_at,
-                score=float(conv.grade.total_score),
-                conversation_id=conv.id,
-                persona_name=persona.name if persona else "Unknown",
-            ))
+        progress.append(ProgressPoint(
+            date=conv.completed_at,
+            score=scores_by_id[conv.id],
+            conversation_id=conv.id,
+            persona_name=await persona_name(conv),
+        ))
 
     return StudentDashboard(
         stats=stats,
@@ -153,166 +168,222 @@ async def get_student_dashboard(
     )
 
 
+# Display names for rubric criteria in "common struggles"
+CRITERION_NAMES = {
+    "business_value_articulation": "Quantifying business value",
+    "audience_adaptation": "Adapting to audience",
+    "handling_objections": "Handling objections",
+    "clarity_and_structure": "Clear structure",
+    "honesty_and_limitations": "Discussing limitations",
+    "actionable_recommendation": "Clear recommendations",
+}
+
+
+async def _class_stats(db: AsyncSession, week_ago: datetime) -> ClassStats:
+    """Class-wide totals, score distribution and struggles as SQL aggregates."""
+    total_students = await db.scalar(
+        select(func.count(User.id)).where(User.role == UserRole.STUDENT)
+    )
+
+    total_conversations, active_students = (
+        await db.execute(
+            select(
+                func.count(Conversation.id),
+                func.count(distinct(Conversation.user_id)).filter(
+                    Conversation.started_at >= week_ago
+                ),
+            )
+        )
+    ).one()
+
+    score = Grade.total_score
+    grade_stats = (
+        await db.execute(
+            select(
+                func.count(Grade.id),
+                func.avg(score),
+                func.count(Grade.id).filter(score >= 90),
+                func.count(Grade.id).filter(score >= 80, score < 90),
+                func.count(Grade.id).filter(score >= 70, score < 80),
+                func.count(Grade.id).filter(score >= 60, score < 70),
+                func.count(Grade.id).filter(score < 60),
+            )
+        )
+    ).one()
+    total_graded, average_score = grade_stats[0], grade_stats[1]
+    distribution = dict(zip(["90-100", "80-89", "70-79", "60-69", "Below 60"], grade_stats[2:]))
+
+    # Criteria most often scored below 70% of their maximum
+    criteria = func.jsonb_each(Grade.criteria_scores).table_valued(
+        column("key", String), column("value", JSONB)
+    ).render_derived(name="criteria")
+    criterion_score = criteria.c.value["score"].astext.cast(Numeric)
+    criterion_max = func.coalesce(
+        func.nullif(criteria.c.value["max_score"].astext.cast(Numeric), 0), 1
+    )
+    struggle_count = func.count().label("struggle_count")
+    struggles = (
+        await db.execute(
+            select(criteria.c.key, struggle_count)
+            .select_from(Grade)
+            .join(criteria, true())
+            .where(criterion_score * 100 / criterion_max < 70)
+            .group_by(criteria.c.key)
+            .order_by(struggle_count.desc(), criteria.c.key)
+            .limit(3)
+        )
+    ).all()
+
+    return ClassStats(
+        total_students=total_students,
+        active_students=active_students,
+        total_conversations=total_conversations,
+        total_graded=total_graded,
+        average_score=round(float(average_score), 1) if average_score is not None else None,
+        score_distribution=distribution,
+        common_struggles=[CRITERION_NAMES.get(key, key) for key, _ in struggles],
+    )
+
+
+async def _student_summaries(db: AsyncSession, week_ago: datetime) -> list[StudentSummary]:
+    """Per-student totals in one grouped query, needing-attention first."""
+    average_score = func.avg(Grade.total_score)
+    last_active = func.max(Conversation.started_at)
+    needs_attention = func.coalesce(
+        or_(average_score < 60, last_active.is_(None), last_active < week_ago),
+        False,
+    )
+
+    rows = (
+        await db.execute(
+            select(
+                User.id,
+                User.name,
+                User.email,
+                func.count(Conversation.id),
+                average_score,
+                last_active,
+                needs_attention,
+            )
+            .outerjoin(Conversation, Conversation.user_id == User.id)
+            .outerjoin(Grade, Grade.conversation_id == Conversation.id)
+            .where(User.role == UserRole.STUDENT)
+            .group_by(User.id)
+            .order_by(needs_attention.desc(), User.name)
+        )
+    ).all()
+
+    return [
+        StudentSummary(
+            id=student_id,
+            name=name,
+            email=email,
+            total_conversations=total,
+            average_score=round(float(avg), 1) if avg is not None else None,
+            last_active=last,
+            needs_attention=attention,
+        )
+        for student_id, name, email, total, avg, last, attention in rows
+    ]
+
+
 @router.get("/instructor", response_model=InstructorDashboard)
 async def get_instructor_dashboard(
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
-    """Get instructor dashboard with class overview."""
-    role = get_user_role(user_key)
+    """Get instructor dashboard with class overview.
 
-    if role not in ["instructor", "admin"]:
+    The ETag combines the class-wide dashboard version (bumped by every
+    conversation and grade write) with a time window, so a matching poll
+    skips every query.
+    """
+    if not user.is_instructor:
         raise HTTPException(status_code=403, detail="Instructor access required")
 
-    # Get all students
-    students = db.query(User).filter(User.role == UserRole.STUDENT).all()
+    now = datetime.utcnow()
+    version = await student_dashboard_cache.class_version()
+    window = int(now.timestamp()) // INSTRUCTOR_ETAG_WINDOW_SECONDS
+    etag = make_etag("class", version, window) if version is not None else None
+    not_modified = check_not_modified("instructor_dashboard", request, response, etag)
+    if not_modified:
+        return not_modified
 
-    # Get all conversations
-    all_conversations = db.query(Conversation).all()
-
-    # Calculate class stats
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    active_student_ids = set(
-        c.user_id for c in all_conversations
-        if c.started_at >= week_ago
-    )
+    async def build():
+        dashboard = await _build_instructor_dashboard(db, now)
+        return dashboard.model_dump(mode="json")
 
-    # Score distribution
-    grades = db.query(Grade).all()
-    scores = [float(g.total_score) for g in grades]
+    # TAs opening the dashboard together (on any worker) share one build
+    payload = await instructor_dashboard_flight.do(version, build)
+    return trusted_response(payload, response)
 
-    distribution = {
-        "90-100": 0,
-        "80-89": 0,
-        "70-79": 0,
-        "60-69": 0,
-        "Below 60": 0,
-    }
 
-    for score in scores:
-        if score >= 90:
-            distribution["90-100"] += 1
-        elif score >= 80:
-            distribution["80-89"] += 1
-        elif score >= 70:
-            distribution["70-79"] += 1
-        elif score >= 60:
-            distribution["60-69"] += 1
-        else:
-            distribution["Below 60"] += 1
-
-    # Common struggles (simplified - could use AI analysis)
-    common_struggles = []
-    low_score_criteria = {}
-    for grade in grades:
-        for criterion, data in grade.criteria_scores.items():
-            score_pct = data.get("score", 0) / data.get("max_score", 1) * 100
-            if score_pct < 70:
-                low_score_criteria[criterion] = low_score_criteria.get(criterion, 0) + 1
-
-    # Get top 3 struggles
-    sorted_struggles = sorted(low_score_criteria.items(), key=lambda x: x[1], reverse=True)
-    criterion_names = {
-        "business_value_articulation": "Quantifying business value",
-        "audience_adaptation": "Adapting to audience",
-        "handling_objections": "Handling objections",
-        "clarity_and_structure": "Clear structure",
-        "honesty_and_limitations": "Discussing limitations",
-        "actionable_recommendation": "Clear recommendations",
-    }
-    for criterion, count in sorted_struggles[:3]:
-        if count > 0:
-            common_struggles.append(criterion_names.get(criterion, criterion))
-
-    class_stats = ClassStats(
-        total_students=len(students),
-        active_students=len(active_student_ids),
-        total_conversations=len(all_conversations),
-        total_graded=len(grades),
-        average_score=round(sum(scores) / len(scores), 1) if scores else None,
-        score_distribution=distribution,
-        common_struggles=common_struggles,
-    )
+async def _build_instructor_dashboard(db: AsyncSession, now: datetime) -> InstructorDashboard:
+    """Build the instructor dashboard from the database."""
+    week_ago = now - timedelta(days=7)
+    class_stats = await _class_stats(db, week_ago)
 
     # Recent activity
-    recent_activity = (
-        db.query(Conversation)
-        .order_by(desc(Conversation.started_at))
-        .limit(10)
-        .all()
-    )
-
-    recent = []
-    for conv in recent_activity:
-        scenario = db.query(Scenario).filter(Scenario.id == conv.scenario_id).first()
-        persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
+    recent_rows = (
+        await db.execute(
+            select(Conversation, Persona.name, Grade.total_score)
+            .options(defer(Conversation.grading_ledger))
+            .outerjoin(Scenario, Scenario.id == Conversation.scenario_id)
+            .outerjoin(Persona, Persona.id == Scenario.persona_id)
+            .outerjoin(Grade, Grade.conversation_id == Conversation.id)
+            .order_by(desc(Conversation.started_at))
+            .limit(10)
+        )
+    ).all()
 
-        recent.append(RecentConversation(
+    recent = [
+        RecentConversation(
             id=conv.id,
-            persona_name=persona.name if persona else "Unknown",
+            persona_name=persona_name or "Unknown",
             status=conv.status.value,
-            score=float(conv.grade.total_score) if conv.grade else None,
+            score=float(total_score) if total_score is not None else None,
             started_at=conv.started_at,
             completed_at=conv.completed_at,
-        ))
-
-    # Student summaries
-    student_summaries = []
-    for student in students:
-        student_convs = [c for c in all_conversations if c.user_id == student.id]
-        student_scores = [
-            float(c.grade.total_score) for c in student_convs if c.grade
-        ]
-
-        last_conv = max(student_convs, key=lambda x: x.started_at) if student_convs else None
-
-        # Flag students with low scores or no recent activity
-        needs_attention = False
-        if student_scores and sum(student_scores) / len(student_scores) < 60:
-            needs_attention = True
-        if not last_conv or last_conv.started_at < week_ago:
-            needs_attention = True
-
-        student_summaries.append(StudentSummary(
-            id=student.id,
-            name=student.name,
-            email=student.email,
-            total_conversations=len(student_convs),
-            average_score=round(sum(student_scores) / len(student_scores), 1) if student_scores else None,
-            last_active=last_conv.started_at if last_conv else None,
-            needs_attention=needs_attention,
-        ))
+        )
+        for conv, persona_name, total_score in recent_rows
+    ]
 
-    # Sort by needs attention first, then by name
-    student_summaries.sort(key=lambda x: (not x.needs_attention, x.name))
+    student_summaries = await _student_summaries(db, week_ago)
 
     # Grades needing review
-    low_confidence_grades = (
-        db.query(Grade)
-        .filter(Grade.ai_confidence < 0.7)
-        .filter(Grade.instructor_override == False)
-        .order_by(desc(Grade.graded_at))
-        .limit(10)
-        .all()
-    )
-
-    grades_for_review = []
-    for grade in low_confidence_grades:
-        conv = db.query(Conversation).filter(Conversation.id == grade.conversation_id).first()
-        if conv:
-            student = db.query(User).filter(User.id == conv.user_id).first()
-            scenario = db.query(Scenario).filter(Scenario.id == conv.scenario_id).first()
-            persona = db.query(Persona).filter(Persona.id == scenario.persona_id).first() if scenario else None
-
-            grades_for_review.append(GradeForReview(
-                id=grade.id,
-                conversation_id=grade.conversation_id,
-                student_name=student.name if student else "Unknown",
-                persona_name=persona.name if persona else "Unknown",
-                score=float(grade.total_score),
-                ai_confidence=float(grade.ai_confidence) if grade.ai_confidence else 0,
-                graded_at=grade.graded_at,
-            ))
+    review_rows = (
+        await db.execute(
+            select(Grade, User.name, Persona.name)
+            .join(Conversation, Conversation.id == Grade.conversation_id)
+            .outerjoin(User, User.id == Conversation.user_id)
+            .outerjoin(Scenario, Scenario.id == Conversation.scenario_id)
+            .outerjoin(Persona, Persona.id == Scenario.persona_id)
+            .where(or_(Grade.ai_confidence < 0.7, Grade.feature_anomaly == True))
+            .where(Grade.instructor_override == False)
+            .order_by(
+                desc(Grade.feature_anomaly),
+                Grade.ai_confidence.asc(),
+                desc(Grade.graded_at),
+            )
+            .limit(10)
+        )
+    ).all()
+
+    grades_for_review = [
+        GradeForReview(
+            id=grade.id,
+            conversation_id=grade.conversation_id,
+            student_name=student_name or "Unknown",
+            persona_name=persona_name or "Unknown",
+            score=float(grade.total_score),
+            ai_confidence=float(grade.ai_confidence) if grade.ai_confidence else 0,
+            graded_at=grade.graded_at,
+            feature_anomaly=grade.feature_anomaly,
+        )
+        for grade, student_name, persona_name in review_rows
+    ]
 
     return InstructorDashboard(
         class_stats=class_stats,
@@ -320,3 +391,63 @@ async def get_instructor_dashboard(
         students=student_summaries,
         grades_needing_review=grades_for_review,
     )
+
+
+@router.get("/trends", response_model=TrendsResponse)
+async def get_trends(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+    course_id: Optional[UUID] = None,
+    days: int = Query(28, ge=1, le=366),
+):
+    """Daily activity and score trends from the analytics rollup.
+
+    Reads only DailyAnalytics rows (one per course per day), so the cost
+    depends on the window length, not on the number of conversations.
+    Days without activity are returned as zero points. The rollup only
+    changes when it runs, so its last run time is the ETag.
+    """
+    if not user.is_instructor:
+        raise HTTPException(status_code=403, detail="Instructor access required")
+
+    start = trend_window(days)
+    last_rollup_at = await get_last_rollup(db)
+    etag = make_etag(course_id, start, days, last_rollup_at)
+    not_modified = check_not_modified("trends", request, response, etag)
+    if not_modified:
+        return not_modified
+
+    query = select(DailyAnalytics).where(DailyAnalytics.date >= start)
+    if course_id:
+        query = query.where(DailyAnalytics.course_id == course_id)
+    rows = (await db.scalars(query)).all()
+
+    # Combine courses per day; averages are weighted by graded count
+    by_day: dict = {}
+    for row in rows:
+        by_day.setdefault(row.date, []).append(row)
+
+    points = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        day_rows = by_day.get(day, [])
+        scored = sum(r.total_scored for r in day_rows)
+        weighted = sum(float(r.avg_score) * r.total_scored for r in day_rows if r.avg_score is not None)
+        points.append(TrendPoint(
+            date=day,
+            total_conversations=sum(r.total_conversations for r in day_rows),
+            total_practice=sum(r.total_practice for r in day_rows),
+            total_graded=sum(r.total_graded for r in day_rows),
+            average_score=round(weighted / scored, 1) if scored else None,
+            common_struggles=merge_struggles([r.common_struggles for r in day_rows]),
+        ))
+
+    return TrendsResponse(
+        course_id=course_id,
+        days=days,
+        points=points,
+        common_struggles=merge_struggles([r.common_struggles for r in rows]),
+        last_rollup_at=last_rollup_at,
+    )
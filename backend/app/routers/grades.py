@@ -1,17 +1,22 @@
 """Grading API endpoints."""
 
+import asyncio
+import logging
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import get_db, get_read_db, release_connection, AsyncSessionLocal
 from app.models.conversation import Conversation, ConversationStatus
 from app.models.scenario import Scenario
 from app.models.persona import Persona
-from app.models.rubric import Rubric
+from app.models.rubric import Rubric, RubricVersion
 from app.models.grade import Grade, GradedBy
 from app.schemas.grade import (
     GradeResponse,
@@ -19,31 +24,41 @@ from app.schemas.grade import (
     GradeOverrideRequest,
     FullGradeOverrideRequest,
     RubricResponse,
+    RubricUpdateRequest,
+    RubricVersionResponse,
     TriggerGradeRequest,
     CriterionScore,
+    RegradePlanResponse,
+    RegradePlanItem,
+    RegradeExecuteRequest,
+    RegradeProgressResponse,
 )
+from app.config import get_settings
+from app.services.analytics_rollup import touch_day
+from app.services.catalog_cache import catalog_cache
+from app.services.dashboard_cache import student_dashboard_cache
+from app.services.etags import check_not_modified, make_etag
+from app.services import grade_events
+from app.services.grade_events import GradeEvent, GradeEventSubscription
 from app.services.grading_engine import GradingEngine
-from app.routers.auth import MOCK_USERS
+from app.services.transcript_features import (
+    extract_features,
+    predict_score_pct,
+    is_anomalous,
+)
+from app.services.metrics import metrics, rate
+from app.services.rate_limit import rate_limiter
+from app.services.regrade_planner import (
+    RegradeItem,
+    build_regrade_plan,
+    regrade_tracker,
+    still_needs_regrade,
+)
+from app.routers.auth import CurrentUser, get_authenticated_user
 
 router = APIRouter()
-
-
-def get_current_user_id(user_key: Optional[str] = None) -> UUID:
-    """Get current user ID from mock auth."""
-    if not user_key:
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid user")
-    return UUID(user["id"])
-
-
-def get_user_role(user_key: Optional[str] = None) -> str:
-    """Get current user's role."""
-    if not user_key:
-        user_key = "student1"
-    user = MOCK_USERS.get(user_key)
-    return user["role"] if user else "student"
+logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 def _grade_to_response(grade: Grade, rubric: Rubric) -> GradeResponse:
@@ -70,6 +85,7 @@ def _grade_to_response(grade: Grade, rubric: Rubric) -> GradeResponse:
         areas_for_improvement=grade.areas_for_improvement or [],
         ai_confidence=float(grade.ai_confidence) if grade.ai_confidence else None,
         graded_by=grade.graded_by.value,
+        rubric_version=grade.rubric_version,
         instructor_override=grade.instructor_override,
         override_reason=grade.override_reason,
         graded_at=grade.graded_at,
@@ -79,12 +95,21 @@ def _grade_to_response(grade: Grade, rubric: Rubric) -> GradeResponse:
 
 async def _perform_grading(
     conversation_id: UUID,
-    db: Session,
+    db: AsyncSession,
+    replace_existing: bool = False,
 ) -> Grade:
-    """Perform grading for a conversation."""
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id
-    ).first()
+    """Perform grading for a conversation.
+
+    With ``replace_existing`` the current grade is swapped for the new one
+    in the same transaction, so a failed regrade keeps the old grade.
+    Clients waiting on the grade-event stream are told once it finishes
+    or fails.
+    """
+    conversation = await db.scalar(
+        select(Conversation)
+        .options(selectinload(Conversation.messages))
+        .where(Conversation.id == conversation_id)
+    )
 
     if not conversation:
         raise ValueError("Conversation not found")
@@ -92,97 +117,315 @@ async def _perform_grading(
     if conversation.status != ConversationStatus.COMPLETED:
         raise ValueError("Can only grade completed conversations")
 
-    # Get scenario, persona, rubric
-    scenario = db.query(Scenario).filter(
-        Scenario.id == conversation.scenario_id
-    ).first()
+    try:
+        grade = await _grade_conversation(conversation, db, replace_existing)
+    except Exception as e:
+        await grade_events.publish(GradeEvent.failed(conversation.id, conversation.user_id, e))
+        raise
 
-    persona = db.query(Persona).filter(
-        Persona.id == scenario.persona_id
-    ).first()
+    await grade_events.publish(GradeEvent.completed(grade, conversation.user_id))
+    return grade
 
-    rubric = db.query(Rubric).filter(
-        Rubric.id == scenario.rubric_id
-    ).first()
+
+async def _grade_conversation(
+    conversation: Conversation,
+    db: AsyncSession,
+    replace_existing: bool,
+) -> Grade:
+    """Grade a loaded, completed conversation and store the grade."""
+    # Get scenario, persona, rubric
+    scenario = await catalog_cache.get(db, Scenario, conversation.scenario_id)
+    persona = await catalog_cache.get(db, Persona, scenario.persona_id)
+    rubric = await catalog_cache.get(db, Rubric, scenario.rubric_id)
 
     if not all([scenario, persona, rubric]):
         raise ValueError("Missing scenario, persona, or rubric")
 
+    # Local features first: milliseconds, no LLM call
+    features = extract_features(conversation.messages, persona)
+    features["predicted_score_pct"] = predict_score_pct(features)
+
     # Perform grading
     engine = GradingEngine(rubric)
-    grade_data = await engine.grade_conversation(conversation, persona)
+    await release_connection(db)
+    grade_data = await engine.grade_conversation(
+        conversation, persona, use_ledger=not replace_existing
+    )
 
     # Create grade record
     grade = engine.create_grade_record(
         conversation_id=conversation.id,
         rubric_id=rubric.id,
         grade_data=grade_data,
+        rubric_version=rubric.version,
+    )
+
+    # Flag grades far from what the transcript features predict
+    ai_score_pct = float(grade.total_score) * 100 / (rubric.total_points or 100)
+    grade.transcript_features = features
+    grade.feature_anomaly = is_anomalous(
+        ai_score_pct,
+        features["predicted_score_pct"],
+        settings.feature_anomaly_threshold,
     )
 
+    if replace_existing:
+        existing = await db.scalar(
+            select(Grade).where(Grade.conversation_id == conversation.id).with_for_update()
+        )
+        if existing and existing.instructor_override:
+            # Overridden while the LLM call ran; the instructor's grade stands
+            await db.commit()
+            return existing
+        if existing:
+            await db.delete(existing)
+            await touch_day(db, conversation)
+            await db.flush()
+
     db.add(grade)
-    db.commit()
-    db.refresh(grade)
+    await db.commit()
+    await db.refresh(grade)
+    await student_dashboard_cache.invalidate(conversation.user_id)
 
     return grade
 
 
+async def _run_regrade_plan(items: list[RegradeItem], interval_seconds: float) -> None:
+    """Regrade planned items one at a time, pausing between LLM calls.
+
+    Runs as a background task with its own session and reports into
+    ``regrade_tracker``, which holds the run's lock until it finishes.
+    Items overridden or already regraded since planning are skipped.
+    """
+    progress = regrade_tracker.progress
+    try:
+        async with AsyncSessionLocal() as db:
+            graded_any = False
+            for item in items:
+                if not await still_needs_regrade(db, item.conversation_id):
+                    progress.skipped += 1
+                    progress.estimated_tokens_remaining -= (
+                        item.estimated_input_tokens + item.estimated_output_tokens
+                    )
+                    await regrade_tracker.save()
+                    continue
+                if graded_any:
+                    await asyncio.sleep(interval_seconds)
+                graded_any = True
+                try:
+                    await _perform_grading(item.conversation_id, db, replace_existing=True)
+                    progress.completed += 1
+                except Exception as e:
+                    await db.rollback()
+                    progress.failed += 1
+                    progress.errors.append(f"{item.conversation_id}: {e}")
+                    logger.exception("Regrade failed for conversation %s", item.conversation_id)
+                progress.estimated_tokens_remaining -= (
+                    item.estimated_input_tokens + item.estimated_output_tokens
+                )
+                await regrade_tracker.save()
+    finally:
+        await regrade_tracker.finish()
+
+
+async def _update_grading_ledger(conversation_id: UUID) -> None:
+    """Fold recent turns into the conversation's evidence ledger.
+
+    Runs as a background task during the conversation, so it opens its
+    own session. Failures are logged and skipped; the final grading call
+    falls back to the full transcript when the ledger is missing.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            conversation = await db.scalar(
+                select(Conversation)
+                .options(selectinload(Conversation.messages))
+                .where(Conversation.id == conversation_id)
+            )
+
+            if not conversation or conversation.status != ConversationStatus.IN_PROGRESS:
+                return
+
+            scenario = await catalog_cache.get(db, Scenario, conversation.scenario_id)
+            persona = await catalog_cache.get(db, Persona, scenario.persona_id) if scenario else None
+            rubric = await catalog_cache.get(db, Rubric, scenario.rubric_id) if scenario else None
+
+            if not all([scenario, persona, rubric]):
+                return
+
+            base_count = conversation.ledger_message_count
+            engine = GradingEngine(rubric)
+            await release_connection(db)
+            ledger, covered = await engine.update_ledger(conversation, persona)
+
+            # Another update may have finished while we waited on the LLM
+            db.add(conversation)
+            await db.refresh(conversation, ["ledger_message_count"])
+            if conversation.ledger_message_count != base_count:
+                return
+
+            conversation.grading_ledger = ledger
+            conversation.ledger_message_count = covered
+            await db.commit()
+        except Exception:
+            logger.exception("Ledger update failed for conversation %s", conversation_id)
+            await db.rollback()
+
+
 @router.get("/conversations/{conversation_id}", response_model=GradeResponse)
 async def get_grade(
     conversation_id: UUID,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
-    """Get the grade for a conversation."""
-    user_id = get_current_user_id(user_key)
-    user_role = get_user_role(user_key)
-
-    # Get conversation
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id
+    """Get the grade for a conversation.
+
+    The ETag is the grade's id and graded_at, which a regrade or an
+    override changes; a matching poll costs one narrow query.
+    """
+
+    # Owner and grade version only; the grade itself is loaded if needed
+    version = (
+        await db.execute(
+            select(Conversation.user_id, Grade.id, Grade.graded_at)
+            .outerjoin(Grade, Grade.conversation_id == Conversation.id)
+            .where(Conversation.id == conversation_id)
+        )
     ).first()
 
-    if not conversation:
+    if not version:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
+    owner_id, grade_id, graded_at = version
+
     # Check access
-    if user_role == "student" and conversation.user_id != user_id:
+    if user.role == "student" and owner_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # Get grade
-    grade = db.query(Grade).filter(
-        Grade.conversation_id == conversation_id
-    ).first()
+    if grade_id is None:
+        raise HTTPException(status_code=404, detail="Grade not found")
 
+    etag = make_etag(grade_id, graded_at.isoformat() if graded_at else None)
+    not_modified = check_not_modified("grade", request, response, etag)
+    if not_modified:
+        return not_modified
+
+    grade = await db.get(Grade, grade_id)
     if not grade:
         raise HTTPException(status_code=404, detail="Grade not found")
 
     # Get rubric for max score
-    rubric = db.query(Rubric).filter(Rubric.id == grade.rubric_id).first()
+    rubric = await catalog_cache.get(db, Rubric, grade.rubric_id)
 
     return _grade_to_response(grade, rubric)
 
 
+def _event_stream(
+    subscription: GradeEventSubscription,
+    ready: Optional[GradeEvent] = None,
+    conversation_id: Optional[UUID] = None,
+) -> StreamingResponse:
+    """Stream grade events as server-sent events.
+
+    A stream for one conversation ends with its first event (or with
+    ``ready`` if the grade already exists); a per-student stream runs
+    until ``grade_events_max_seconds``, after which the browser's
+    EventSource reconnects on its own.
+    """
+
+    async def body():
+        try:
+            yield f"retry: {settings.grade_events_retry_ms}\n\n"
+            if ready is not None:
+                yield ready.to_sse()
+                return
+            async for event in subscription.events(
+                settings.grade_events_heartbeat_seconds,
+                settings.grade_events_max_seconds,
+            ):
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield event.to_sse()
+                if conversation_id is not None and event.conversation_id == str(conversation_id):
+                    return
+        finally:
+            await subscription.close()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _subscribe(*channels: str) -> GradeEventSubscription:
+    subscription = await GradeEventSubscription.open(*channels)
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Grade events unavailable; poll for the grade")
+    return subscription
+
+
+@router.get("/conversations/{conversation_id}/events")
+async def stream_grade_events(
+    conversation_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+):
+    """Wait for a conversation's grade on one server-sent event stream.
+
+    Sends ``grade.completed`` (at once, if the grade already exists) or
+    ``grade.failed``, then closes. Answers 503 when events are
+    unavailable, in which case clients should poll ``get_grade``.
+    """
+    owner_id = await db.scalar(
+        select(Conversation.user_id).where(Conversation.id == conversation_id)
+    )
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    if user.role == "student" and owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    # Subscribe before looking for the grade so one finishing in between is not missed
+    subscription = await _subscribe(grade_events.conversation_channel(conversation_id))
+    try:
+        grade = await db.scalar(select(Grade).where(Grade.conversation_id == conversation_id))
+        await release_connection(db)
+    except Exception:
+        await subscription.close()
+        raise
+
+    ready = GradeEvent.completed(grade, owner_id) if grade else None
+    return _event_stream(subscription, ready=ready, conversation_id=conversation_id)
+
+
+@router.get("/events")
+async def stream_my_grade_events(user: CurrentUser = Depends(get_authenticated_user)):
+    """Server-sent events for every grade of the current user as it finishes."""
+    subscription = await _subscribe(grade_events.user_channel(user.id))
+    return _event_stream(subscription)
+
+
 @router.post("/conversations/{conversation_id}/grade", response_model=GradeResponse)
 async def trigger_grading(
     conversation_id: UUID,
     request: TriggerGradeRequest = TriggerGradeRequest(),
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """Manually trigger grading for a conversation."""
-    user_id = get_current_user_id(user_key)
-    user_role = get_user_role(user_key)
 
     # Get conversation
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id
-    ).first()
+    conversation = await db.get(Conversation, conversation_id)
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Check access
-    if user_role == "student" and conversation.user_id != user_id:
+    if user.role == "student" and conversation.user_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
     if conversation.status != ConversationStatus.COMPLETED:
@@ -192,24 +435,29 @@ async def trigger_grading(
         )
 
     # Check if already graded
-    existing_grade = db.query(Grade).filter(
-        Grade.conversation_id == conversation_id
-    ).first()
+    existing_grade = await db.scalar(
+        select(Grade).where(Grade.conversation_id == conversation_id)
+    )
 
     if existing_grade and not request.force:
         # Get rubric and return existing
-        rubric = db.query(Rubric).filter(Rubric.id == existing_grade.rubric_id).first()
+        rubric = await catalog_cache.get(db, Rubric, existing_grade.rubric_id)
         return _grade_to_response(existing_grade, rubric)
 
+    scenario = await catalog_cache.get(db, Scenario, conversation.scenario_id)
+    await rate_limiter.check(db, "grade", user.id, scenario)
+
     if existing_grade and request.force:
         # Delete existing grade for re-grading
-        db.delete(existing_grade)
-        db.commit()
+        await db.delete(existing_grade)
+        await touch_day(db, conversation)
+        await db.commit()
+        await student_dashboard_cache.invalidate(conversation.user_id)
 
     # Perform grading
     try:
         grade = await _perform_grading(conversation_id, db)
-        rubric = db.query(Rubric).filter(Rubric.id == grade.rubric_id).first()
+        rubric = await catalog_cache.get(db, Rubric, grade.rubric_id)
         return _grade_to_response(grade, rubric)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Grading failed: {str(e)}")
@@ -222,28 +470,31 @@ async def trigger_grading(
 async def override_grade(
     conversation_id: UUID,
     request: FullGradeOverrideRequest,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """Override grades (instructor only)."""
-    user_role = get_user_role(user_key)
-
-    if user_role not in ["instructor", "admin"]:
+    if not user.is_instructor:
         raise HTTPException(
             status_code=403,
             detail="Only instructors can override grades"
         )
 
-    # Get existing grade
-    grade = db.query(Grade).filter(
-        Grade.conversation_id == conversation_id
+    # Get existing grade and the student it belongs to
+    row = (
+        await db.execute(
+            select(Grade, Conversation.user_id)
+            .join(Conversation, Conversation.id == Grade.conversation_id)
+            .where(Grade.conversation_id == conversation_id)
+        )
     ).first()
 
-    if not grade:
+    if not row:
         raise HTTPException(status_code=404, detail="Grade not found")
+    grade, student_id = row
 
     # Get rubric
-    rubric = db.query(Rubric).filter(Rubric.id == grade.rubric_id).first()
+    rubric = await catalog_cache.get(db, Rubric, grade.rubric_id)
 
     # Validate criterion names and scores
     criterion_names = {c["name"] for c in rubric.criteria}
@@ -285,8 +536,9 @@ async def override_grade(
     grade.graded_by = GradedBy.INSTRUCTOR
     grade.graded_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(grade)
+    await db.commit()
+    await db.refresh(grade)
+    await student_dashboard_cache.invalidate(student_id)
 
     return _grade_to_response(grade, rubric)
 
@@ -294,47 +546,231 @@ async def override_grade(
 @router.get("/rubrics/{rubric_id}", response_model=RubricResponse)
 async def get_rubric(
     rubric_id: UUID,
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
 ):
     """Get rubric details."""
-    rubric = db.query(Rubric).filter(Rubric.id == rubric_id).first()
+    rubric = await catalog_cache.get(db, Rubric, rubric_id)
+
+    if not rubric:
+        raise HTTPException(status_code=404, detail="Rubric not found")
+
+    return RubricResponse(
+        id=rubric.id,
+        name=rubric.name,
+        criteria=rubric.criteria,
+        total_points=rubric.total_points,
+        version=rubric.version,
+    )
+
+
+@router.put("/rubrics/{rubric_id}", response_model=RubricResponse)
+async def update_rubric(
+    rubric_id: UUID,
+    request: RubricUpdateRequest,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+):
+    """Edit a rubric (instructor only).
+
+    Each edit records a new immutable version; existing grades keep the
+    version they were graded under and show up in the regrade plan.
+    """
+    if not user.is_instructor:
+        raise HTTPException(
+            status_code=403,
+            detail="Only instructors can edit rubrics"
+        )
+
+    rubric = await db.get(Rubric, rubric_id)
 
     if not rubric:
         raise HTTPException(status_code=404, detail="Rubric not found")
 
+    names = [c.name for c in request.criteria]
+    if len(names) != len(set(names)):
+        raise HTTPException(status_code=400, detail="Criterion names must be unique")
+
+    # Snapshot the original criteria if this rubric predates versioning
+    has_snapshot = await db.scalar(
+        select(RubricVersion).where(
+            RubricVersion.rubric_id == rubric.id,
+            RubricVersion.version == rubric.version,
+        )
+    )
+    if not has_snapshot:
+        db.add(RubricVersion(
+            rubric_id=rubric.id,
+            version=rubric.version,
+            name=rubric.name,
+            criteria=rubric.criteria,
+        ))
+
+    rubric.name = request.name or rubric.name
+    rubric.criteria = [c.model_dump() for c in request.criteria]
+    rubric.version += 1
+    db.add(RubricVersion(
+        rubric_id=rubric.id,
+        version=rubric.version,
+        name=rubric.name,
+        criteria=rubric.criteria,
+    ))
+
+    await db.commit()
+    await db.refresh(rubric)
+    await catalog_cache.invalidate()
+
     return RubricResponse(
         id=rubric.id,
         name=rubric.name,
         criteria=rubric.criteria,
         total_points=rubric.total_points,
+        version=rubric.version,
     )
 
 
+@router.get("/rubrics/{rubric_id}/versions", response_model=list[RubricVersionResponse])
+async def list_rubric_versions(
+    rubric_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+):
+    """List the recorded versions of a rubric, oldest first."""
+    rubric = await catalog_cache.get(db, Rubric, rubric_id)
+
+    if not rubric:
+        raise HTTPException(status_code=404, detail="Rubric not found")
+
+    versions = (
+        await db.scalars(
+            select(RubricVersion)
+            .where(RubricVersion.rubric_id == rubric_id)
+            .order_by(RubricVersion.version)
+        )
+    ).all()
+
+    return [
+        RubricVersionResponse(
+            version=v.version,
+            name=v.name,
+            criteria=v.criteria,
+            created_at=v.created_at,
+        )
+        for v in versions
+    ]
+
+
+@router.get("/regrade-plan", response_model=RegradePlanResponse)
+async def get_regrade_plan(
+    rubric_id: Optional[UUID] = None,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+):
+    """Preview stale grades and the estimated token cost of regrading them.
+
+    Graded-mode conversations are scheduled first, then the newest grades.
+    Instructor overrides are skipped.
+    """
+    if not user.is_instructor:
+        raise HTTPException(
+            status_code=403,
+            detail="Only instructors can plan regrades"
+        )
+
+    plan = await build_regrade_plan(db, rubric_id=rubric_id, limit=limit)
+    graded = len([i for i in plan.items if i.mode == "graded"])
+
+    return RegradePlanResponse(
+        total=len(plan.items),
+        graded_mode=graded,
+        practice_mode=len(plan.items) - graded,
+        skipped_overrides=plan.skipped_overrides,
+        estimated_input_tokens=plan.estimated_input_tokens,
+        estimated_output_tokens=plan.estimated_output_tokens,
+        estimated_total_tokens=plan.estimated_input_tokens + plan.estimated_output_tokens,
+        items=[RegradePlanItem(**vars(i)) for i in plan.items],
+    )
+
+
+@router.post("/regrade-plan/execute", response_model=RegradeProgressResponse)
+async def execute_regrade_plan(
+    request: RegradeExecuteRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
+):
+    """Start a throttled regrade of stale grades in the background.
+
+    Only one regrade runs at a time across workers; another request gets
+    a 409 until it finishes.
+    """
+    if not user.is_instructor:
+        raise HTTPException(
+            status_code=403,
+            detail="Only instructors can run regrades"
+        )
+
+    if not await regrade_tracker.acquire():
+        raise HTTPException(status_code=409, detail="A regrade is already running")
+
+    try:
+        plan = await build_regrade_plan(db, rubric_id=request.rubric_id, limit=request.max_items)
+    except BaseException:
+        await regrade_tracker.release()
+        raise
+    await regrade_tracker.start(plan)
+
+    interval = (
+        request.interval_seconds
+        if request.interval_seconds is not None
+        else settings.regrade_interval_seconds
+    )
+    background_tasks.add_task(_run_regrade_plan, plan.items, interval)
+
+    return RegradeProgressResponse(**regrade_tracker.progress.to_dict())
+
+
+@router.get("/regrade-plan/progress", response_model=RegradeProgressResponse)
+async def get_regrade_progress(user: CurrentUser = Depends(get_authenticated_user)):
+    """Get progress of the current or last regrade run, on any worker."""
+    if not user.is_instructor:
+        raise HTTPException(
+            status_code=403,
+            detail="Only instructors can view regrade progress"
+        )
+
+    progress = await regrade_tracker.get()
+    return RegradeProgressResponse(**progress.to_dict())
+
+
 @router.get("/needs-review", response_model=list[GradeSummary])
 async def list_grades_needing_review(
-    db: Session = Depends(get_db),
-    user_key: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_authenticated_user),
     limit: int = 20,
 ):
     """List grades that need instructor review (low confidence)."""
-    user_role = get_user_role(user_key)
-
-    if user_role not in ["instructor", "admin", "ta"]:
+    if user.role not in ["instructor", "admin", "ta"]:
         raise HTTPException(
             status_code=403,
             detail="Only instructors can view grades needing review"
         )
 
-    # Get grades with low confidence
+    # Get grades with low confidence or feature anomalies, most suspicious first
     grades = (
-        db.query(Grade)
-        .filter(Grade.ai_confidence < 0.7)
-        .filter(Grade.instructor_override == False)
-        .order_by(Grade.graded_at.desc())
-        .limit(limit)
-        .all()
-    )
+        await db.scalars(
+            select(Grade)
+            .where(or_(Grade.ai_confidence < 0.7, Grade.feature_anomaly == True))
+            .where(Grade.instructor_override == False)
+            .order_by(
+                Grade.feature_anomaly.desc(),
+                Grade.ai_confidence.asc(),
+                Grade.graded_at.desc(),
+            )
+            .limit(limit)
+        )
+    ).all()
 
     return [
         GradeSummary(
@@ -344,6 +780,40 @@ async def list_grades_needing_review(
             graded_by=g.graded_by.value,
             graded_at=g.graded_at,
             needs_review=g.needs_review,
+            ai_confidence=float(g.ai_confidence) if g.ai_confidence is not None else None,
+            predicted_score_pct=(g.transcript_features or {}).get("predicted_score_pct"),
+            feature_anomaly=g.feature_anomaly,
         )
         for g in grades
     ]
+
+
+@router.get("/metrics")
+async def get_grading_metrics(user: CurrentUser = Depends(get_authenticated_user)):
+    """Grading parse-failure and retry rates per output mode (instructor only).
+
+    Compare the "json" and "tool" modes to measure the effect of
+    schema-enforced output.
+    """
+    if not user.is_instructor:
+        raise HTTPException(
+            status_code=403,
+            detail="Only instructors can view grading metrics"
+        )
+
+    result = {}
+    for mode in ("json", "tool"):
+        requests = metrics.get(f"grading.{mode}.requests")
+        parse_failures = metrics.get(f"grading.{mode}.parse_failures")
+        retries = metrics.get(f"grading.{mode}.retries")
+        failures = metrics.get(f"grading.{mode}.failures")
+        result[mode] = {
+            "requests": int(requests),
+            "parse_failures": int(parse_failures),
+            "retries": int(retries),
+            "failures": int(failures),
+            "parse_failure_rate": rate(parse_failures, requests),
+            "retry_rate": rate(retries, requests),
+            "failure_rate": rate(failures, requests),
+        }
+    return result
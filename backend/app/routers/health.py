@@ -1,10 +1,16 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import async_engine, get_db, read_async_engine
+from app.routers.auth import token_cache, user_cache
+from app.services.catalog_cache import catalog_cache
+from app.services import etags, grade_events, single_flight
+from app.services.dashboard_cache import student_dashboard_cache
+from app.services.rate_limit import rate_limiter
+from app.services.warmup import warmup_state
 
 router = APIRouter()
 
@@ -16,15 +22,67 @@ async def health_check():
 
 
 @router.get("/health/ready")
-async def readiness_check(db: Session = Depends(get_db)):
-    """Readiness check - verifies database connection."""
+async def readiness_check(response: Response, db: AsyncSession = Depends(get_db)):
+    """Readiness check - verifies warmup has finished and the database connects.
+
+    Returns 503 until then, so load balancers hold traffic off a new worker.
+    """
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "connected"
     except Exception as e:
         db_status = f"error: {str(e)}"
 
+    ready = db_status == "connected" and warmup_state.ready
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
     return {
-        "status": "ready" if db_status == "connected" else "not_ready",
+        "status": "ready" if ready else "not_ready",
         "database": db_status,
+        "warmup": warmup_state.to_dict(),
+    }
+
+
+@router.get("/health/pool")
+async def pool_status():
+    """Connection pool occupancy and checkout wait statistics."""
+    pools = {"primary": async_engine.pool.stats()}
+    if read_async_engine is not None:
+        pools["replica"] = read_async_engine.pool.stats()
+    return pools
+
+
+@router.get("/health/cache")
+async def cache_status():
+    """Hit ratios of the in-process and Redis caches."""
+    return {
+        "catalog": catalog_cache.stats(),
+        "student_dashboard": student_dashboard_cache.stats(),
+        "auth_tokens": token_cache.stats(),
+        "auth_users": user_cache.stats(),
     }
+
+
+@router.get("/health/etags")
+async def etag_status():
+    """Share of polled reads answered with 304 Not Modified, per endpoint."""
+    return etags.stats()
+
+
+@router.get("/health/rate-limits")
+async def rate_limit_status():
+    """LLM rate limit checks and rejections per action."""
+    return rate_limiter.stats()
+
+
+@router.get("/health/grade-events")
+async def grade_event_status():
+    """Grade events published and event streams opened."""
+    return grade_events.stats()
+
+
+@router.get("/health/single-flight")
+async def single_flight_status():
+    """Computations run and shared per single-flight group."""
+    return single_flight.stats()
@@ -64,6 +64,19 @@ class ConversationResponse(BaseModel):
         from_attributes = True
 
 
+class MessagesSinceResponse(BaseModel):
+    """Messages added to a conversation after the client's last one."""
+
+    id: UUID
+    status: str
+    turn_count: int
+    completed_at: Optional[datetime] = None
+    messages: list[MessageResponse] = []
+    has_more: bool = Field(
+        False, description="True if more messages follow; ask again from the last one"
+    )
+
+
 class ConversationListItem(BaseModel):
     """Summary of a conversation for list views."""
 
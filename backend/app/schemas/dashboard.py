@@ -1,6 +1,6 @@
 """Pydantic schemas for dashboard APIs."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from uuid import UUID
 
@@ -82,6 +82,7 @@ class GradeForReview(BaseModel):
     score: float
     ai_confidence: float
     graded_at: datetime
+    feature_anomaly: bool = False  # AI score far from transcript feature prediction
 
 
 class InstructorDashboard(BaseModel):
@@ -91,3 +92,31 @@ class InstructorDashboard(BaseModel):
     recent_activity: list[RecentConversation]
     students: list[StudentSummary]
     grades_needing_review: list[GradeForReview]
+
+
+class StruggleCount(BaseModel):
+    """How often a criterion was scored below 70%."""
+
+    criterion: str
+    count: int
+
+
+class TrendPoint(BaseModel):
+    """One day of rolled-up class activity."""
+
+    date: date
+    total_conversations: int = 0
+    total_practice: int = 0
+    total_graded: int = 0
+    average_score: Optional[float] = None
+    common_struggles: list[StruggleCount] = []
+
+
+class TrendsResponse(BaseModel):
+    """Daily trend series read from the analytics rollup."""
+
+    course_id: Optional[UUID] = None
+    days: int
+    points: list[TrendPoint]
+    common_struggles: list[StruggleCount]  # Across the whole window
+    last_rollup_at: Optional[datetime] = None  # Data is current up to this run
@@ -30,6 +30,7 @@ class GradeResponse(BaseModel):
     areas_for_improvement: list[str]
     ai_confidence: Optional[float] = None
     graded_by: str  # "ai" or "instructor"
+    rubric_version: Optional[int] = None
     instructor_override: bool = False
     override_reason: Optional[str] = None
     graded_at: datetime
@@ -49,6 +50,9 @@ class GradeSummary(BaseModel):
     graded_by: str
     graded_at: datetime
     needs_review: bool = False
+    ai_confidence: Optional[float] = None
+    predicted_score_pct: Optional[float] = None  # From transcript features
+    feature_anomaly: bool = False
 
     class Config:
         from_attributes = True
@@ -88,11 +92,82 @@ class RubricResponse(BaseModel):
     name: str
     criteria: list[RubricCriterion]
     total_points: int
+    version: int = 1
+
+    class Config:
+        from_attributes = True
+
+
+class RubricUpdateRequest(BaseModel):
+    """Request to edit a rubric, creating a new immutable version."""
+
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    criteria: list[RubricCriterion] = Field(..., min_length=1)
+
+
+class RubricVersionResponse(BaseModel):
+    """A historical version of a rubric."""
+
+    version: int
+    name: str
+    criteria: list[RubricCriterion]
+    created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class RegradePlanItem(BaseModel):
+    """A stale grade scheduled for regrading."""
+
+    grade_id: UUID
+    conversation_id: UUID
+    rubric_id: UUID
+    mode: str
+    graded_at: datetime
+    from_version: int
+    to_version: int
+    estimated_input_tokens: int
+    estimated_output_tokens: int
+
+
+class RegradePlanResponse(BaseModel):
+    """Regrade plan with cost estimates, returned before execution."""
+
+    total: int
+    graded_mode: int
+    practice_mode: int
+    skipped_overrides: int
+    estimated_input_tokens: int
+    estimated_output_tokens: int
+    estimated_total_tokens: int
+    items: list[RegradePlanItem]
+
+
+class RegradeExecuteRequest(BaseModel):
+    """Request to execute a regrade plan."""
+
+    rubric_id: Optional[UUID] = None
+    max_items: int = Field(50, ge=1, le=1000, description="Regrade at most this many grades")
+    interval_seconds: Optional[float] = Field(
+        None, ge=0, description="Pause between regrades (defaults to settings)"
+    )
+
+
+class RegradeProgressResponse(BaseModel):
+    """Progress of the current or last regrade run."""
+
+    status: str  # "idle", "running", "completed"
+    total: int
+    completed: int
+    failed: int
+    skipped: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    estimated_tokens_remaining: int
+    errors: list[str] = []
+
+
 class TriggerGradeRequest(BaseModel):
     """Request to manually trigger grading."""
 
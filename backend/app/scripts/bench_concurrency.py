@@ -0,0 +1,148 @@
+"""Concurrency benchmark for mixed chat and dashboard load.
+
+Drives the API in-process with a stubbed LLM that sleeps instead of
+calling Claude, so the numbers measure how well the server overlaps
+database work with slow LLM calls. Requires a seeded database.
+
+Run with: python -m app.scripts.bench_concurrency [--duration 20] [--concurrency 20]
+
+Run the same command on two revisions to compare throughput.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+from app.main import app
+from app.services import llm_client as llm_client_module
+
+STUDENT_KEYS = ["student1", "student2"]
+
+
+class SlowStubLLMClient:
+    """Stand-in for LLMClient that simulates Claude latency."""
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+
+    async def generate_response(self, system_prompt, messages, **kwargs) -> str:
+        await asyncio.sleep(self.latency_seconds)
+        return "That makes sense. What would this mean for our quarterly numbers?"
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (milliseconds)."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _timed(client: httpx.AsyncClient, results: dict, kind: str, method: str, url: str, **kwargs):
+    """Issue a request and record its latency under ``kind``."""
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if response.status_code < 400:
+        results[kind].append(elapsed_ms)
+    else:
+        results[f"{kind}.errors"].append(elapsed_ms)
+    return response
+
+
+async def _chat_worker(client, results, deadline, scenario_ids):
+    """Start conversations and exchange messages until the deadline."""
+    while time.perf_counter() < deadline:
+        user_key = random.choice(STUDENT_KEYS)
+        response = await _timed(
+            client, results, "chat.start", "POST", "/api/v1/conversations",
+            params={"user_key": user_key},
+            json={"scenario_id": random.choice(scenario_ids)},
+        )
+        if response.status_code >= 400:
+            continue
+        conversation_id = response.json()["id"]
+        for _ in range(3):
+            if time.perf_counter() >= deadline:
+                break
+            await _timed(
+                client, results, "chat.message", "POST",
+                f"/api/v1/conversations/{conversation_id}/messages",
+                params={"user_key": user_key},
+                json={"content": "The model cuts churn by 12%, roughly $1.2M a year."},
+            )
+
+
+async def _dashboard_worker(client, results, deadline):
+    """Fetch student and instructor dashboards until the deadline."""
+    while time.perf_counter() < deadline:
+        if random.random() < 0.5:
+            await _timed(
+                client, results, "dashboard.student", "GET", "/api/v1/dashboard/student",
+                params={"user_key": random.choice(STUDENT_KEYS)},
+            )
+        else:
+            await _timed(
+                client, results, "dashboard.instructor", "GET", "/api/v1/dashboard/instructor",
+                params={"user_key": "instructor"},
+            )
+
+
+async def run_benchmark(duration: float, concurrency: int, chat_share: float, llm_latency: float) -> dict:
+    """Run the mixed workload and return latency samples keyed by request kind."""
+    llm_client_module._llm_client = SlowStubLLMClient(llm_latency)
+    results: dict[str, list[float]] = defaultdict(list)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        scenarios = (await client.get("/api/v1/conversations/scenarios")).json()
+        if not scenarios:
+            raise SystemExit("No scenarios found; run python -m app.scripts.seed first")
+        scenario_ids = [s["id"] for s in scenarios]
+
+        chat_workers = max(1, round(concurrency * chat_share))
+        dashboard_workers = max(1, concurrency - chat_workers)
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *[_chat_worker(client, results, deadline, scenario_ids) for _ in range(chat_workers)],
+            *[_dashboard_worker(client, results, deadline) for _ in range(dashboard_workers)],
+        )
+    return results
+
+
+def print_report(results: dict, duration: float) -> None:
+    """Print throughput and latency percentiles per request kind."""
+    total = sum(len(v) for k, v in results.items() if not k.endswith(".errors"))
+    print(f"\nTotal: {total} requests in {duration:.0f}s ({total / duration:.1f} req/s)\n")
+    print(f"{'kind':<24}{'count':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for kind in sorted(results):
+        samples = results[kind]
+        if not samples:
+            continue
+        print(
+            f"{kind:<24}{len(samples):>8}{len(samples) / duration:>9.1f}"
+            f"{_percentile(samples, 50):>10.1f}{_percentile(samples, 95):>10.1f}"
+            f"{_percentile(samples, 99):>10.1f}{statistics.mean(samples):>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--chat-share", type=float, default=0.5, help="Fraction of clients chatting")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Simulated LLM seconds")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run_benchmark(args.duration, args.concurrency, args.chat_share, args.llm_latency)
+    )
+    print_report(results, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Measure grade parse failures and retries, before and after tolerant parsing.
+
+Replays a fixed corpus of grading responses (clean, and with the defects
+seen in practice: prose around the JSON, trailing commas, unescaped quotes,
+truncation, missing fields, out-of-range scores) through two paths:
+
+- "before" parses strictly, as ``GradingEngine._parse_grade_response`` used
+  to: any defect rejects the response, and the only recovery is regrading
+  the whole conversation.
+- "after" streams the same text through ``GradingEngine.grade_conversation``
+  in JSON mode with a stub LLM whose continuations answer exactly the
+  fields they are asked for, and reads the ``grading.json.*`` counters.
+
+No database or API key needed. Tool mode is schema-enforced by the API, so
+its rates have to be read from ``/grades/metrics`` on a live deployment.
+
+Run with: python -m app.scripts.bench_grade_parsing [--chunk-size 24]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+from app.services.grade_parser import REQUIRED_GRADE_FIELDS
+from app.services.grading_engine import GradingEngine
+from app.services.metrics import metrics
+
+CRITERIA = [
+    {"name": "clarity", "display_name": "Clarity", "max_points": 50},
+    {"name": "honesty", "display_name": "Honesty", "max_points": 50},
+]
+
+CLARITY = '"clarity": {"score": 40, "max_score": 50, "evidence": "Explained precision plainly", "feedback": "Good"}'
+HONESTY = '"honesty": {"score": 30, "max_score": 50, "evidence": "Hedged on cost", "feedback": "Be direct"}'
+REST = (
+    '"total_score": 70, "overall_feedback": "Solid pitch", "strengths": ["Clear"], '
+    '"areas_for_improvement": ["Numbers"], "confidence": 0.8'
+)
+CLEAN = f'{{"criteria_scores": {{{CLARITY}, {HONESTY}}}, {REST}}}'
+
+# (label, response text)
+CORPUS = [
+    ("clean", CLEAN),
+    ("fenced", f"```json\n{CLEAN}\n```"),
+    ("prose before", f"Here is my evaluation of the conversation:\n\n{CLEAN}"),
+    ("prose after", f"{CLEAN}\n\nLet me know if you need anything else."),
+    ("trailing commas", CLEAN.replace('"Good"}', '"Good",}').replace('["Numbers"]', '["Numbers",]')),
+    (
+        "unescaped quotes",
+        CLEAN.replace("Hedged on cost", 'Said "it depends" when asked about cost'),
+    ),
+    ("truncated mid-criterion", CLEAN[: CLEAN.index('"honesty"') + 40]),
+    ("truncated after criteria", CLEAN[: CLEAN.index('"overall_feedback"') + 20]),
+    ("missing confidence", CLEAN.replace(', "confidence": 0.8', "")),
+    ("display-name keys", CLEAN.replace('"clarity":', '"Clarity":').replace('"honesty":', '"Honesty":')),
+    ("score out of range", CLEAN.replace('"score": 30', '"score": 75')),
+    ("no JSON at all", "I'm sorry, I can't evaluate this conversation."),
+]
+
+
+def parse_before(response: str) -> dict:
+    """Strict parse, as the grading engine did before tolerant parsing."""
+    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response)
+    json_str = json_match.group(1) if json_match else response.strip()
+    try:
+        data = json.loads(json_str)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Failed to parse grading response as JSON: {e}")
+    for field in REQUIRED_GRADE_FIELDS:
+        if field not in data:
+            raise ValueError(f"Missing required field in grade response: {field}")
+    return data
+
+
+def scores_valid(data: dict) -> bool:
+    """Whether every rubric criterion is present with an in-range score."""
+    scores = data.get("criteria_scores") or {}
+    return all(
+        isinstance(scores.get(c["name"]), dict)
+        and 0 <= scores[c["name"]].get("score", -1) <= c["max_points"]
+        for c in CRITERIA
+    )
+
+
+class ReplayLLMClient:
+    """Streams a canned response, then answers continuations correctly."""
+
+    def __init__(self, response: str, chunk_size: int):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.continuations = 0
+
+    async def stream_json_response(self, system_prompt, messages, **kwargs):
+        for i in range(0, len(self.response), self.chunk_size):
+            yield self.response[i:i + self.chunk_size]
+
+    async def generate_json_response(self, system_prompt, messages, **kwargs) -> str:
+        self.continuations += 1
+        full = json.loads(CLEAN)
+        answer = {}
+        for field in re.findall(r"^- (\S+)", messages[-1]["content"], re.MULTILINE):
+            if field.startswith("criteria_scores."):
+                name = field.split(".", 1)[1]
+                answer.setdefault("criteria_scores", {})[name] = full["criteria_scores"][name]
+            else:
+                answer[field] = full[field]
+        return json.dumps(answer)
+
+
+def run_after(response: str, chunk_size: int) -> tuple[dict | None, int]:
+    rubric = SimpleNamespace(criteria=CRITERIA, total_points=100)
+    client = ReplayLLMClient(response, chunk_size)
+    engine = GradingEngine(rubric, llm_client=client, output_mode="json")
+    engine._build_grading_prompt = lambda conversation, persona: "grade this"
+    conversation = SimpleNamespace(messages=[object()], grading_ledger=None, ledger_message_count=0)
+    try:
+        return asyncio.run(engine.grade_conversation(conversation, persona=None)), client.continuations
+    except ValueError:
+        return None, client.continuations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=24, help="characters per streamed chunk")
+    args = parser.parse_args()
+
+    metrics.reset()
+    before = {"parse_failures": 0, "retries": 0, "invalid_accepted": 0}
+    after_invalid = 0
+
+    print(f"{'response':<26}{'before':<25}after")
+    for label, response in CORPUS:
+        try:
+            data = parse_before(response)
+            valid = scores_valid(data)
+            before["invalid_accepted"] += not valid
+            old = "ok" if valid else "accepted, invalid"
+        except ValueError:
+            before["parse_failures"] += 1
+            # The whole conversation had to be graded again
+            before["retries"] += 1
+            old = "failed -> full regrade"
+
+        data, continuations = run_after(response, args.chunk_size)
+        if data is None:
+            new = "failed"
+        else:
+            after_invalid += not scores_valid(data)
+            new = f"ok ({continuations} continuation)" if continuations else "ok"
+        print(f"{label:<26}{old:<25}{new}")
+
+    total = len(CORPUS)
+    after = {
+        "parse_failures": int(metrics.get("grading.json.parse_failures")),
+        "retries": int(metrics.get("grading.json.retries")),
+        "failures": int(metrics.get("grading.json.failures")),
+    }
+
+    def rate(count: int) -> str:
+        return f"{count}/{total} ({count / total:.0%})"
+
+    print()
+    print("before (strict parse)")
+    print(f"  parse failures          {rate(before['parse_failures'])}")
+    print(f"  full regrades (3000 tk) {rate(before['retries'])}")
+    print(f"  invalid grades accepted {rate(before['invalid_accepted'])}")
+    print("after (tolerant streaming parse + continuations)")
+    print(f"  parse failures          {rate(after['parse_failures'])}")
+    print(f"  continuations (1500 tk) {rate(after['retries'])}")
+    print(f"  grading failures        {rate(after['failures'])}")
+    print(f"  invalid grades accepted {rate(after_invalid)}")
+
+
+if __name__ == "__main__":
+    main()
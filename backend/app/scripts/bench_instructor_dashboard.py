@@ -0,0 +1,148 @@
+"""Benchmark the instructor dashboard against a large synthetic class.
+
+Seeds students, conversations and grades (tagged by email so they can be
+removed), times the endpoint in-process, then deletes the synthetic rows.
+Requires a seeded database (for a scenario and rubric).
+
+Run with: python -m app.scripts.bench_instructor_dashboard [--students 10000] [--conversations 200000]
+
+Run the same command on two revisions to compare.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+import httpx
+from sqlalchemy import text
+
+from app.database import engine
+from app.main import app
+
+EMAIL_PATTERN = "dash-bench-%@example.com"
+
+
+def seed(students: int, conversations: int) -> None:
+    """Insert synthetic students, conversations and grades."""
+    with engine.begin() as conn:
+        scenario = conn.execute(text("SELECT id, rubric_id FROM scenarios LIMIT 1")).first()
+        if scenario is None:
+            raise SystemExit("No scenarios found; run python -m app.scripts.seed first")
+
+        conn.execute(text("""
+            INSERT INTO users (id, email, name, role, created_at)
+            SELECT gen_random_uuid(), 'dash-bench-' || i || '@example.com',
+                   'Bench Student ' || lpad(i::text, 6, '0'), 'STUDENT'::userrole, now()
+            FROM generate_series(1, :n) i
+        """), {"n": students})
+
+        conn.execute(text("""
+            INSERT INTO conversations (id, user_id, scenario_id, mode, status,
+                                       started_at, completed_at, turn_count,
+                                       ledger_message_count)
+            SELECT gen_random_uuid(), u.ids[1 + i % array_length(u.ids, 1)], :scenario_id,
+                   CASE WHEN i % 3 = 0 THEN 'GRADED' ELSE 'PRACTICE' END::conversationmode,
+                   'COMPLETED'::conversationstatus, now() - (i % 60) * interval '1 day',
+                   now() - (i % 60) * interval '1 day' + interval '15 minutes', 8, 0
+            FROM generate_series(1, :n) i,
+                 (SELECT array_agg(id) AS ids FROM users WHERE email LIKE :pattern) u
+        """), {"n": conversations, "scenario_id": scenario.id, "pattern": EMAIL_PATTERN})
+
+        # Grade about 70% of conversations with per-criterion scores
+        conn.execute(text("""
+            INSERT INTO grades (id, conversation_id, rubric_id, criteria_scores,
+                                total_score, ai_confidence, graded_by,
+                                instructor_override, graded_at, feature_anomaly)
+            SELECT gen_random_uuid(), g.id, :rubric_id,
+                   jsonb_build_object(
+                       'business_value_articulation', jsonb_build_object('score', g.s1, 'max_score', 25),
+                       'audience_adaptation', jsonb_build_object('score', g.s2, 'max_score', 20),
+                       'handling_objections', jsonb_build_object('score', g.s3, 'max_score', 20),
+                       'clarity_and_structure', jsonb_build_object('score', g.s4, 'max_score', 15),
+                       'honesty_and_limitations', jsonb_build_object('score', g.s5, 'max_score', 10),
+                       'actionable_recommendation', jsonb_build_object('score', g.s6, 'max_score', 10)
+                   ),
+                   g.s1 + g.s2 + g.s3 + g.s4 + g.s5 + g.s6,
+                   round((0.5 + random() * 0.5)::numeric, 2), 'AI'::gradedby, false,
+                   g.completed_at, false
+            FROM (
+                SELECT c.id, c.completed_at,
+                       floor(random() * 26)::int AS s1, floor(random() * 21)::int AS s2,
+                       floor(random() * 21)::int AS s3, floor(random() * 16)::int AS s4,
+                       floor(random() * 11)::int AS s5, floor(random() * 11)::int AS s6
+                FROM conversations c
+                JOIN users u ON u.id = c.user_id AND u.email LIKE :pattern
+                WHERE random() < 0.7
+            ) g
+        """), {"rubric_id": scenario.rubric_id, "pattern": EMAIL_PATTERN})
+
+        for table in ("users", "conversations", "grades"):
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def cleanup() -> None:
+    """Delete the synthetic rows."""
+    with engine.begin() as conn:
+        bench_conversations = """
+            SELECT c.id FROM conversations c
+            JOIN users u ON u.id = c.user_id WHERE u.email LIKE :pattern
+        """
+        params = {"pattern": EMAIL_PATTERN}
+        conn.execute(text(f"DELETE FROM grades WHERE conversation_id IN ({bench_conversations})"), params)
+        conn.execute(text(f"DELETE FROM messages WHERE conversation_id IN ({bench_conversations})"), params)
+        conn.execute(text(f"DELETE FROM conversations WHERE id IN ({bench_conversations})"), params)
+        conn.execute(text("DELETE FROM users WHERE email LIKE :pattern"), params)
+
+
+async def time_dashboard(runs: int) -> tuple[list[float], int, int]:
+    """Request the dashboard ``runs`` times.
+
+    Returns:
+        Latencies in ms, response size in bytes, and peak Python memory in bytes.
+    """
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        # Warm up connections
+        await client.get("/health/ready")
+
+        tracemalloc.start()
+        for _ in range(runs):
+            start = time.perf_counter()
+            response = await client.get("/api/v1/dashboard/instructor", params={"user_key": "instructor"})
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return latencies, len(response.content), peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--conversations", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic rows afterwards")
+    args = parser.parse_args()
+
+    print(f"Seeding {args.students} students and {args.conversations} conversations...")
+    start = time.perf_counter()
+    seed(args.students, args.conversations)
+    print(f"  done in {time.perf_counter() - start:.1f}s")
+
+    try:
+        latencies, size, peak = asyncio.run(time_dashboard(args.runs))
+        print(f"\n/api/v1/dashboard/instructor over {args.runs} runs")
+        print(f"  min {min(latencies):.0f} ms, median {statistics.median(latencies):.0f} ms, "
+              f"max {max(latencies):.0f} ms")
+        print(f"  response {size / 1024:.0f} KiB, peak Python memory {peak / 1024 / 1024:.1f} MiB")
+    finally:
+        if not args.keep:
+            cleanup()
+            print("Synthetic rows removed")
+
+
+if __name__ == "__main__":
+    main()
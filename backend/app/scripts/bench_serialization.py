@@ -0,0 +1,141 @@
+"""Benchmark serializing a long transcript, before and after the fast path.
+
+Builds an in-memory conversation (no database needed) and serves it from
+two routes on a throwaway app: "before" validates response models and
+renders them with the stdlib JSON encoder, as ``get_conversation`` used
+to; "after" builds plain dicts and renders them with ``trusted_response``,
+as it does now. Also reports the response size with and without gzip.
+
+Run with: python -m app.scripts.bench_serialization [--messages 200] [--runs 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+
+from app.config import get_settings
+from app.models.conversation import Message, MessageRole
+from app.routers.conversations import _message_payload
+from app.schemas.conversation import ConversationResponse, MessageResponse
+from app.services.responses import CompressionMiddleware, trusted_response
+
+# Roughly the length of a chat turn
+STUDENT_TEXT = (
+    "Our churn model flags customers likely to cancel in the next 30 days. "
+    "It is right about four times out of five on last quarter's data, and "
+    "the retention team could call the top 500 each week. "
+)
+STAKEHOLDER_TEXT = (
+    "That sounds promising, but what does a false alarm cost us? If the "
+    "team calls someone who was never going to leave, we spend the discount "
+    "for nothing. Walk me through the numbers before I commit headcount. "
+)
+
+
+def make_messages(count: int) -> list[Message]:
+    start = datetime.utcnow()
+    return [
+        Message(
+            id=uuid4(),
+            role=MessageRole.STUDENT if i % 2 == 0 else MessageRole.STAKEHOLDER,
+            content=(STUDENT_TEXT if i % 2 == 0 else STAKEHOLDER_TEXT) * 2,
+            created_at=start + timedelta(seconds=30 * i),
+        )
+        for i in range(count)
+    ]
+
+
+def make_app(messages: list[Message]) -> FastAPI:
+    fields = dict(
+        id=uuid4(),
+        scenario_id=uuid4(),
+        persona_name="Dana Whitfield",
+        persona_title="VP Customer Success",
+        mode="practice",
+        status="in_progress",
+        context="A churn model for a subscription retailer",
+        turn_count=len(messages) // 2,
+        started_at=messages[0].created_at,
+        completed_at=None,
+    )
+    settings = get_settings()
+    bench = FastAPI()
+    bench.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.gzip_minimum_size,
+        compresslevel=settings.gzip_compress_level,
+    )
+
+    @bench.get("/before", response_model=ConversationResponse, response_class=JSONResponse)
+    async def before():
+        return ConversationResponse(
+            **fields,
+            messages=[
+                MessageResponse(
+                    id=m.id, role=m.role.value, content=m.content, created_at=m.created_at
+                )
+                for m in messages
+            ],
+        )
+
+    @bench.get("/after", response_model=ConversationResponse)
+    async def after(response: Response):
+        return trusted_response(
+            {**fields, "messages": [_message_payload(m) for m in messages]}, response
+        )
+
+    return bench
+
+
+async def time_route(client: httpx.AsyncClient, path: str, runs: int) -> tuple[list[float], int, int]:
+    """Request ``path`` ``runs`` times.
+
+    Returns:
+        Latencies in ms, plain size and gzipped size in bytes.
+    """
+    plain = await client.get(path, headers={"Accept-Encoding": "identity"})
+    gzipped = await client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers.get("content-encoding") == "gzip"
+    assert plain.json() == gzipped.json()
+
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = await client.get(path, headers={"Accept-Encoding": "identity"})
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return latencies, len(plain.content), int(gzipped.headers["content-length"])
+
+
+async def run(messages: int, runs: int) -> None:
+    bench = make_app(make_messages(messages))
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {path: await time_route(client, path, runs) for path in ("/before", "/after")}
+
+    print(f"{messages}-message transcript over {runs} runs")
+    for path, (latencies, size, gzipped) in results.items():
+        print(f"  {path:<8} median {statistics.median(latencies):.2f} ms, "
+              f"p95 {statistics.quantiles(latencies, n=20)[-1]:.2f} ms, "
+              f"{size / 1024:.0f} KiB ({gzipped / 1024:.0f} KiB gzipped)")
+    before, after = (statistics.median(results[p][0]) for p in ("/before", "/after"))
+    print(f"  speedup {before / after:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.messages, args.runs))
+
+
+if __name__ == "__main__":
+    main()
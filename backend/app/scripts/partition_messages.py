@@ -0,0 +1,50 @@
+"""Maintain the monthly partitions of the messages table.
+
+Run with: python -m app.scripts.partition_messages [--months-ahead 3] [--retain-months N]
+
+Schedule it daily (e.g. from cron). It creates partitions for the coming
+months and, when a retention period is set (MESSAGE_RETENTION_MONTHS or
+--retain-months), detaches older months into the ``archive`` schema.
+Archived partitions are no longer visible to the app; export them with
+pg_dump --table 'archive.messages_p*' and drop them when done.
+"""
+
+import argparse
+
+from app.config import get_settings
+from app.database import engine
+from app.services.message_partitions import (
+    MONTHS_AHEAD,
+    archive_partitions,
+    attached_partitions,
+    ensure_partitions,
+    is_partitioned,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+    parser.add_argument(
+        "--retain-months",
+        type=int,
+        default=get_settings().message_retention_months,
+        help="Archive partitions older than this many months (0 keeps all)",
+    )
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            raise SystemExit("messages is not partitioned; run alembic upgrade head first")
+
+        created = ensure_partitions(conn, months_ahead=args.months_ahead)
+        archived = archive_partitions(conn, args.retain_months) if args.retain_months > 0 else []
+        attached = attached_partitions(conn)
+
+    print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+    print(f"Archived {len(archived)} partitions: {', '.join(archived) or '-'}")
+    print(f"Attached: {', '.join(attached)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,14 @@
 Run with: python -m app.scripts.seed
 """
 
+import asyncio
 from uuid import UUID
 
 from app.database import SessionLocal, engine, Base
-from app.models import User, Course, Enrollment, Persona, Rubric, Scenario
+from app.models import User, Course, Enrollment, Persona, Rubric, RubricVersion, Scenario
 from app.models.user import UserRole
 from app.models.course import EnrollmentRole
+from app.services.catalog_cache import catalog_cache
 
 
 # Default rubric criteria based on PRD
@@ -295,6 +297,12 @@ def seed_database():
             criteria=DEFAULT_RUBRIC_CRITERIA,
         )
         db.add(rubric)
+        db.add(RubricVersion(
+            rubric_id=rubric.id,
+            version=1,
+            name=rubric.name,
+            criteria=DEFAULT_RUBRIC_CRITERIA,
+        ))
         print("  Created default rubric")
 
         # Create personas
@@ -327,6 +335,7 @@ def seed_database():
         print(f"  Created {len(scenarios)} scenarios")
 
         db.commit()
+        asyncio.run(catalog_cache.invalidate())
         print("Database seeded successfully!")
 
     except Exception as e:
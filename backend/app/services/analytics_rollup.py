@@ -0,0 +1,242 @@
+"""Incremental rollup of per-course daily analytics.
+
+Each run recomputes only the (course, day) rows touched since the last
+watermark: days with new conversations or with grades created or changed
+since then, and days marked by ``touch_day`` when a grade or conversation
+was deleted. Rows are rebuilt from scratch, so reprocessing a day is
+harmless; the watermark is moved back by an overlap to catch rows
+committed late.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Date, Numeric, String, cast, column, delete, func, select, true, union, update
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics import DailyAnalytics, RollupState, RollupTouchedDay
+from app.models.assignment import Assignment
+from app.models.conversation import Conversation, ConversationMode
+from app.models.grade import Grade
+from app.models.scenario import Scenario
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = "daily_analytics"
+
+# Criteria stored per day in common_struggles
+STRUGGLES_PER_DAY = 3
+
+# A criterion scored below this percentage of its maximum counts as a struggle
+STRUGGLE_THRESHOLD_PCT = 70
+
+
+@dataclass
+class RollupResult:
+    """Summary of one rollup run."""
+
+    since: Optional[datetime]
+    watermark: datetime
+    days: int
+    rows: int
+
+
+def _course_id():
+    """A conversation's course: its assignment's, else its scenario's."""
+    return func.coalesce(Assignment.course_id, Scenario.course_id)
+
+
+def _conversation_day():
+    return cast(Conversation.started_at, Date)
+
+
+def _touched_days(since: Optional[datetime]):
+    """Subquery of days with conversations or grades changed since ``since``."""
+    day = _conversation_day()
+    if since is None:
+        return union(select(day), select(RollupTouchedDay.date))
+    return union(
+        select(day).where(Conversation.started_at >= since),
+        select(day)
+        .join(Grade, Grade.conversation_id == Conversation.id)
+        .where(Grade.graded_at >= since),
+        select(RollupTouchedDay.date).where(RollupTouchedDay.touched_at >= since),
+    )
+
+
+async def touch_day(db: AsyncSession, conversation: Conversation) -> None:
+    """Mark the conversation's day for the next rollup.
+
+    Call when deleting the conversation or its grade, in the same
+    transaction; the rollup cannot otherwise tell the day changed.
+    """
+    now = datetime.utcnow()
+    stmt = insert(RollupTouchedDay).values(date=conversation.started_at.date(), touched_at=now)
+    await db.execute(
+        stmt.on_conflict_do_update(index_elements=["date"], set_={"touched_at": now})
+    )
+
+
+def _scoped(query, since: Optional[datetime]):
+    """Join a conversation query to its course and limit it to touched days."""
+    return (
+        query.join(Scenario, Scenario.id == Conversation.scenario_id)
+        .outerjoin(Assignment, Assignment.id == Conversation.assignment_id)
+        .where(_course_id().is_not(None))
+        .where(_conversation_day().in_(_touched_days(since)))
+    )
+
+
+async def _upsert_totals(db: AsyncSession, since: Optional[datetime]) -> int:
+    """Recompute conversation counts and average score for touched days."""
+    course_id = _course_id().label("course_id")
+    day = _conversation_day().label("date")
+    totals = _scoped(
+        select(
+            func.gen_random_uuid(),
+            course_id,
+            day,
+            func.count(Conversation.id),
+            func.count(Conversation.id).filter(Conversation.mode == ConversationMode.PRACTICE),
+            func.count(Conversation.id).filter(Conversation.mode == ConversationMode.GRADED),
+            func.count(Grade.id),
+            func.round(func.avg(Grade.total_score), 2),
+        )
+        .select_from(Conversation)
+        .outerjoin(Grade, Grade.conversation_id == Conversation.id),
+        since,
+    ).group_by(course_id, day)
+
+    stmt = insert(DailyAnalytics).from_select(
+        [
+            "id",
+            "course_id",
+            "date",
+            "total_conversations",
+            "total_practice",
+            "total_graded",
+            "total_scored",
+            "avg_score",
+        ],
+        totals,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_course_date",
+        set_={
+            "total_conversations": stmt.excluded.total_conversations,
+            "total_practice": stmt.excluded.total_practice,
+            "total_graded": stmt.excluded.total_graded,
+            "total_scored": stmt.excluded.total_scored,
+            "avg_score": stmt.excluded.avg_score,
+        },
+    )
+    result = await db.execute(stmt)
+    return result.rowcount
+
+
+async def _update_struggles(db: AsyncSession, since: Optional[datetime]) -> int:
+    """Recompute the most common low-scoring criteria for touched days."""
+    course_id = _course_id().label("course_id")
+    day = _conversation_day().label("date")
+    criteria = func.jsonb_each(Grade.criteria_scores).table_valued(
+        column("key", String), column("value", JSONB)
+    ).render_derived(name="criteria")
+    score = criteria.c.value["score"].astext.cast(Numeric)
+    max_score = func.coalesce(func.nullif(criteria.c.value["max_score"].astext.cast(Numeric), 0), 1)
+
+    rows = (
+        await db.execute(
+            _scoped(
+                select(course_id, day, criteria.c.key, func.count())
+                .select_from(Conversation)
+                .join(Grade, Grade.conversation_id == Conversation.id)
+                .join(criteria, true())
+                .where(score * 100 / max_score < STRUGGLE_THRESHOLD_PCT),
+                since,
+            ).group_by(course_id, day, criteria.c.key)
+        )
+    ).all()
+
+    per_day: dict[tuple, list[dict]] = {}
+    for course, row_day, criterion, count in rows:
+        per_day.setdefault((course, row_day), []).append({"criterion": criterion, "count": count})
+
+    for (course, row_day), struggles in per_day.items():
+        struggles.sort(key=lambda s: (-s["count"], s["criterion"]))
+        await db.execute(
+            update(DailyAnalytics)
+            .where(DailyAnalytics.course_id == course, DailyAnalytics.date == row_day)
+            .values(common_struggles=struggles[:STRUGGLES_PER_DAY])
+        )
+    return len(per_day)
+
+
+async def run_rollup(
+    db: AsyncSession,
+    overlap: timedelta = timedelta(minutes=10),
+    full: bool = False,
+) -> RollupResult:
+    """Roll up every day touched since the last watermark.
+
+    Args:
+        db: Database session; the run is committed on success.
+        overlap: How far before the run start the next watermark is set,
+            to pick up rows with earlier timestamps committed during the run.
+        full: Ignore the watermark and rebuild every day.
+
+    Returns:
+        What was processed.
+    """
+    run_started = datetime.utcnow()
+    state = await db.get(RollupState, ROLLUP_NAME, with_for_update=True)
+    if state is None:
+        state = RollupState(name=ROLLUP_NAME)
+        db.add(state)
+
+    since = None if full else state.watermark
+    days = await db.scalar(select(func.count()).select_from(_touched_days(since).subquery()))
+
+    watermark = run_started - overlap
+    rows = 0
+    if days:
+        # Drop the days' rows first so courses left with no conversations
+        # (after deletes) or no struggles do not keep stale values
+        await db.execute(
+            delete(DailyAnalytics).where(DailyAnalytics.date.in_(_touched_days(since)))
+        )
+        rows = await _upsert_totals(db, since)
+        await _update_struggles(db, since)
+        # Marks older than the new watermark are rolled up now
+        await db.execute(delete(RollupTouchedDay).where(RollupTouchedDay.touched_at < watermark))
+
+    state.watermark = watermark
+    state.last_run_at = run_started
+    await db.commit()
+
+    logger.info("Daily analytics rollup: %s days, %s rows since %s", days, rows, since)
+    return RollupResult(since=since, watermark=state.watermark, days=days or 0, rows=rows)
+
+
+async def get_last_rollup(db: AsyncSession) -> Optional[datetime]:
+    """When the rollup last ran, or None if it never has."""
+    return await db.scalar(
+        select(RollupState.last_run_at).where(RollupState.name == ROLLUP_NAME)
+    )
+
+
+def merge_struggles(struggle_lists: list[Optional[list[dict]]], limit: int = STRUGGLES_PER_DAY) -> list[dict]:
+    """Sum per-criterion struggle counts across several rollup rows."""
+    totals: dict[str, int] = {}
+    for struggles in struggle_lists:
+        for entry in struggles or []:
+            totals[entry["criterion"]] = totals.get(entry["criterion"], 0) + entry["count"]
+    ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+    return [{"criterion": name, "count": count} for name, count in ranked[:limit]]
+
+
+def trend_window(days: int, today: Optional[date] = None) -> date:
+    """First day included in a trend of ``days`` days ending today."""
+    return (today or datetime.utcnow().date()) - timedelta(days=days - 1)
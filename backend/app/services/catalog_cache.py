@@ -0,0 +1,240 @@
+"""Read-through cache for the scenario, persona, rubric and course catalog.
+
+These rows change a few times a term but are read on every chat turn,
+grade and listing. Lookups go through a per-process LRU, then Redis,
+then the database; values are the rows' column values as JSON, so
+callers get fresh transient model instances that never touch a session.
+
+Keys carry a catalog generation (``catalog:{generation}:personas:{id}``).
+Any catalog write bumps the generation in Redis, which orphans every
+cached key at once (they expire by TTL). Each process re-reads the
+generation at most every ``catalog_generation_check_seconds``, so other
+workers see a change within that interval; the writing process sees it
+immediately.
+"""
+
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import DateTime, Numeric, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.course import Course
+from app.models.persona import Persona
+from app.models.rubric import Rubric
+from app.models.scenario import Scenario
+from app.services.metrics import metrics, rate
+from app.services.redis_client import get_redis, report_redis_error
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "catalog:generation"
+
+Model = TypeVar("Model", Scenario, Persona, Rubric, Course)
+
+
+def serialize(obj) -> dict:
+    """Column values of a catalog row as JSON-compatible data."""
+    data = {}
+    for column in obj.__table__.columns:
+        value = getattr(obj, column.key)
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        data[column.key] = value
+    return data
+
+
+def deserialize(model: type[Model], data: dict) -> Model:
+    """Build a transient ``model`` instance from ``serialize`` output."""
+    values = {}
+    for column in model.__table__.columns:
+        value = data.get(column.key)
+        if value is not None:
+            if isinstance(column.type, UUID):
+                value = uuid.UUID(value)
+            elif isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, Numeric):
+                value = Decimal(value)
+        values[column.key] = value
+    return model(**values)
+
+
+class CatalogCache:
+    """Two-level (process LRU, then Redis) cache of catalog rows."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, generation_check_seconds: float):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Entries kept in the process-local LRU.
+            ttl_seconds: Expiry of entries in Redis.
+            generation_check_seconds: How long a process trusts its copy
+                of the catalog generation before re-reading it.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation_check_seconds = generation_check_seconds
+        self._local: OrderedDict[str, Any] = OrderedDict()
+        self._generation = 0
+        self._generation_checked_at: Optional[float] = None
+        self._loads = SingleFlight("catalog")
+
+    async def _current_generation(self) -> int:
+        """The catalog generation, re-read from Redis when stale."""
+        now = time.monotonic()
+        checked = self._generation_checked_at
+        if checked is not None and now - checked < self.generation_check_seconds:
+            return self._generation
+
+        self._generation_checked_at = now
+        client = get_redis()
+        if client is not None:
+            try:
+                generation = int(await client.get(GENERATION_KEY) or 0)
+            except Exception as e:
+                report_redis_error(e)
+            else:
+                if generation != self._generation:
+                    self._local.clear()
+                    self._generation = generation
+        return self._generation
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._local[key] = value
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _read_through(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Get ``key`` from the LRU, then Redis, then ``load()``.
+
+        ``None`` results are not cached, so missing rows are always re-read.
+        """
+        full_key = f"catalog:{await self._current_generation()}:{key}"
+
+        if full_key in self._local:
+            self._local.move_to_end(full_key)
+            metrics.incr("catalog_cache.local_hits")
+            return self._local[full_key]
+
+        client = get_redis()
+        if client is not None:
+            try:
+                cached = await client.get(full_key)
+            except Exception as e:
+                report_redis_error(e)
+                cached = None
+            if cached is not None:
+                value = json.loads(cached)
+                self._remember(full_key, value)
+                metrics.incr("catalog_cache.redis_hits")
+                return value
+
+        # Concurrent misses (a class opening the scenario list together) load once
+        return await self._loads.do(full_key, lambda: self._load(full_key, load))
+
+    async def _load(self, full_key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        metrics.incr("catalog_cache.misses")
+        value = await load()
+        if value is None:
+            return None
+
+        self._remember(full_key, value)
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.set(full_key, json.dumps(value), ex=self.ttl_seconds)
+            except Exception as e:
+                report_redis_error(e)
+        return value
+
+    async def get(self, db: AsyncSession, model: type[Model], row_id) -> Optional[Model]:
+        """Get a Scenario, Persona, Rubric or Course by id, like ``db.get``.
+
+        The result is a transient copy: read it freely, but load the row
+        with ``db.get`` to change it.
+        """
+        if row_id is None:
+            return None
+
+        async def load():
+            row = await db.get(model, row_id)
+            return serialize(row) if row else None
+
+        data = await self._read_through(f"{model.__tablename__}:{row_id}", load)
+        return deserialize(model, data) if data else None
+
+    async def list_scenarios(self, db: AsyncSession) -> list[tuple[Scenario, Optional[Persona]]]:
+        """All scenarios with their personas, ordered by name."""
+
+        async def load():
+            rows = (
+                await db.execute(
+                    select(Scenario, Persona)
+                    .outerjoin(Persona, Persona.id == Scenario.persona_id)
+                    .order_by(Scenario.name)
+                )
+            ).all()
+            return [
+                [serialize(scenario), serialize(persona) if persona else None]
+                for scenario, persona in rows
+            ]
+
+        rows = await self._read_through("scenario_list", load)
+        return [
+            (deserialize(Scenario, scenario), deserialize(Persona, persona) if persona else None)
+            for scenario, persona in rows
+        ]
+
+    async def invalidate(self) -> None:
+        """Drop every cached catalog entry, here and in other processes."""
+        self._local.clear()
+        self._generation += 1
+        client = get_redis()
+        if client is not None:
+            try:
+                self._generation = await client.incr(GENERATION_KEY)
+            except Exception as e:
+                report_redis_error(e)
+        self._generation_checked_at = time.monotonic()
+
+    def stats(self) -> dict:
+        """Hit counts and ratios since the process started."""
+        local_hits = metrics.get("catalog_cache.local_hits")
+        redis_hits = metrics.get("catalog_cache.redis_hits")
+        misses = metrics.get("catalog_cache.misses")
+        lookups = local_hits + redis_hits + misses
+        return {
+            "entries": len(self._local),
+            "generation": self._generation,
+            "lookups": int(lookups),
+            "local_hits": int(local_hits),
+            "redis_hits": int(redis_hits),
+            "misses": int(misses),
+            "hit_ratio": rate(local_hits + redis_hits, lookups),
+            "local_hit_ratio": rate(local_hits, lookups),
+        }
+
+
+_settings = get_settings()
+
+# Singleton used by the routers
+catalog_cache = CatalogCache(
+    max_entries=_settings.catalog_cache_size,
+    ttl_seconds=_settings.catalog_cache_ttl_seconds,
+    generation_check_seconds=_settings.catalog_generation_check_seconds,
+)
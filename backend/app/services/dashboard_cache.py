@@ -0,0 +1,165 @@
+"""Per-student cache of the student dashboard payload.
+
+Payloads live in Redis so every worker shares them and an invalidation
+from any worker takes effect everywhere. Each student has a version
+counter; a write that changes what the dashboard shows (a conversation
+starting or ending, a grade being created, replaced or overridden) bumps
+it. A payload is only served if it was built at the current version, so a
+rebuild that raced with an invalidation is never served.
+
+Rebuilds are lazy and single-flight: concurrent misses for the same
+student in one process share a single rebuild.
+
+The same invalidations also bump a class-wide version, and both counters
+double as the ETag versions of the student and instructor dashboards.
+Counters restart from zero when Redis is flushed or restarted, so the
+versions handed out for ETags are prefixed with a random epoch that is
+created again whenever it is missing; a tag issued before the reset can
+never match one issued after it.
+"""
+
+import json
+import logging
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID, uuid4
+
+from app.config import get_settings
+from app.services.metrics import metrics, rate
+from app.services.redis_client import get_redis, report_redis_error
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CLASS_VERSION_KEY = "dashboard:class:version"
+EPOCH_KEY = "dashboard:epoch"
+
+
+def _payload_key(user_id: UUID) -> str:
+    return f"dashboard:student:{user_id}"
+
+
+def _version_key(user_id: UUID) -> str:
+    return f"dashboard:student:{user_id}:version"
+
+
+class StudentDashboardCache:
+    """Versioned per-student payload cache with single-flight rebuilds."""
+
+    def __init__(self, ttl_seconds: int):
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Expiry of cached payloads in Redis, a backstop for
+                changes made outside the app.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._rebuilds = SingleFlight("student_dashboard")
+
+    async def _read(self, user_id: UUID) -> tuple[int, Any]:
+        """The student's current version and a payload valid for it (or None)."""
+        client = get_redis()
+        if client is None:
+            return 0, None
+        try:
+            version, cached = await client.mget(_version_key(user_id), _payload_key(user_id))
+        except Exception as e:
+            report_redis_error(e)
+            return 0, None
+        version = int(version or 0)
+        if cached is not None:
+            entry = json.loads(cached)
+            if entry["version"] == version:
+                return version, entry["payload"]
+        return version, None
+
+    async def _store(self, user_id: UUID, version: int, payload: Any) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            await client.set(
+                _payload_key(user_id),
+                json.dumps({"version": version, "payload": payload}),
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            report_redis_error(e)
+
+    async def _rebuild(self, user_id: UUID, build: Callable[[], Awaitable[Any]]) -> Any:
+        metrics.incr("student_dashboard_cache.misses")
+        version, payload = await self._read(user_id)
+        if payload is not None:
+            # Another worker stored it since our first look
+            return payload
+        payload = await build()
+        await self._store(user_id, version, payload)
+        return payload
+
+    async def get_or_build(self, user_id: UUID, build: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached payload for ``user_id``, rebuilt with ``build()`` on a miss.
+
+        ``build`` must return JSON-compatible data.
+        """
+        _, payload = await self._read(user_id)
+        if payload is not None:
+            metrics.incr("student_dashboard_cache.hits")
+            return payload
+
+        return await self._rebuilds.do(user_id, lambda: self._rebuild(user_id, build))
+
+    async def invalidate(self, *user_ids: UUID) -> None:
+        """Discard the cached dashboards of ``user_ids``."""
+        client = get_redis()
+        if client is None or not user_ids:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.incr(_version_key(user_id))
+                    pipe.delete(_payload_key(user_id))
+                pipe.incr(CLASS_VERSION_KEY)
+                await pipe.execute()
+        except Exception as e:
+            report_redis_error(e)
+
+    async def _versioned(self, key: str) -> Optional[str]:
+        """The counter at ``key`` prefixed with the current epoch."""
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            epoch, count = await client.mget(EPOCH_KEY, key)
+            if epoch is None:
+                # Redis lost its data and the counters restarted: new epoch
+                await client.set(EPOCH_KEY, uuid4().hex, nx=True)
+                epoch = await client.get(EPOCH_KEY)
+        except Exception as e:
+            report_redis_error(e)
+            return None
+        return f"{epoch}:{int(count or 0)}"
+
+    async def version(self, user_id: UUID) -> Optional[str]:
+        """The student's dashboard version, or None if Redis is unavailable."""
+        return await self._versioned(_version_key(user_id))
+
+    async def class_version(self) -> Optional[str]:
+        """Bumped with every student's version; None if Redis is unavailable."""
+        return await self._versioned(CLASS_VERSION_KEY)
+
+    def stats(self) -> dict:
+        """Hit counts and ratio since the process started."""
+        hits = metrics.get("student_dashboard_cache.hits")
+        misses = metrics.get("student_dashboard_cache.misses")
+        shared = self._rebuilds.stats()["shared"]
+        return {
+            "hits": int(hits),
+            "misses": int(misses),
+            "shared_rebuilds": int(shared),
+            "hit_ratio": rate(hits, hits + misses + shared),
+        }
+
+
+# Singleton used by the routers
+student_dashboard_cache = StudentDashboardCache(
+    ttl_seconds=get_settings().student_dashboard_cache_ttl_seconds,
+)
@@ -0,0 +1,172 @@
+"""Grade-ready events, pushed to waiting clients instead of polled for.
+
+When grading finishes or fails, ``_perform_grading`` publishes one event
+on Redis pub/sub, on a channel for the conversation and one for its
+student. The SSE endpoints subscribe to those channels, so any worker can
+deliver an event published by any other, and a client waits on one
+long-lived connection instead of polling for the grade.
+
+Pub/sub is fire-and-forget: an event published while nobody listens is
+gone. The endpoints therefore subscribe first and check for an existing
+grade second. Without Redis nothing is published and the endpoints
+answer 503, so clients fall back to polling.
+"""
+
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from app.services.metrics import metrics
+from app.services.redis_client import get_redis, report_redis_error
+
+logger = logging.getLogger(__name__)
+
+GRADE_COMPLETED = "grade.completed"
+GRADE_FAILED = "grade.failed"
+
+# How often the subscription loop wakes to check for keepalives and the deadline
+POLL_SECONDS = 1.0
+
+
+def user_channel(user_id: UUID) -> str:
+    return f"grade-events:user:{user_id}"
+
+
+def conversation_channel(conversation_id: UUID) -> str:
+    return f"grade-events:conversation:{conversation_id}"
+
+
+@dataclass
+class GradeEvent:
+    """A grade being ready (or grading having failed) for a conversation."""
+
+    type: str
+    conversation_id: str
+    user_id: str
+    grade_id: Optional[str] = None
+    total_score: Optional[float] = None
+    needs_review: Optional[bool] = None
+    error: Optional[str] = None
+    at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    @classmethod
+    def completed(cls, grade, user_id: UUID) -> "GradeEvent":
+        """Event for a stored grade."""
+        return cls(
+            type=GRADE_COMPLETED,
+            conversation_id=str(grade.conversation_id),
+            user_id=str(user_id),
+            grade_id=str(grade.id),
+            total_score=float(grade.total_score),
+            needs_review=grade.needs_review,
+        )
+
+    @classmethod
+    def failed(cls, conversation_id: UUID, user_id: UUID, error: Exception) -> "GradeEvent":
+        """Event for a grading attempt that raised."""
+        return cls(
+            type=GRADE_FAILED,
+            conversation_id=str(conversation_id),
+            user_id=str(user_id),
+            error=str(error),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "GradeEvent":
+        return cls(**json.loads(data))
+
+    def to_sse(self) -> str:
+        """The event as a server-sent event frame."""
+        return f"event: {self.type}\ndata: {self.to_json()}\n\n"
+
+
+async def publish(event: GradeEvent) -> None:
+    """Send an event to the conversation's and the student's subscribers."""
+    client = get_redis()
+    if client is None:
+        return
+    payload = event.to_json()
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.publish(conversation_channel(UUID(event.conversation_id)), payload)
+            pipe.publish(user_channel(UUID(event.user_id)), payload)
+            await pipe.execute()
+    except Exception as e:
+        report_redis_error(e)
+        metrics.incr("grade_events.publish_failures")
+        return
+    metrics.incr("grade_events.published")
+
+
+class GradeEventSubscription:
+    """A subscription to grade-event channels for one SSE connection."""
+
+    def __init__(self, pubsub):
+        """Wrap a subscribed Redis pub/sub connection."""
+        self._pubsub = pubsub
+
+    @classmethod
+    async def open(cls, *channels: str) -> Optional["GradeEventSubscription"]:
+        """Subscribe to ``channels``, or return None if Redis is unavailable."""
+        client = get_redis()
+        if client is None:
+            return None
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(*channels)
+        except Exception as e:
+            report_redis_error(e)
+            await pubsub.aclose()
+            return None
+        metrics.incr("grade_events.subscriptions")
+        return cls(pubsub)
+
+    async def events(
+        self,
+        heartbeat_seconds: float,
+        max_seconds: float,
+    ) -> AsyncIterator[Optional[GradeEvent]]:
+        """Yield events as they arrive until ``max_seconds`` have passed.
+
+        Yields None when nothing has been sent for ``heartbeat_seconds``,
+        so the caller can write a keepalive before a proxy drops the
+        connection.
+        """
+        deadline = time.monotonic() + max_seconds
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=POLL_SECONDS
+                )
+            except Exception as e:
+                report_redis_error(e)
+                return
+            if message is not None:
+                last_sent = time.monotonic()
+                yield GradeEvent.from_json(message["data"])
+            elif time.monotonic() - last_sent >= heartbeat_seconds:
+                last_sent = time.monotonic()
+                yield None
+
+    async def close(self) -> None:
+        try:
+            await self._pubsub.aclose()
+        except Exception as e:
+            report_redis_error(e)
+
+
+def stats() -> dict:
+    """Grade events published and subscriptions opened since startup."""
+    return {
+        "published": int(metrics.get("grade_events.published")),
+        "publish_failures": int(metrics.get("grade_events.publish_failures")),
+        "subscriptions": int(metrics.get("grade_events.subscriptions")),
+    }
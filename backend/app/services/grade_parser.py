@@ -0,0 +1,372 @@
+"""Tolerant, incremental parser for streamed grading responses."""
+
+import json
+import re
+from typing import Optional
+
+# Top-level fields every grade response must contain
+REQUIRED_GRADE_FIELDS = [
+    "criteria_scores",
+    "total_score",
+    "overall_feedback",
+    "strengths",
+    "areas_for_improvement",
+    "confidence",
+]
+
+# Python-style literals Claude occasionally emits inside JSON
+_LITERAL_FIXES = {"True": "true", "False": "false", "None": "null"}
+
+# Characters that can start the next array element after a closing quote
+_ARRAY_VALUE_START = set('"{[]-0123456789')
+
+
+def _next_significant(text: str, pos: int) -> tuple[Optional[str], int]:
+    """Return the next non-whitespace character at or after ``pos``."""
+    while pos < len(text):
+        if not text[pos].isspace():
+            return text[pos], pos
+        pos += 1
+    return None, pos
+
+
+def _is_closing_quote(
+    text: str, pos: int, is_key: bool, in_array: bool, complete: bool = True
+) -> bool:
+    """Decide whether the quote at ``pos`` ends the current string.
+
+    Unescaped quotes inside ``evidence`` text are common, so a quote only
+    closes the string when what follows looks like JSON structure. When
+    the text is not ``complete`` (still streaming), a quote with nothing
+    decisive after it is left open until more text arrives.
+    """
+    nxt, nxt_pos = _next_significant(text, pos + 1)
+    if nxt is None:
+        return complete
+    if is_key:
+        return nxt == ":"
+    if nxt in "}]":
+        return True
+    if nxt == ",":
+        # After a comma an object needs a key, an array any value
+        after, _ = _next_significant(text, nxt_pos + 1)
+        if after is None:
+            return complete
+        return after in _ARRAY_VALUE_START if in_array else after in '"}'
+    return False
+
+
+def _strip_trailing_comma(out: list[str]) -> None:
+    """Remove a trailing comma (ignoring whitespace) from the output buffer."""
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    if i >= 0 and out[i] == ",":
+        del out[i]
+
+
+def extract_json_text(response: str) -> str:
+    """Extract the JSON object text from a (possibly fenced) response.
+
+    Raises:
+        ValueError: If the response contains no JSON object.
+    """
+    fence = re.search(r"```(?:json)?\s*([\s\S]*?)(?:```|$)", response)
+    candidate = fence.group(1) if fence and "{" in fence.group(1) else response
+
+    start = candidate.find("{")
+    if start == -1:
+        raise ValueError("no JSON object found")
+    return candidate[start:]
+
+
+def repair_json(text: str, complete: bool = True) -> str:
+    """Repair common defects in (possibly truncated) JSON object text.
+
+    Handles trailing commas, unescaped quotes and raw newlines inside
+    strings, Python literals, and truncation (the output is cut back to
+    the last complete value and open containers are closed).
+
+    Args:
+        text: JSON text starting at the opening brace.
+        complete: False while the text is still streaming in, so a string
+            ending with the text is treated as cut off rather than closed.
+
+    Returns:
+        Text that ``json.loads`` can parse.
+    """
+    out: list[str] = []
+    # Each level is [bracket, state]; state is key/colon/value/comma
+    stack: list[list[str]] = []
+    safe_len = 0
+    safe_closers = ""
+
+    in_string = False
+    string_is_key = False
+    escape = False
+    token: list[str] = []
+    pos = 0
+
+    def mark_safe() -> None:
+        nonlocal safe_len, safe_closers
+        safe_len = len(out)
+        safe_closers = "".join("}" if b == "{" else "]" for b, _ in reversed(stack))
+
+    def value_done() -> None:
+        if stack:
+            stack[-1][1] = "comma"
+        mark_safe()
+
+    def flush_token() -> None:
+        if not token:
+            return
+        word = "".join(token)
+        out.append(_LITERAL_FIXES.get(word, word))
+        token.clear()
+        value_done()
+
+    while pos < len(text):
+        c = text[pos]
+
+        if in_string:
+            if escape:
+                if c not in '"\\/bfnrtu':
+                    out.pop()  # Drop the backslash from invalid escapes like \'
+                out.append(c)
+                escape = False
+            elif c == "\\":
+                out.append(c)
+                escape = True
+            elif c == '"':
+                in_array = stack[-1][0] == "["
+                if _is_closing_quote(text, pos, string_is_key, in_array, complete):
+                    out.append(c)
+                    in_string = False
+                    if string_is_key:
+                        stack[-1][1] = "colon"
+                    else:
+                        value_done()
+                else:
+                    out.append('\\"')
+            elif c == "\n":
+                out.append("\\n")
+            elif c == "\r":
+                out.append("\\r")
+            elif c == "\t":
+                out.append("\\t")
+            else:
+                out.append(c)
+            pos += 1
+            continue
+
+        if not stack and out:
+            break  # Top-level object closed; ignore trailing text
+
+        if c.isspace() or c in '{}[],:"':
+            flush_token()
+
+        if c.isspace():
+            out.append(c)
+        elif c in "{[":
+            out.append(c)
+            stack.append([c, "key" if c == "{" else "value"])
+            mark_safe()
+        elif c in "}]":
+            _strip_trailing_comma(out)
+            if stack and stack[-1][1] in ("colon", "value") and stack[-1][0] == "{":
+                # Dangling key with no value; fall back to the last good state
+                del out[safe_len:]
+                _strip_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(c)
+            value_done()
+        elif c == ",":
+            if stack and stack[-1][1] == "comma":
+                out.append(c)
+                stack[-1][1] = "key" if stack[-1][0] == "{" else "value"
+        elif c == ":":
+            if stack and stack[-1][1] == "colon":
+                out.append(c)
+                stack[-1][1] = "value"
+        elif c == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1][0] == "{" and stack[-1][1] == "key"
+            out.append(c)
+        else:
+            token.append(c)
+        pos += 1
+
+    if stack:
+        # Truncated: keep only fully received values, then close containers
+        del out[safe_len:]
+        _strip_trailing_comma(out)
+        out.append(safe_closers)
+
+    return "".join(out)
+
+
+def loads_tolerant(response: str, complete: bool = True) -> dict:
+    """Parse a grading response, repairing common JSON defects.
+
+    Args:
+        response: The response text.
+        complete: False for a prefix of a response still streaming in.
+
+    Raises:
+        ValueError: If no JSON object can be recovered.
+    """
+    try:
+        repaired = repair_json(extract_json_text(response), complete)
+        data = json.loads(repaired)
+    except (ValueError, json.JSONDecodeError) as e:
+        raise ValueError(f"Failed to parse grading response as JSON: {e}")
+
+    if not isinstance(data, dict):
+        raise ValueError("Failed to parse grading response as JSON: not an object")
+    return data
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize a criterion name for lenient matching."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+class StreamingGradeParser:
+    """Consume streamed grading output and validate criteria as they arrive.
+
+    Feed text chunks as they stream in; each completed criterion is checked
+    against the rubric immediately. After the stream ends, ``missing_fields``
+    lists what still has to be requested from the model.
+    """
+
+    def __init__(self, criteria: list[dict]):
+        """Initialize the parser.
+
+        Args:
+            criteria: The rubric's criterion definitions.
+        """
+        self.criteria = {c["name"]: c for c in criteria}
+        self._aliases = {}
+        for c in criteria:
+            self._aliases[_normalize_name(c["name"])] = c["name"]
+            if c.get("display_name"):
+                self._aliases[_normalize_name(c["display_name"])] = c["name"]
+
+        self.buffer = ""
+        self.data: dict = {}
+        self.valid_criteria: dict[str, dict] = {}
+        self.errors: dict[str, str] = {}
+
+    def feed(self, chunk: str) -> list[str]:
+        """Add a streamed chunk and validate any newly completed criteria.
+
+        Args:
+            chunk: The next piece of response text.
+
+        Returns:
+            Names of criteria that became valid with this chunk.
+        """
+        self.buffer += chunk
+        # A criterion can only complete when an object closes
+        if "}" not in chunk:
+            return []
+        return self._reparse()
+
+    def finish(self) -> dict:
+        """Parse the complete buffer and return the best-effort grade data.
+
+        Raises:
+            ValueError: If no JSON object can be recovered.
+        """
+        self.data = loads_tolerant(self.buffer)
+        self._validate_criteria()
+        return self.result()
+
+    def merge(self, data: dict) -> None:
+        """Merge a continuation response into the parsed data."""
+        for key, value in data.items():
+            if key == "criteria_scores" and isinstance(value, dict):
+                existing = self.data.get("criteria_scores")
+                if not isinstance(existing, dict):
+                    existing = {}
+                existing.update(value)
+                self.data["criteria_scores"] = existing
+            elif key not in self.data:
+                self.data[key] = value
+        self._validate_criteria()
+
+    def result(self) -> dict:
+        """Return the parsed data with only validated criteria."""
+        result = {k: v for k, v in self.data.items() if k != "criteria_scores"}
+        result["criteria_scores"] = dict(self.valid_criteria)
+        if "total_score" not in result and not self.missing_criteria():
+            result["total_score"] = sum(c["score"] for c in self.valid_criteria.values())
+        return result
+
+    def missing_criteria(self) -> list[str]:
+        """Rubric criteria that are absent or failed validation."""
+        return [name for name in self.criteria if name not in self.valid_criteria]
+
+    def missing_fields(self) -> list[str]:
+        """Top-level fields and criteria still missing from the response."""
+        missing = [
+            field
+            for field in REQUIRED_GRADE_FIELDS
+            if field != "criteria_scores" and field not in self.data
+        ]
+        # total_score can be derived once every criterion is present
+        if "total_score" in missing and not self.missing_criteria():
+            missing.remove("total_score")
+        missing.extend(f"criteria_scores.{name}" for name in self.missing_criteria())
+        return missing
+
+    def _reparse(self) -> list[str]:
+        """Re-run the tolerant parse over the buffer so far."""
+        try:
+            self.data = loads_tolerant(self.buffer, complete=False)
+        except ValueError:
+            return []
+        before = set(self.valid_criteria)
+        self._validate_criteria()
+        return [name for name in self.valid_criteria if name not in before]
+
+    def _validate_criteria(self) -> None:
+        """Validate every received criterion against the rubric."""
+        received = self.data.get("criteria_scores")
+        if not isinstance(received, dict):
+            return
+
+        for raw_name, entry in received.items():
+            name = self._aliases.get(_normalize_name(raw_name))
+            if name is None or name in self.valid_criteria:
+                continue
+            error = self._check_criterion(name, entry)
+            if error:
+                self.errors[name] = error
+            else:
+                self.errors.pop(name, None)
+                self.valid_criteria[name] = {
+                    "score": entry["score"],
+                    "max_score": self.criteria[name]["max_points"],
+                    "evidence": entry["evidence"],
+                    "feedback": entry["feedback"],
+                }
+
+    def _check_criterion(self, name: str, entry) -> Optional[str]:
+        """Return a validation error for a criterion entry, or None if valid."""
+        if not isinstance(entry, dict):
+            return "entry is not an object"
+
+        score = entry.get("score")
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            return "score is missing or not a number"
+
+        max_points = self.criteria[name]["max_points"]
+        if score < 0 or score > max_points:
+            return f"score must be between 0 and {max_points}"
+
+        for field in ("evidence", "feedback"):
+            if not isinstance(entry.get(field), str) or not entry[field].strip():
+                return f"{field} is missing"
+        return None
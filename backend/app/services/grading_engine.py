@@ -1,7 +1,6 @@
 """Grading engine for evaluating stakeholder conversations."""
 
 import json
-import re
 from typing import Optional
 from decimal import Decimal
 
@@ -9,50 +8,104 @@ from app.models.conversation import Conversation
 from app.models.persona import Persona
 from app.models.rubric import Rubric
 from app.models.grade import Grade, GradedBy
+from app.config import get_settings
 from app.services.llm_client import get_llm_client, LLMClient
+from app.services.metrics import metrics
+from app.services.ttl_cache import TTLCache
+from app.services.grade_parser import (
+    REQUIRED_GRADE_FIELDS,
+    StreamingGradeParser,
+    extract_json_text,
+    loads_tolerant,
+    repair_json,
+)
+
+# Evidence notes kept per criterion in the running ledger
+MAX_LEDGER_EVIDENCE = 8
+
+# Follow-up requests for missing fields before a grade is rejected
+MAX_CONTINUATIONS = 2
+
+GRADER_SYSTEM_PROMPT = "You are an expert evaluator. Respond only with valid JSON."
+TOOL_GRADER_SYSTEM_PROMPT = (
+    "You are an expert evaluator. Submit your evaluation with the submit_grade tool."
+)
+
+GRADE_TOOL_NAME = "submit_grade"
+
+
+def _format_criteria(criteria: list[dict]) -> str:
+    lines = []
+    for criterion in criteria:
+        lines.append(f"\n### {criterion['display_name']} ({criterion['max_points']} points)")
+        if criterion.get('description'):
+            lines.append(f"**Description:** {criterion['description']}")
+
+        if criterion.get('scoring_guide'):
+            lines.append("\n**Scoring Guide:**")
+            # Sort by score descending
+            sorted_guide = sorted(
+                criterion['scoring_guide'].items(),
+                key=lambda x: int(x[0]),
+                reverse=True
+            )
+            for score, description in sorted_guide:
+                lines.append(f"- {score} points: {description}")
+
+    return "\n".join(lines)
+
+
+# Rendered criteria by (rubric id, version); a rubric edit bumps the version
+_criteria_texts = TTLCache("grading.criteria_text", max_entries=256, ttl_seconds=24 * 60 * 60)
+
+
+def criteria_text(rubric: Rubric) -> str:
+    """The rubric's criteria as prompt text, rendered once per rubric version."""
+    if rubric.id is None:
+        return _format_criteria(rubric.criteria)
+    key = (rubric.id, rubric.version)
+    text = _criteria_texts.get(key)
+    if text is None:
+        text = _format_criteria(rubric.criteria)
+        _criteria_texts.set(key, text)
+    return text
 
 
 class GradingEngine:
     """Engine for AI-powered grading of stakeholder conversations."""
 
-    def __init__(self, rubric: Rubric, llm_client: Optional[LLMClient] = None):
+    def __init__(
+        self,
+        rubric: Rubric,
+        llm_client: Optional[LLMClient] = None,
+        output_mode: Optional[str] = None,
+    ):
         """Initialize the grading engine.
 
         Args:
             rubric: The grading rubric to evaluate against.
             llm_client: Optional LLM client (uses singleton if not provided).
+            output_mode: "tool" or "json" (defaults to settings.grading_output_mode).
         """
         self.rubric = rubric
         self.llm_client = llm_client or get_llm_client()
+        self.output_mode = output_mode or get_settings().grading_output_mode
 
     def _format_transcript(self, conversation: Conversation) -> str:
         """Format conversation messages as a readable transcript."""
+        return self._format_messages(conversation.messages)
+
+    def _format_messages(self, messages: list, start: int = 1) -> str:
+        """Format messages as transcript lines, numbering turns from ``start``."""
         lines = []
-        for i, msg in enumerate(conversation.messages, 1):
+        for i, msg in enumerate(messages, start):
             role = "Student" if msg.role.value == "student" else "Stakeholder"
             lines.append(f"[Turn {i}] {role}:\n{msg.content}")
         return "\n\n".join(lines)
 
     def _build_criteria_text(self) -> str:
         """Build detailed criteria text for the grading prompt."""
-        lines = []
-        for criterion in self.rubric.criteria:
-            lines.append(f"\n### {criterion['display_name']} ({criterion['max_points']} points)")
-            if criterion.get('description'):
-                lines.append(f"**Description:** {criterion['description']}")
-
-            if criterion.get('scoring_guide'):
-                lines.append("\n**Scoring Guide:**")
-                # Sort by score descending
-                sorted_guide = sorted(
-                    criterion['scoring_guide'].items(),
-                    key=lambda x: int(x[0]),
-                    reverse=True
-                )
-                for score, description in sorted_guide:
-                    lines.append(f"- {score} points: {description}")
-
-        return "\n".join(lines)
+        return criteria_text(self.rubric)
 
     def _build_grading_prompt(
         self,
@@ -92,7 +145,21 @@ Evaluate the conversation against each criterion in the rubric. For each criteri
 2. Cite specific evidence from the conversation (quote or reference specific turns)
 3. Provide constructive feedback for improvement
 
-Then provide:
+{self._build_response_format_text()}"""
+
+    def _build_response_format_text(self) -> str:
+        """Build the shared summary instructions and output format."""
+        if self.output_mode == "tool":
+            return f"""Then provide:
+- Overall summary feedback (2-3 paragraphs)
+- Top 2-3 strengths
+- Top 2-3 areas for improvement
+- Your confidence in this evaluation (0.0-1.0)
+
+## Response Format
+Submit your evaluation by calling the {GRADE_TOOL_NAME} tool with a score, evidence and feedback for every criterion."""
+
+        return """Then provide:
 - Overall summary feedback (2-3 paragraphs)
 - Top 2-3 strengths
 - Top 2-3 areas for improvement
@@ -101,29 +168,214 @@ Then provide:
 ## Response Format
 You MUST respond with valid JSON in exactly this format:
 ```json
-{{
-  "criteria_scores": {{
-    "<criterion_name>": {{
+{
+  "criteria_scores": {
+    "<criterion_name>": {
       "score": <number>,
       "max_score": <number>,
       "evidence": "<specific quotes or observations from the conversation>",
       "feedback": "<constructive feedback for improvement>"
-    }}
-  }},
+    }
+  },
   "total_score": <number>,
   "overall_feedback": "<2-3 paragraph summary>",
   "strengths": ["<strength 1>", "<strength 2>"],
   "areas_for_improvement": ["<area 1>", "<area 2>"],
   "confidence": <0.0-1.0>
-}}
+}
 ```
 
 Use the exact criterion names from the rubric (lowercase with underscores).
 Respond ONLY with the JSON object, no other text."""
 
+    def _build_ledger_prompt(
+        self,
+        conversation: Conversation,
+        persona: Persona,
+        ledger: dict,
+        new_messages: list,
+        start_turn: int,
+    ) -> str:
+        """Build the prompt for updating the running evidence ledger."""
+        return f"""You are an expert evaluator keeping running notes while a student presents their data science project to a business stakeholder. The conversation is still in progress.
+
+## The Rubric
+{self._build_criteria_text()}
+
+## Context
+- **Student's Project:** {conversation.context}
+- **Stakeholder:** {persona.name}, {persona.title}
+
+## Evidence Ledger So Far
+```json
+{json.dumps(ledger, indent=2)}
+```
+
+## New Conversation Turns
+{self._format_messages(new_messages, start=start_turn)}
+
+## Your Task
+Update the evidence ledger with anything relevant in the new turns. For each criterion:
+1. Add short evidence notes that reference the turn number (keep earlier notes unless contradicted)
+2. Set a provisional score based on everything seen so far
+3. Leave a criterion unchanged if the new turns say nothing about it
+
+## Response Format
+You MUST respond with valid JSON in exactly this format:
+```json
+{{
+  "<criterion_name>": {{
+    "evidence": ["<[Turn N] observation>", "..."],
+    "provisional_score": <number>
+  }}
+}}
+```
+
+Include every criterion from the rubric, using the exact criterion names (lowercase with underscores).
+Respond ONLY with the JSON object, no other text."""
+
+    def _build_reconcile_prompt(
+        self,
+        conversation: Conversation,
+        persona: Persona,
+    ) -> str:
+        """Build the final grading prompt from the ledger and the unseen turns."""
+        covered = conversation.ledger_message_count or 0
+        remaining = conversation.messages[covered:]
+        remaining_text = (
+            self._format_messages(remaining, start=covered + 1)
+            if remaining
+            else "(No turns since the ledger was last updated.)"
+        )
+
+        return f"""You are an expert evaluator assessing a student's ability to communicate with business stakeholders about data science work.
+
+## Your Task
+Finalize the grade for a conversation where a student presented their data science project to a business stakeholder. Turns 1-{covered} were already reviewed and summarized in the evidence ledger below. Reconcile the ledger with the remaining turns and grade against the rubric.
+
+## Grading Philosophy
+- Be fair but rigorous - this is professional training
+- Treat the ledger as reliable evidence for the turns it covers
+- Weigh the final turns as carefully as the earlier ones
+- Acknowledge strengths while identifying areas for improvement
+- Your goal is to help the student improve, not to be harsh
+
+## The Rubric
+{self._build_criteria_text()}
+
+## Total Points Possible: {self.rubric.total_points}
+
+## Context
+- **Student's Project:** {conversation.context}
+- **Stakeholder:** {persona.name}, {persona.title}
+- **Stakeholder Background:** {persona.background or 'Not specified'}
+- **Conversation Turns:** {conversation.turn_count}
+
+## Evidence Ledger (Turns 1-{covered})
+```json
+{json.dumps(conversation.grading_ledger, indent=2)}
+```
+
+## Remaining Conversation Turns
+{remaining_text}
+
+## Your Evaluation
+Evaluate the whole conversation against each criterion in the rubric. For each criterion:
+1. Assign a score based on the scoring guide
+2. Cite specific evidence (ledger notes or quotes from the remaining turns)
+3. Provide constructive feedback for improvement
+
+{self._build_response_format_text()}"""
+
+    def _has_usable_ledger(self, conversation: Conversation) -> bool:
+        """Check if the conversation's ledger can replace the full transcript."""
+        ledger = conversation.grading_ledger
+        if not ledger or not conversation.ledger_message_count:
+            return False
+        criterion_names = {c["name"] for c in self.rubric.criteria}
+        return criterion_names.issubset(ledger.keys())
+
+    def build_grade_schema(self, fields: Optional[list[str]] = None) -> dict:
+        """Build a JSON schema for the grade from the rubric criteria.
+
+        Criterion names and score ranges come from the rubric, so a response
+        that matches the schema also passes rubric validation.
+
+        Args:
+            fields: Restrict the schema to these fields (as reported by
+                ``StreamingGradeParser.missing_fields``). Defaults to all.
+
+        Returns:
+            JSON schema dictionary.
+        """
+        criteria = {c["name"]: c for c in self.rubric.criteria}
+        if fields is None:
+            top_fields = list(REQUIRED_GRADE_FIELDS)
+            criterion_names = list(criteria)
+        else:
+            top_fields = [f for f in fields if not f.startswith("criteria_scores.")]
+            criterion_names = [
+                f.split(".", 1)[1] for f in fields if f.startswith("criteria_scores.")
+            ]
+            if criterion_names:
+                top_fields.append("criteria_scores")
+
+        criterion_properties = {}
+        for name in criterion_names:
+            max_points = criteria[name]["max_points"]
+            criterion_properties[name] = {
+                "type": "object",
+                "description": criteria[name].get("display_name", name),
+                "properties": {
+                    "score": {"type": "number", "minimum": 0, "maximum": max_points},
+                    "max_score": {"type": "number", "enum": [max_points]},
+                    "evidence": {"type": "string", "minLength": 1},
+                    "feedback": {"type": "string", "minLength": 1},
+                },
+                "required": ["score", "max_score", "evidence", "feedback"],
+                "additionalProperties": False,
+            }
+
+        string_list = {"type": "array", "items": {"type": "string"}}
+        properties = {
+            "criteria_scores": {
+                "type": "object",
+                "properties": criterion_properties,
+                "required": criterion_names,
+                "additionalProperties": False,
+            },
+            "total_score": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": self.rubric.total_points,
+            },
+            "overall_feedback": {"type": "string"},
+            "strengths": string_list,
+            "areas_for_improvement": string_list,
+            "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        }
+
+        return {
+            "type": "object",
+            "properties": {f: properties[f] for f in top_fields},
+            "required": top_fields,
+            "additionalProperties": False,
+        }
+
+    def build_grade_tool(self, fields: Optional[list[str]] = None) -> dict:
+        """Build the tool definition used for schema-enforced grading."""
+        return {
+            "name": GRADE_TOOL_NAME,
+            "description": "Submit the rubric evaluation of the conversation.",
+            "input_schema": self.build_grade_schema(fields),
+        }
+
     def _parse_grade_response(self, response: str) -> dict:
         """Parse the grading response from Claude.
 
+        Common JSON defects (markdown fences, trailing commas, unescaped
+        quotes, truncation) are repaired before parsing.
+
         Args:
             response: The raw response text from Claude.
 
@@ -133,45 +385,56 @@ Respond ONLY with the JSON object, no other text."""
         Raises:
             ValueError: If response cannot be parsed.
         """
-        # Try to extract JSON from the response
-        # Sometimes Claude wraps it in markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # Try to parse the whole response as JSON
-            json_str = response.strip()
-
-        try:
-            data = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse grading response as JSON: {e}")
+        data = loads_tolerant(response)
 
         # Validate required fields
-        required_fields = [
-            'criteria_scores',
-            'total_score',
-            'overall_feedback',
-            'strengths',
-            'areas_for_improvement',
-            'confidence',
-        ]
-        for field in required_fields:
+        for field in REQUIRED_GRADE_FIELDS:
             if field not in data:
                 raise ValueError(f"Missing required field in grade response: {field}")
 
         return data
 
+    def _build_continuation_prompt(self, parser: StreamingGradeParser) -> str:
+        """Ask for only the fields the previous response was missing."""
+        lines = []
+        for field in parser.missing_fields():
+            name = field.split(".", 1)[1] if field.startswith("criteria_scores.") else None
+            if name and name in parser.errors:
+                lines.append(f"- {field} (previous value invalid: {parser.errors[name]})")
+            else:
+                lines.append(f"- {field}")
+        missing_text = "\n".join(lines)
+
+        if self.output_mode == "tool":
+            instruction = (
+                f"Call the {GRADE_TOOL_NAME} tool again with ONLY these missing fields"
+            )
+        else:
+            instruction = (
+                "Respond with a JSON object containing ONLY these missing fields, "
+                'using the same structure as before (criteria go inside "criteria_scores")'
+            )
+
+        return f"""Your evaluation was incomplete or did not match the rubric. Do not repeat the fields you already provided.
+
+{instruction}:
+{missing_text}
+
+Scores must be between 0 and the criterion's max points. Respond ONLY with the requested fields, no other text."""
+
     async def grade_conversation(
         self,
         conversation: Conversation,
         persona: Persona,
+        use_ledger: bool = True,
     ) -> dict:
         """Grade a completed conversation.
 
         Args:
             conversation: The conversation to grade.
             persona: The stakeholder persona used in the conversation.
+            use_ledger: Reconcile the running evidence ledger when available.
+                Regrades under a new rubric version pass False.
 
         Returns:
             Dictionary containing grade data ready for storage.
@@ -182,26 +445,166 @@ Respond ONLY with the JSON object, no other text."""
         if not conversation.messages:
             raise ValueError("Cannot grade conversation with no messages")
 
-        # Build grading prompt
-        grading_prompt = self._build_grading_prompt(conversation, persona)
+        # Build grading prompt (reconcile the running ledger when we have one)
+        if use_ledger and self._has_usable_ledger(conversation):
+            grading_prompt = self._build_reconcile_prompt(conversation, persona)
+        else:
+            grading_prompt = self._build_grading_prompt(conversation, persona)
+
+        messages = [{"role": "user", "content": grading_prompt}]
+        parser = StreamingGradeParser(self.rubric.criteria)
+        mode = self.output_mode
+        metrics.incr(f"grading.{mode}.requests")
+
+        if mode == "tool":
+            # The rubric schema constrains the output; validation still runs
+            tool_input = await self.llm_client.generate_tool_response(
+                system_prompt=TOOL_GRADER_SYSTEM_PROMPT,
+                messages=messages,
+                tool=self.build_grade_tool(),
+                max_tokens=3000,
+            )
+            parser.merge(tool_input)
+        else:
+            # Stream the grade, validating criteria as they arrive
+            async for chunk in self.llm_client.stream_json_response(
+                system_prompt=GRADER_SYSTEM_PROMPT,
+                messages=messages,
+                max_tokens=3000,
+            ):
+                parser.feed(chunk)
+
+            try:
+                parser.finish()
+            except ValueError:
+                pass  # Nothing recoverable; the continuation asks for every field
+
+        if parser.missing_fields():
+            metrics.incr(f"grading.{mode}.parse_failures")
+
+        # Ask only for what is missing instead of regrading from scratch
+        for _ in range(MAX_CONTINUATIONS):
+            missing = parser.missing_fields()
+            if not missing:
+                break
+
+            metrics.incr(f"grading.{mode}.retries")
+            received = json.dumps(parser.result()) if parser.data else parser.buffer
+            followup = messages + [
+                {"role": "assistant", "content": received or "{}"},
+                {"role": "user", "content": self._build_continuation_prompt(parser)},
+            ]
+
+            if mode == "tool":
+                parser.merge(await self.llm_client.generate_tool_response(
+                    system_prompt=TOOL_GRADER_SYSTEM_PROMPT,
+                    messages=followup,
+                    tool=self.build_grade_tool(missing),
+                    max_tokens=1500,
+                ))
+                continue
+
+            response = await self.llm_client.generate_json_response(
+                system_prompt=GRADER_SYSTEM_PROMPT,
+                messages=followup,
+                max_tokens=1500,
+            )
+            try:
+                parser.merge(loads_tolerant(response))
+            except ValueError:
+                continue
+
+        missing = parser.missing_fields()
+        if missing:
+            metrics.incr(f"grading.{mode}.failures")
+            raise ValueError(
+                f"Grade response incomplete after retries, missing: {', '.join(missing)}"
+            )
+
+        return parser.result()
+
+    def _parse_ledger_response(self, response: str, previous: dict) -> dict:
+        """Parse a ledger update, keeping previous entries the model dropped.
+
+        Args:
+            response: The raw response text from Claude.
+            previous: The ledger before this update.
+
+        Returns:
+            Updated ledger keyed by rubric criterion name.
+
+        Raises:
+            ValueError: If response cannot be parsed.
+        """
+        try:
+            data = json.loads(repair_json(extract_json_text(response)))
+        except ValueError as e:
+            raise ValueError(f"Failed to parse ledger response as JSON: {e}")
 
-        # Call Claude for grading
+        if not isinstance(data, dict):
+            raise ValueError("Ledger response must be a JSON object")
+
+        ledger = {}
+        for criterion in self.rubric.criteria:
+            name = criterion["name"]
+            entry = data.get(name)
+            if not isinstance(entry, dict):
+                if name in previous:
+                    ledger[name] = previous[name]
+                continue
+
+            evidence = entry.get("evidence") or []
+            if isinstance(evidence, str):
+                evidence = [evidence]
+            ledger[name] = {
+                "evidence": [str(e) for e in evidence][-MAX_LEDGER_EVIDENCE:],
+                "provisional_score": entry.get("provisional_score"),
+            }
+
+        return ledger
+
+    async def update_ledger(
+        self,
+        conversation: Conversation,
+        persona: Persona,
+    ) -> tuple[dict, int]:
+        """Fold the turns since the last ledger update into the ledger.
+
+        Args:
+            conversation: The in-progress conversation (messages loaded).
+            persona: The stakeholder persona used in the conversation.
+
+        Returns:
+            Tuple of (updated ledger, number of messages it now covers).
+
+        Raises:
+            ValueError: If the ledger response cannot be parsed.
+        """
+        covered = conversation.ledger_message_count or 0
+        ledger = conversation.grading_ledger or {}
+        messages = list(conversation.messages)
+        new_messages = messages[covered:]
+
+        if not new_messages:
+            return ledger, covered
+
+        prompt = self._build_ledger_prompt(
+            conversation, persona, ledger, new_messages, start_turn=covered + 1
+        )
         response = await self.llm_client.generate_json_response(
-            system_prompt="You are an expert evaluator. Respond only with valid JSON.",
-            messages=[{"role": "user", "content": grading_prompt}],
-            max_tokens=3000,
+            system_prompt=GRADER_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=1500,
         )
 
-        # Parse response
-        grade_data = self._parse_grade_response(response)
-
-        return grade_data
+        return self._parse_ledger_response(response, ledger), len(messages)
 
     def create_grade_record(
         self,
         conversation_id,
         rubric_id,
         grade_data: dict,
+        rubric_version: Optional[int] = None,
     ) -> Grade:
         """Create a Grade model instance from grade data.
 
@@ -209,6 +612,7 @@ Respond ONLY with the JSON object, no other text."""
             conversation_id: UUID of the graded conversation.
             rubric_id: UUID of the rubric used.
             grade_data: Parsed grade data from Claude.
+            rubric_version: Rubric version graded against.
 
         Returns:
             Grade model instance (not yet committed to DB).
@@ -216,6 +620,7 @@ Respond ONLY with the JSON object, no other text."""
         return Grade(
             conversation_id=conversation_id,
             rubric_id=rubric_id,
+            rubric_version=rubric_version,
             criteria_scores=grade_data['criteria_scores'],
             total_score=Decimal(str(grade_data['total_score'])),
             overall_feedback=grade_data['overall_feedback'],
@@ -248,4 +653,5 @@ async def grade_conversation_async(
         conversation_id=conversation.id,
         rubric_id=rubric.id,
         grade_data=grade_data,
+        rubric_version=rubric.version,
     )
@@ -1,6 +1,6 @@
 """Claude API client wrapper for LLM interactions."""
 
-from typing import Optional
+from typing import AsyncIterator, Optional
 import anthropic
 
 from app.config import get_settings
@@ -22,7 +22,7 @@ class LLMClient:
             raise ValueError(
                 "ANTHROPIC_API_KEY not set. Add it to your .env file."
             )
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
         self.default_model = "claude-sonnet-4-20250514"
 
     async def generate_response(
@@ -45,7 +45,7 @@ class LLMClient:
         Returns:
             The generated text response.
         """
-        response = self.client.messages.create(
+        response = await self.async_client.messages.create(
             model=model or self.default_model,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -83,6 +83,72 @@ class LLMClient:
             model=model,
         )
 
+    async def generate_tool_response(
+        self,
+        system_prompt: str,
+        messages: list[dict],
+        tool: dict,
+        max_tokens: int = 2000,
+        model: Optional[str] = None,
+    ) -> dict:
+        """Force Claude to answer by calling a tool and return its input.
+
+        Used for structured outputs that must match a JSON schema.
+
+        Args:
+            system_prompt: The system prompt defining Claude's role.
+            messages: List of message dicts with 'role' and 'content'.
+            tool: Tool definition with 'name', 'description' and 'input_schema'.
+            max_tokens: Maximum tokens in response.
+            model: Model to use.
+
+        Returns:
+            The tool call's input, or an empty dict if no tool call was made.
+        """
+        response = await self.async_client.messages.create(
+            model=model or self.default_model,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            system=system_prompt,
+            messages=messages,
+            tools=[tool],
+            tool_choice={"type": "tool", "name": tool["name"]},
+        )
+        for block in response.content:
+            if block.type == "tool_use" and block.name == tool["name"]:
+                return block.input
+        return {}
+
+    async def stream_json_response(
+        self,
+        system_prompt: str,
+        messages: list[dict],
+        max_tokens: int = 2000,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Stream a JSON response from Claude as text chunks.
+
+        Used for grading so the output can be parsed while it arrives.
+
+        Args:
+            system_prompt: The system prompt defining Claude's role.
+            messages: List of message dicts with 'role' and 'content'.
+            max_tokens: Maximum tokens in response.
+            model: Model to use.
+
+        Yields:
+            Text chunks of the response as they are generated.
+        """
+        async with self.async_client.messages.stream(
+            model=model or self.default_model,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            system=system_prompt,
+            messages=messages,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
 
 # Singleton instance
 _llm_client: Optional[LLMClient] = None
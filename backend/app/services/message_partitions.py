@@ -0,0 +1,184 @@
+"""Monthly range partitions of the messages table.
+
+``messages`` is partitioned by ``created_at``: one partition per calendar
+month (``messages_p202601`` covers January 2026) plus ``messages_default``
+for rows outside every monthly range, so inserts never fail when
+maintenance falls behind. Queries filtered on ``created_at`` only touch
+the months they need.
+
+Maintenance (``python -m app.scripts.partition_messages``) creates the
+coming months ahead of time and detaches months past the retention
+period into the ``archive`` schema, where they can be dumped and dropped.
+
+All functions take a synchronous connection (scripts, migrations and the
+``create_all`` hook) and run inside the caller's transaction.
+"""
+
+import logging
+import re
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "messages"
+DEFAULT_PARTITION = "messages_default"
+ARCHIVE_SCHEMA = "archive"
+
+# Months created ahead of the current one
+MONTHS_AHEAD = 3
+
+_PARTITION_NAME = re.compile(r"^messages_p(\d{4})(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after ``month`` (may be negative)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding ``month``."""
+    return f"messages_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """The month a partition name covers, or None for other tables."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """Whether ``messages`` is already a partitioned table."""
+    return bool(conn.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :name AND c.relnamespace = 'public'::regnamespace)"
+    ), {"name": PARENT_TABLE}))
+
+
+def attached_partitions(conn: Connection) -> list[str]:
+    """Names of the partitions currently attached to ``messages``."""
+    return list(conn.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'public.messages'::regclass ORDER BY c.relname"
+    )))
+
+
+def ensure_default_partition(conn: Connection) -> None:
+    """Create the catch-all partition if it is missing."""
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"
+    ))
+
+
+def create_partition(conn: Connection, month: date) -> bool:
+    """Create the partition for ``month`` if it does not exist.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new one.
+
+    Returns:
+        True if a partition was created.
+    """
+    month = month_start(month)
+    name = partition_name(month)
+    if name in attached_partitions(conn):
+        return False
+
+    bounds = {"lo": month, "hi": add_months(month, 1)}
+    bounds_sql = (
+        f"FOR VALUES FROM ('{bounds['lo'].isoformat()}') TO ('{bounds['hi'].isoformat()}')"
+    )
+    stranded = conn.scalar(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        "WHERE created_at >= :lo AND created_at < :hi)"
+    ), bounds) if DEFAULT_PARTITION in attached_partitions(conn) else False
+
+    if not stranded:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds_sql}"))
+    else:
+        # The new range may not overlap rows in the default partition
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds_sql}"))
+        moved = conn.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lo AND created_at < :hi RETURNING *) "
+            f"INSERT INTO {PARENT_TABLE} SELECT * FROM moved"
+        ), bounds).rowcount
+        conn.execute(text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+        ))
+        logger.info("Moved %s rows from %s into %s", moved, DEFAULT_PARTITION, name)
+
+    logger.info("Created partition %s", name)
+    return True
+
+
+def ensure_partitions(
+    conn: Connection,
+    since: Optional[date] = None,
+    months_ahead: int = MONTHS_AHEAD,
+    today: Optional[date] = None,
+) -> list[str]:
+    """Create the default partition and monthly partitions up to ``months_ahead``.
+
+    Args:
+        conn: Connection inside a transaction.
+        since: First month to create; defaults to the current month.
+        months_ahead: Months after the current one to create.
+        today: Override the current date (for tests).
+
+    Returns:
+        Names of the partitions created.
+    """
+    current = month_start(today or datetime.utcnow().date())
+    month = month_start(since) if since else current
+    last = add_months(current, months_ahead)
+
+    ensure_default_partition(conn)
+    created = []
+    while month <= last:
+        if create_partition(conn, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def archive_partitions(
+    conn: Connection,
+    retain_months: int,
+    today: Optional[date] = None,
+) -> list[str]:
+    """Detach monthly partitions older than ``retain_months`` into the archive schema.
+
+    The current month counts as the first retained month. Archived tables
+    keep their rows; dump and drop them once exported.
+
+    Returns:
+        Names of the partitions archived.
+    """
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -(retain_months - 1))
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+    archived = []
+    for name in attached_partitions(conn):
+        month = partition_month(name)
+        if month is None or month >= cutoff:
+            continue
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        archived.append(name)
+        logger.info("Archived partition %s to %s.%s", name, ARCHIVE_SCHEMA, name)
+    return archived
@@ -0,0 +1,45 @@
+"""In-process counters for operational metrics."""
+
+import threading
+from collections import defaultdict
+from typing import Optional
+
+
+class Metrics:
+    """Thread-safe named counters, reset when the process restarts."""
+
+    def __init__(self):
+        """Initialize an empty counter registry."""
+        self._counters: dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Add ``value`` to the named counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> float:
+        """Get the current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self, prefix: str = "") -> dict[str, float]:
+        """Get all counters whose name starts with ``prefix``."""
+        with self._lock:
+            return {k: v for k, v in sorted(self._counters.items()) if k.startswith(prefix)}
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._counters.clear()
+
+
+def rate(numerator: float, denominator: float) -> Optional[float]:
+    """Return numerator / denominator rounded to 4 places, or None if empty."""
+    if not denominator:
+        return None
+    return round(numerator / denominator, 4)
+
+
+# Singleton registry
+metrics = Metrics()
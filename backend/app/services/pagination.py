@@ -0,0 +1,99 @@
+"""Keyset (cursor) pagination for conversation lists.
+
+Pages are ordered by ``(started_at, id)`` descending. The cursor is an
+opaque token encoding the last row of the previous page, so each page is
+an index range scan instead of an OFFSET that grows with depth.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+
+from app.models.conversation import Conversation, ConversationMode, ConversationStatus
+from app.models.scenario import Scenario
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(started_at: datetime, conversation_id: UUID) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = json.dumps({"s": started_at.isoformat(), "i": str(conversation_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["s"]), UUID(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def filter_conversations(
+    query,
+    mode: Optional[ConversationMode] = None,
+    status: Optional[ConversationStatus] = None,
+    persona_id: Optional[UUID] = None,
+):
+    """Apply the optional list filters to a conversation query."""
+    if mode:
+        query = query.where(Conversation.mode == mode)
+    if status:
+        query = query.where(Conversation.status == status)
+    if persona_id:
+        query = query.where(
+            Conversation.scenario_id.in_(
+                select(Scenario.id).where(Scenario.persona_id == persona_id)
+            )
+        )
+    return query
+
+
+def paginate_conversations(query, cursor: Optional[str], limit: int):
+    """Apply keyset ordering, the cursor position and the page size to ``query``.
+
+    One extra row is fetched so the caller can tell whether another page
+    exists; pass the rows to ``split_page``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if cursor:
+        started_at, conversation_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(Conversation.started_at, Conversation.id) < tuple_(started_at, conversation_id)
+        )
+    return query.order_by(
+        Conversation.started_at.desc(), Conversation.id.desc()
+    ).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, key=lambda row: row) -> tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the next cursor.
+
+    Args:
+        rows: Rows returned by a query built with ``paginate_conversations``.
+        limit: The requested page size.
+        key: Returns the Conversation for a row.
+
+    Returns:
+        The page rows and the cursor for the next page (None on the last page).
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    last = key(page[-1])
+    return page, encode_cursor(last.started_at, last.id)
@@ -0,0 +1,210 @@
+"""Distributed sliding-window rate limits on LLM-consuming actions.
+
+Each action (``message``, ``start``, ``grade``) is limited per user, and
+all of them together per course, so one scripted client can neither burn
+a course's token budget nor starve the other students. Windows are
+sorted sets in Redis (one member per request, scored by time), so limits
+hold across workers and slide rather than reset on a fixed boundary.
+
+Limits are strings like ``"20/minute"`` (or ``"off"``). Defaults come
+from settings; a scenario's ``rate_limits`` overrides its course's,
+which overrides the defaults, and the course-wide cap can be set with
+the ``"course"`` key on the course.
+
+Redis is an optimization here as elsewhere: if it is unavailable,
+requests are allowed.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.course import Course
+from app.models.scenario import Scenario
+from app.services.catalog_cache import catalog_cache
+from app.services.metrics import metrics, rate
+from app.services.redis_client import get_redis, report_redis_error
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ("message", "start", "grade")
+
+# Key in Course.rate_limits for the cap on all LLM calls in the course
+COURSE_LIMIT = "course"
+
+PERIODS = {"second": 1, "minute": 60, "hour": 60 * 60, "day": 24 * 60 * 60}
+
+# Counts a request against every window only if all of them have room.
+# KEYS: one sorted set per window. ARGV: now (ms), a unique member, then
+# a (limit, window ms) pair per key. Returns 0, or ms until a retry fits.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[1 + 2 * i])
+    local window = tonumber(ARGV[2 + 2 * i])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count >= limit then
+        local entry = redis.call('ZRANGE', key, count - limit, count - limit, 'WITHSCORES')
+        wait = math.max(wait, tonumber(entry[2]) + window - now)
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[2])
+    redis.call('PEXPIRE', key, ARGV[2 + 2 * i])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most ``limit`` requests in any ``window_seconds``."""
+
+    limit: int
+    window_seconds: int
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> Optional["RateLimit"]:
+        """Parse ``"20/minute"``; None or ``"off"`` mean no limit.
+
+        Raises:
+            ValueError: If the value is malformed or allows no requests.
+        """
+        if value is None or value.strip().lower() == "off":
+            return None
+        count, _, period = value.partition("/")
+        period = period.strip().lower()
+        if period.endswith("s"):
+            period = period[:-1]
+        if period not in PERIODS or not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        return cls(limit=int(count), window_seconds=PERIODS[period])
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is over one of its rate limits."""
+
+    def __init__(self, action: str, retry_after: float):
+        """Initialize with the limited action and seconds until a retry fits."""
+        self.action = action
+        self.retry_after = retry_after
+        super().__init__(f"Too many {action} requests; retry in {self.retry_after_seconds}s")
+
+    @property
+    def retry_after_seconds(self) -> int:
+        """Whole seconds for the ``Retry-After`` header."""
+        return max(1, math.ceil(self.retry_after))
+
+
+def _override(row, name: str) -> Optional[str]:
+    return (row.rate_limits or {}).get(name) if row is not None else None
+
+
+def _limit(override: Optional[str], default: str) -> Optional[RateLimit]:
+    """Parse an override, falling back to the default if it is malformed."""
+    if override is not None:
+        try:
+            return RateLimit.parse(override)
+        except ValueError:
+            logger.warning("Ignoring invalid rate limit override %r", override)
+    return RateLimit.parse(default)
+
+
+def limits_for(
+    action: str,
+    user_id: UUID,
+    scenario: Optional[Scenario],
+    course: Optional[Course],
+) -> list[tuple[str, RateLimit]]:
+    """The Redis keys and limits a request must fit under."""
+    settings = get_settings()
+    checks = []
+    user_limit = _limit(
+        _override(scenario, action) or _override(course, action),
+        getattr(settings, f"rate_limit_{action}"),
+    )
+    if user_limit:
+        checks.append((f"ratelimit:{action}:user:{user_id}", user_limit))
+    if course is not None:
+        course_limit = _limit(_override(course, COURSE_LIMIT), settings.rate_limit_course)
+        if course_limit:
+            checks.append((f"ratelimit:llm:course:{course.id}", course_limit))
+    return checks
+
+
+class SlidingWindowLimiter:
+    """Sliding-window counters in Redis, checked and updated atomically."""
+
+    async def hit(self, checks: list[tuple[str, RateLimit]]) -> float:
+        """Count one request against every window if all have room.
+
+        Returns:
+            0 if the request is allowed, otherwise seconds until it would be.
+        """
+        client = get_redis()
+        if client is None or not checks:
+            return 0.0
+
+        now_ms = int(time.time() * 1000)
+        keys = [key for key, _ in checks]
+        args = [now_ms, f"{now_ms}:{uuid4().hex}"]
+        for _, limit in checks:
+            args += [limit.limit, limit.window_seconds * 1000]
+        try:
+            wait_ms = await client.eval(SLIDING_WINDOW_SCRIPT, len(keys), *keys, *args)
+        except Exception as e:
+            report_redis_error(e)
+            return 0.0
+        return int(wait_ms) / 1000
+
+    async def check(
+        self,
+        db: AsyncSession,
+        action: str,
+        user_id: UUID,
+        scenario: Optional[Scenario],
+    ) -> None:
+        """Count an LLM-consuming request by ``user_id`` in ``scenario``.
+
+        Raises:
+            RateLimitExceeded: If the user or the course is over its limit.
+        """
+        if not get_settings().rate_limits_enabled:
+            return
+        course = None
+        if scenario is not None and scenario.course_id is not None:
+            course = await catalog_cache.get(db, Course, scenario.course_id)
+
+        wait = await self.hit(limits_for(action, user_id, scenario, course))
+        metrics.incr(f"rate_limit.{action}.checked")
+        if wait:
+            metrics.incr(f"rate_limit.{action}.rejected")
+            raise RateLimitExceeded(action, wait)
+
+    def stats(self) -> dict:
+        """Checked and rejected counts per action since startup."""
+        result = {}
+        for action in ACTIONS:
+            checked = metrics.get(f"rate_limit.{action}.checked")
+            rejected = metrics.get(f"rate_limit.{action}.rejected")
+            result[action] = {
+                "checked": int(checked),
+                "rejected": int(rejected),
+                "rejected_ratio": rate(rejected, checked),
+            }
+        return result
+
+
+# Singleton used by the routers
+rate_limiter = SlidingWindowLimiter()
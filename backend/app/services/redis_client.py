@@ -0,0 +1,53 @@
+"""Shared async Redis connection for caches.
+
+Redis is an optimization here, never a dependency: callers treat errors
+as cache misses. After a failure Redis is skipped for a short while so a
+down server costs one failed connect per interval, not one per request.
+"""
+
+import logging
+import time
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to stop calling Redis after an error
+RETRY_AFTER_SECONDS = 30.0
+
+_client: Optional[redis.Redis] = None
+_down_until = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """The shared client, or None while Redis is marked unavailable."""
+    global _client
+    if time.monotonic() < _down_until:
+        return None
+    if _client is None:
+        _client = redis.from_url(
+            get_settings().redis_url,
+            decode_responses=True,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return _client
+
+
+def report_redis_error(error: Exception) -> None:
+    """Log a Redis failure and skip Redis for ``RETRY_AFTER_SECONDS``."""
+    global _down_until
+    if time.monotonic() >= _down_until:
+        logger.warning("Redis unavailable, bypassing for %ss: %s", RETRY_AFTER_SECONDS, error)
+    _down_until = time.monotonic() + RETRY_AFTER_SECONDS
+
+
+async def close_redis() -> None:
+    """Close the shared client (on shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
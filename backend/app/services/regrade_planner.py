@@ -0,0 +1,325 @@
+"""Planning and progress tracking for regrading stale grades.
+
+A grade is stale when it was produced under an older version of its
+rubric than the rubric's current version. Instructor overrides are never
+regraded automatically.
+
+One regrade runs at a time across all workers: the run holds a Redis lock
+and keeps its progress in Redis, so any worker can report it. Without
+Redis, runs and progress are tracked per process.
+"""
+
+import json
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.conversation import Conversation, ConversationMode, Message
+from app.models.grade import Grade
+from app.models.rubric import Rubric
+from app.services.redis_client import get_redis, report_redis_error
+
+# Rough token estimate for Claude models
+CHARS_PER_TOKEN = 4
+
+# Fixed grading prompt text around the rubric and transcript
+PROMPT_OVERHEAD_CHARS = 3000
+
+# Typical size of a grade response
+OUTPUT_TOKENS_PER_GRADE = 1500
+
+LOCK_KEY = "regrade:lock"
+PROGRESS_KEY = "regrade:progress"
+
+# How long the last run's progress stays readable
+PROGRESS_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Extend or delete the lock only if this worker still holds it
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class RegradeItem:
+    """A stale grade scheduled for regrading."""
+
+    grade_id: UUID
+    conversation_id: UUID
+    rubric_id: UUID
+    mode: str
+    graded_at: datetime
+    from_version: int
+    to_version: int
+    estimated_input_tokens: int
+    estimated_output_tokens: int = OUTPUT_TOKENS_PER_GRADE
+
+
+@dataclass
+class RegradePlan:
+    """Ordered list of regrades with cost estimates."""
+
+    items: list[RegradeItem]
+    skipped_overrides: int = 0
+
+    @property
+    def estimated_input_tokens(self) -> int:
+        return sum(i.estimated_input_tokens for i in self.items)
+
+    @property
+    def estimated_output_tokens(self) -> int:
+        return sum(i.estimated_output_tokens for i in self.items)
+
+
+@dataclass
+class RegradeProgress:
+    """Progress of the regrade run for this process."""
+
+    status: str = "idle"  # idle, running, completed
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0  # Overridden or already current by the time the run reached them
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    estimated_tokens_remaining: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def start(self, plan: RegradePlan) -> None:
+        """Reset counters for a new run of ``plan``."""
+        self.status = "running"
+        self.total = len(plan.items)
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
+        self.estimated_tokens_remaining = (
+            plan.estimated_input_tokens + plan.estimated_output_tokens
+        )
+        self.errors = []
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), default=datetime.isoformat)
+
+    @classmethod
+    def from_json(cls, data: str) -> "RegradeProgress":
+        fields = json.loads(data)
+        for name in ("started_at", "finished_at"):
+            if fields[name]:
+                fields[name] = datetime.fromisoformat(fields[name])
+        return cls(**fields)
+
+
+def _stale_grades_filter(rubric_id: Optional[UUID] = None) -> list:
+    """Conditions for grades graded under an older version than their rubric's current one."""
+    conditions = [func.coalesce(Grade.rubric_version, 1) < Rubric.version]
+    if rubric_id:
+        conditions.append(Grade.rubric_id == rubric_id)
+    return conditions
+
+
+async def still_needs_regrade(db: AsyncSession, conversation_id: UUID) -> bool:
+    """Whether the conversation's grade is still stale and not overridden.
+
+    A plan runs long after it is built; instructors may override a grade,
+    or it may be regraded, in the meantime.
+    """
+    stale = await db.scalar(
+        select(func.count(Grade.id))
+        .join(Rubric, Rubric.id == Grade.rubric_id)
+        .where(
+            Grade.conversation_id == conversation_id,
+            *_stale_grades_filter(),
+            Grade.instructor_override.is_(False),
+        )
+    )
+    return bool(stale)
+
+
+async def build_regrade_plan(
+    db: AsyncSession,
+    rubric_id: Optional[UUID] = None,
+    limit: Optional[int] = None,
+) -> RegradePlan:
+    """Find stale grades and order them for regrading.
+
+    Graded-mode conversations come first, then the newest grades.
+
+    Args:
+        db: Database session.
+        rubric_id: Only plan regrades for this rubric.
+        limit: Maximum number of items in the plan.
+
+    Returns:
+        The regrade plan with per-item token estimates.
+    """
+    stale = _stale_grades_filter(rubric_id)
+    skipped = await db.scalar(
+        select(func.count(Grade.id))
+        .join(Rubric, Rubric.id == Grade.rubric_id)
+        .where(*stale, Grade.instructor_override.is_(True))
+    )
+
+    graded_first = case((Conversation.mode == ConversationMode.GRADED, 0), else_=1)
+    query = (
+        select(Grade, Conversation.mode, Rubric.version)
+        .join(Conversation, Conversation.id == Grade.conversation_id)
+        .join(Rubric, Rubric.id == Grade.rubric_id)
+        .where(*stale, Grade.instructor_override.is_(False))
+        .order_by(graded_first, Grade.graded_at.desc())
+    )
+    if limit:
+        query = query.limit(limit)
+    rows = (await db.execute(query)).all()
+
+    if not rows:
+        return RegradePlan(items=[], skipped_overrides=skipped or 0)
+
+    # Transcript sizes in one grouped query
+    conversation_ids = [grade.conversation_id for grade, _, _ in rows]
+    transcript_chars = dict(
+        (
+            await db.execute(
+                select(Message.conversation_id, func.sum(func.length(Message.content)))
+                .where(Message.conversation_id.in_(conversation_ids))
+                .group_by(Message.conversation_id)
+            )
+        ).all()
+    )
+
+    rubrics = await db.scalars(
+        select(Rubric).where(Rubric.id.in_({g.rubric_id for g, _, _ in rows}))
+    )
+    rubric_chars = {r.id: len(r.to_prompt_text()) for r in rubrics}
+
+    items = []
+    for grade, mode, current_version in rows:
+        chars = (
+            PROMPT_OVERHEAD_CHARS
+            + rubric_chars.get(grade.rubric_id, 0)
+            + int(transcript_chars.get(grade.conversation_id) or 0)
+        )
+        items.append(RegradeItem(
+            grade_id=grade.id,
+            conversation_id=grade.conversation_id,
+            rubric_id=grade.rubric_id,
+            mode=mode.value,
+            graded_at=grade.graded_at,
+            from_version=grade.rubric_version or 1,
+            to_version=current_version,
+            estimated_input_tokens=chars // CHARS_PER_TOKEN,
+        ))
+
+    return RegradePlan(items=items, skipped_overrides=skipped or 0)
+
+
+class RegradeTracker:
+    """The lock that admits one regrade run, and that run's progress.
+
+    The worker running a regrade holds the lock and extends it with every
+    progress update, so it expires ``regrade_lock_seconds`` after a
+    worker dies mid-run.
+    """
+
+    def __init__(self):
+        """Initialize with no run in this process."""
+        self.progress = RegradeProgress()
+        self._token: Optional[str] = None
+
+    async def acquire(self) -> bool:
+        """Take the lock for a new run; False if a run is in progress."""
+        if self.progress.status == "running":
+            return False
+        client = get_redis()
+        if client is not None:
+            token = uuid4().hex
+            try:
+                acquired = await client.set(
+                    LOCK_KEY, token, nx=True,
+                    px=int(get_settings().regrade_lock_seconds * 1000),
+                )
+            except Exception as e:
+                report_redis_error(e)
+            else:
+                if not acquired:
+                    return False
+                self._token = token
+        self.progress.status = "running"
+        return True
+
+    async def start(self, plan: RegradePlan) -> None:
+        """Begin a run of ``plan`` under the lock from ``acquire``."""
+        self.progress.start(plan)
+        await self.save()
+
+    async def save(self) -> None:
+        """Publish this run's progress and extend its lock."""
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(PROGRESS_KEY, self.progress.to_json(), ex=PROGRESS_TTL_SECONDS)
+                if self._token:
+                    pipe.eval(
+                        EXTEND_SCRIPT, 1, LOCK_KEY, self._token,
+                        int(get_settings().regrade_lock_seconds * 1000),
+                    )
+                await pipe.execute()
+        except Exception as e:
+            report_redis_error(e)
+
+    async def finish(self) -> None:
+        """Mark the run completed and release the lock."""
+        self.progress.status = "completed"
+        self.progress.finished_at = datetime.utcnow()
+        await self.save()
+        await self.release()
+
+    async def release(self) -> None:
+        """Release the lock, e.g. when a run could not be started."""
+        if self.progress.status == "running":
+            self.progress.status = "idle"
+        token, self._token = self._token, None
+        client = get_redis()
+        if token is None or client is None:
+            return
+        try:
+            await client.eval(RELEASE_SCRIPT, 1, LOCK_KEY, token)
+        except Exception as e:
+            report_redis_error(e)
+
+    async def get(self) -> RegradeProgress:
+        """Progress of the current or last run, from whichever worker ran it."""
+        client = get_redis()
+        if client is not None:
+            try:
+                data = await client.get(PROGRESS_KEY)
+            except Exception as e:
+                report_redis_error(e)
+            else:
+                if data is not None:
+                    return RegradeProgress.from_json(data)
+        return self.progress
+
+
+# Singleton used by the routers
+regrade_tracker = RegradeTracker()
@@ -0,0 +1,47 @@
+"""How API responses are encoded: fast JSON and gzip.
+
+The app's default response class is ``ORJSONResponse``. Hot endpoints
+whose payload comes straight from database rows go further: they build
+plain dicts in the shape of their ``response_model`` (the columns are
+already typed, so there is nothing to validate) and return them through
+``trusted_response``. That skips building pydantic models and FastAPI's
+dump-and-revalidate of the return value, which for a long transcript
+cost more than the query; orjson writes UUIDs and datetimes itself.
+
+Responses above ``gzip_minimum_size`` are gzipped for clients that
+accept it. Server-sent event streams are left alone: a gzip stream
+buffers its output, which would hold events back.
+"""
+
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+def trusted_response(content: Any, response: Optional[Response] = None) -> Response:
+    """Render a payload built from trusted rows without validating it.
+
+    Args:
+        content: Dicts (or a list of them) with the fields of the
+            endpoint's ``response_model``; values may be UUIDs, datetimes
+            and other types orjson serializes natively.
+        response: The endpoint's injected response, whose headers (ETag,
+            pagination cursor) are carried over.
+    """
+    result = ORJSONResponse(content)
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Gzip responses of at least ``minimum_size`` bytes, except event streams."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "text/event-stream" in Headers(scope=scope).get("accept", ""):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
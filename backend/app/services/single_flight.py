@@ -0,0 +1,196 @@
+"""Single-flight: concurrent identical computations run once.
+
+When several requests need the same expensive result at the same moment
+(TAs opening the instructor dashboard together, a class loading the
+scenario list at the start of a session), the first caller for a key
+computes it and the rest await that computation instead of repeating it.
+Nothing is kept afterwards; combine with a cache where results may be
+reused.
+
+In-process coalescing is always on. With ``distributed`` the callers in
+other workers are coalesced too: the first worker takes a Redis lock
+for the key and publishes its result under the lock's token, and the
+others wait for that result (up to ``single_flight_lock_seconds``)
+rather than computing it again. Distributed results must be
+JSON-compatible. If Redis is unavailable, or the leader fails or stalls,
+a waiting worker computes the result itself.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Hashable
+from uuid import uuid4
+
+from app.config import get_settings
+from app.services.metrics import metrics, rate
+from app.services.redis_client import get_redis, report_redis_error
+
+logger = logging.getLogger(__name__)
+
+# How often a worker waiting on another worker's computation checks for it
+POLL_SECONDS = 0.05
+
+# Delete the lock only if this worker still holds it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_flights: dict[str, "SingleFlight"] = {}
+
+
+def _result_key(lock_key: str, token: str) -> str:
+    return f"{lock_key}:result:{token}"
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation."""
+
+    def __init__(self, name: str, distributed: bool = False):
+        """Initialize with no computations in flight.
+
+        Args:
+            name: Names the metrics and Redis keys, e.g. the endpoint.
+            distributed: Also coalesce across workers through Redis.
+        """
+        self.name = name
+        self.distributed = distributed
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        _flights[name] = self
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return ``compute()``, shared with concurrent callers for ``key``.
+
+        A failure propagates to every caller waiting on it; the next call
+        computes again. If the caller computing the result is cancelled
+        (its client went away), the others are not: one of them computes
+        it instead with its own ``compute``, which may use its own session.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            metrics.incr(f"single_flight.{self.name}.shared")
+        while inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if self.distributed and get_settings().single_flight_redis:
+                value = await self._across_workers(key, compute)
+            else:
+                value = await self._compute(compute)
+        except asyncio.CancelledError:
+            # Waiters take over rather than being cancelled with this caller
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    async def _compute(self, compute: Callable[[], Awaitable[Any]]) -> Any:
+        metrics.incr(f"single_flight.{self.name}.executions")
+        return await compute()
+
+    async def _across_workers(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Compute as the leader for ``key``, or wait for the leader's result."""
+        client = get_redis()
+        if client is None:
+            return await self._compute(compute)
+
+        settings = get_settings()
+        lock_key = f"singleflight:{self.name}:{key}"
+        token = uuid4().hex
+        try:
+            leader = await client.set(
+                lock_key, token, nx=True, px=int(settings.single_flight_lock_seconds * 1000)
+            )
+            leader_token = None if leader else await client.get(lock_key)
+        except Exception as e:
+            report_redis_error(e)
+            return await self._compute(compute)
+
+        if leader:
+            try:
+                value = await self._compute(compute)
+                await self._publish(client, lock_key, token, value)
+                return value
+            finally:
+                await self._release(client, lock_key, token)
+
+        if leader_token is not None:
+            found, value = await self._wait_for(client, lock_key, leader_token)
+            if found:
+                metrics.incr(f"single_flight.{self.name}.shared_across_workers")
+                return value
+        return await self._compute(compute)
+
+    async def _publish(self, client, lock_key: str, token: str, value: Any) -> None:
+        try:
+            await client.set(
+                _result_key(lock_key, token),
+                json.dumps(value),
+                px=int(get_settings().single_flight_result_ttl_seconds * 1000),
+            )
+        except Exception as e:
+            report_redis_error(e)
+
+    async def _release(self, client, lock_key: str, token: str) -> None:
+        try:
+            await client.eval(RELEASE_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            report_redis_error(e)
+
+    async def _wait_for(self, client, lock_key: str, token: str) -> tuple[bool, Any]:
+        """Wait for the result of the computation holding the lock as ``token``.
+
+        Returns:
+            Whether the result arrived, and the result.
+        """
+        deadline = time.monotonic() + get_settings().single_flight_lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_SECONDS)
+            try:
+                cached, holder = await client.mget(_result_key(lock_key, token), lock_key)
+            except Exception as e:
+                report_redis_error(e)
+                return False, None
+            if cached is not None:
+                return True, json.loads(cached)
+            if holder != token:
+                # The leader failed, or its lock expired
+                return False, None
+        logger.warning("Gave up waiting on %s; computing locally", lock_key)
+        return False, None
+
+    def stats(self) -> dict:
+        """Computations run and calls that shared one since startup."""
+        executions = metrics.get(f"single_flight.{self.name}.executions")
+        shared = metrics.get(f"single_flight.{self.name}.shared")
+        remote = metrics.get(f"single_flight.{self.name}.shared_across_workers")
+        return {
+            "executions": int(executions),
+            "shared": int(shared),
+            "shared_across_workers": int(remote),
+            "shared_ratio": rate(shared + remote, executions + shared + remote),
+        }
+
+
+def stats() -> dict:
+    """Stats of every single-flight group in this process."""
+    return {name: flight.stats() for name, flight in _flights.items()}
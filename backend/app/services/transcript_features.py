@@ -0,0 +1,149 @@
+"""Deterministic transcript features for cheap pre-scoring and review triage.
+
+Everything here runs locally in milliseconds without an LLM call. The
+features feed a transparent heuristic score that is compared against the
+AI grade to flag anomalies for instructor review.
+"""
+
+import re
+from typing import Optional
+
+from app.models.conversation import MessageRole
+
+# Technical terms a business stakeholder would likely not follow
+JARGON_TERMS = [
+    "accuracy", "auc", "bert", "bayesian", "classifier", "clustering",
+    "confusion matrix", "cross-validation", "cross validation", "embedding",
+    "ensemble", "f1", "feature engineering", "feature importance", "gradient",
+    "hyperparameter", "k-means", "logistic", "lstm", "mae", "neural network",
+    "overfitting", "p-value", "pipeline", "precision", "random forest", "recall",
+    "regression", "regularization", "r-squared", "rmse", "roc", "shap",
+    "tensor", "training set", "test set", "transformer", "xgboost",
+]
+
+# One alternation so each message is scanned once for all terms
+_JARGON_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(t) for t in sorted(JARGON_TERMS, key=len, reverse=True)) + r")\b"
+)
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_SENTENCE_RE = re.compile(r"[^.!?\n]+")
+# Money amounts, percentages, magnitudes, durations and thousands ("$2M",
+# "15%", "3 hours", "1,200"); a bare number ("2 kids", "at 3") is not a claim
+_QUANTITY_RE = re.compile(
+    r"[$€£]\s?\d"
+    r"|\d+(?:\.\d+)?\s?(?:%|percent\b|k\b|m\b|million\b|billion\b)"
+    r"|\d+(?:\.\d+)?\s?(?:hour|day|week|month|year)s?\b"
+    r"|\b\d{1,3}(?:,\d{3})+\b"
+)
+
+_STOPWORDS = {
+    "about", "after", "also", "been", "being", "could", "does", "from", "have",
+    "into", "just", "more", "much", "only", "other", "over", "should", "some",
+    "than", "that", "their", "them", "then", "there", "these", "they", "this",
+    "what", "when", "where", "which", "while", "will", "with", "would", "your",
+}
+
+# Similarity between a question/concern and the student's words to count as covered
+COVERAGE_THRESHOLD = 0.5
+
+# Student share of words considered a healthy back-and-forth
+TALK_RATIO_RANGE = (0.35, 0.65)
+
+
+def _content_words(text: str) -> set[str]:
+    """Lowercase words longer than three letters, minus stopwords."""
+    return {w for w in _WORD_RE.findall(text.lower()) if len(w) > 3 and w not in _STOPWORDS}
+
+
+def _coverage(items: list[str], student_words: set[str]) -> Optional[float]:
+    """Fraction of items whose content words the student mostly addressed."""
+    if not items:
+        return None
+    covered = 0
+    for item in items:
+        words = _content_words(item)
+        if words and len(words & student_words) / len(words) >= COVERAGE_THRESHOLD:
+            covered += 1
+    return round(covered / len(items), 3)
+
+
+def extract_features(messages: list, persona) -> dict:
+    """Compute grading signal features for a conversation.
+
+    Args:
+        messages: The conversation's Message rows in order.
+        persona: The stakeholder persona (for required questions and concerns).
+
+    Returns:
+        Dictionary of JSON-serializable features.
+    """
+    student_texts = [m.content.lower() for m in messages if m.role == MessageRole.STUDENT]
+    stakeholder_texts = [m.content.lower() for m in messages if m.role != MessageRole.STUDENT]
+
+    student_corpus = "\n".join(student_texts)
+    student_word_list = _WORD_RE.findall(student_corpus)
+    student_words = len(student_word_list)
+    stakeholder_words = len(_WORD_RE.findall("\n".join(stakeholder_texts)))
+    total_words = student_words + stakeholder_words
+
+    jargon_hits = len(_JARGON_RE.findall(student_corpus))
+    sentences = [s for s in _SENTENCE_RE.findall(student_corpus) if s.strip()]
+    quantified = sum(1 for s in sentences if _QUANTITY_RE.search(s))
+
+    student_vocab = {w for w in student_word_list if len(w) > 3}
+    context = persona.to_prompt_context()
+
+    return {
+        "student_turns": len(student_texts),
+        "student_words": student_words,
+        "stakeholder_words": stakeholder_words,
+        "student_talk_ratio": round(student_words / total_words, 3) if total_words else 0.0,
+        "avg_student_message_words": (
+            round(student_words / len(student_texts), 1) if student_texts else 0.0
+        ),
+        "jargon_count": jargon_hits,
+        "jargon_per_100_words": (
+            round(jargon_hits * 100 / student_words, 2) if student_words else 0.0
+        ),
+        "quantified_claims": quantified,
+        "quantified_claims_per_turn": (
+            round(quantified / len(student_texts), 3) if student_texts else 0.0
+        ),
+        "required_question_coverage": _coverage(context["required_questions"], student_vocab),
+        "concern_coverage": _coverage(context["concerns"], student_vocab),
+    }
+
+
+def predict_score_pct(features: dict) -> float:
+    """Heuristic percentage score (0-100) predicted from features alone.
+
+    A deliberately simple, explainable weighting: quantified business claims,
+    coverage of the persona's questions and concerns, plain language, and a
+    balanced conversation each contribute points on top of a baseline.
+    """
+    if not features.get("student_turns"):
+        return 0.0
+
+    score = 35.0
+    score += 20 * min(features["quantified_claims_per_turn"], 1.0)
+
+    coverages = [
+        c for c in (features["required_question_coverage"], features["concern_coverage"])
+        if c is not None
+    ]
+    score += 25 * (sum(coverages) / len(coverages) if coverages else 0.5)
+
+    score += 10 * (1 - min(features["jargon_per_100_words"] / 5, 1.0))
+
+    low, high = TALK_RATIO_RANGE
+    if low <= features["student_talk_ratio"] <= high:
+        score += 10
+    elif features["student_talk_ratio"] > 0.2:
+        score += 5
+
+    return round(min(score, 100.0), 1)
+
+
+def is_anomalous(ai_score_pct: float, predicted_pct: float, threshold: float) -> bool:
+    """Check if the AI score is further than ``threshold`` points from the prediction."""
+    return abs(ai_score_pct - predicted_pct) > threshold
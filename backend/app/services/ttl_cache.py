@@ -0,0 +1,78 @@
+"""Bounded in-process cache whose entries expire."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.services.metrics import metrics, rate
+
+
+class TTLCache:
+    """LRU map whose entries also expire after a time to live.
+
+    Thread-safe. Lookups are counted under ``{name}.hits`` and
+    ``{name}.misses`` in the metrics registry.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        """Initialize an empty cache.
+
+        Args:
+            name: Metrics prefix.
+            max_entries: Entries kept before the least recently used is dropped.
+            ttl_seconds: Default lifetime of an entry.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The live value for ``key``, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                metrics.incr(f"{self.name}.hits")
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        metrics.incr(f"{self.name}.misses")
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store ``value`` for ``ttl_seconds`` (default: the cache's TTL)."""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop ``key`` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Size and hit ratio since the process started."""
+        hits = metrics.get(f"{self.name}.hits")
+        misses = metrics.get(f"{self.name}.misses")
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "hits": int(hits),
+            "misses": int(misses),
+            "hit_ratio": rate(hits, hits + misses),
+        }
@@ -0,0 +1,184 @@
+"""Startup warmup, so a new worker's first requests are not the slow ones.
+
+After a deploy or scale-out every worker starts with an empty connection
+pool, empty catalog caches and no compiled prompts. Warmup runs in the
+background as the app starts and:
+
+- opens ``db_pool_size`` connections to the primary (and replica);
+- loads every scenario, active persona and rubric through the catalog
+  cache, which also fills Redis for workers started later;
+- compiles each persona's system prompt and each rubric's criteria text;
+- optionally (``warmup_llm``) sends one minimal LLM request so the
+  connection to the API is open.
+
+``/health/ready`` reports not ready until warmup has finished. A failed
+step is logged and recorded but does not keep the worker out of rotation.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, async_engine, read_async_engine
+from app.models.persona import Persona
+from app.models.rubric import Rubric
+from app.models.scenario import Scenario
+from app.services.catalog_cache import catalog_cache
+from app.services.conversation_engine import compile_persona_prompt
+from app.services.grading_engine import criteria_text
+from app.services.llm_client import get_llm_client
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Progress of this worker's warmup, as reported by /health/ready."""
+
+    def __init__(self):
+        """Initialize as not started."""
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.steps: dict[str, dict] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Whether warmup has finished (successfully or not)."""
+        return self.finished_at is not None
+
+    def reset(self) -> None:
+        """Forget any previous run."""
+        self.started_at = None
+        self.finished_at = None
+        self.steps = {}
+
+    def to_dict(self) -> dict:
+        """Summary for the readiness endpoint."""
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": self.steps,
+        }
+
+
+# Singleton for this process
+warmup_state = WarmupState()
+
+
+async def open_pool(engine: AsyncEngine, size: int) -> int:
+    """Open ``size`` connections at once so the pool keeps them.
+
+    Returns:
+        Number of connections opened.
+    """
+    # Hold every connection until all are open, or the pool reuses one
+    barrier = asyncio.Barrier(size)
+
+    async def ping():
+        async with engine.connect() as conn:
+            try:
+                await conn.execute(text("SELECT 1"))
+            except Exception:
+                # Release the connections already waiting
+                await barrier.abort()
+                raise
+            await barrier.wait()
+
+    await asyncio.gather(*(ping() for _ in range(size)))
+    return size
+
+
+async def open_pools() -> dict:
+    """Open the minimum pool on the primary and, if configured, the replica."""
+    size = get_settings().db_pool_size
+    opened = {"primary": await open_pool(async_engine, size)}
+    if read_async_engine is not None:
+        opened["replica"] = await open_pool(read_async_engine, size)
+    return opened
+
+
+async def preload_catalog() -> dict:
+    """Load scenarios, active personas and rubrics and compile their prompts."""
+    async with AsyncSessionLocal() as db:
+        await catalog_cache.list_scenarios(db)
+        scenario_ids = (await db.scalars(select(Scenario.id))).all()
+        persona_ids = (await db.scalars(select(Persona.id).where(Persona.is_active))).all()
+        rubric_ids = (await db.scalars(select(Rubric.id))).all()
+
+        for scenario_id in scenario_ids:
+            await catalog_cache.get(db, Scenario, scenario_id)
+        for persona_id in persona_ids:
+            persona = await catalog_cache.get(db, Persona, persona_id)
+            if persona:
+                compile_persona_prompt(persona)
+        for rubric_id in rubric_ids:
+            rubric = await catalog_cache.get(db, Rubric, rubric_id)
+            if rubric:
+                criteria_text(rubric)
+
+    return {
+        "scenarios": len(scenario_ids),
+        "personas": len(persona_ids),
+        "rubrics": len(rubric_ids),
+    }
+
+
+async def open_llm_connection() -> dict:
+    """Send a one-token request so the HTTP connection to the API is open."""
+    client = get_llm_client()
+    await client.generate_response(
+        system_prompt="Reply with OK.",
+        messages=[{"role": "user", "content": "ping"}],
+        max_tokens=1,
+    )
+    return {"model": client.default_model}
+
+
+async def _run_step(name: str, step: Callable[[], Awaitable[dict]]) -> None:
+    started = time.perf_counter()
+    try:
+        result = await step()
+    except Exception as e:
+        logger.warning("Warmup step %s failed: %s", name, e)
+        result = {"error": str(e)}
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    warmup_state.steps[name] = result
+
+
+async def run_warmup(include_llm: Optional[bool] = None) -> WarmupState:
+    """Run every warmup step and mark the worker ready.
+
+    With ``warmup_enabled`` off the worker is marked ready at once. Each step is bounded by ``warmup_timeout_seconds`` so a hanging
+    dependency delays readiness, but never blocks it.
+    """
+    settings = get_settings()
+    if include_llm is None:
+        include_llm = settings.warmup_llm and bool(settings.anthropic_api_key)
+
+    steps = []
+    if settings.warmup_enabled:
+        steps += [("db_pool", open_pools), ("catalog", preload_catalog)]
+    if settings.warmup_enabled and include_llm:
+        steps.append(("llm", open_llm_connection))
+
+    warmup_state.reset()
+    warmup_state.started_at = datetime.utcnow()
+    try:
+        for name, step in steps:
+            try:
+                await asyncio.wait_for(
+                    _run_step(name, step), timeout=settings.warmup_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Warmup step %s timed out", name)
+                warmup_state.steps[name] = {"error": "timed out"}
+    finally:
+        warmup_state.finished_at = datetime.utcnow()
+    logger.info("Warmup finished: %s", warmup_state.steps)
+    return warmup_state
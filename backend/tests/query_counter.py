@@ -0,0 +1,62 @@
+"""Test helper for counting SQL statements issued by the API."""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.database import async_engine
+
+
+class QueryCounter:
+    """Collects the SQL statements and transaction boundaries executed while active."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self.transactions: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def round_trips(self) -> int:
+        """Statements plus BEGIN, COMMIT and ROLLBACK."""
+        return len(self.statements) + len(self.transactions)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_begin(self, conn):
+        self.transactions.append("BEGIN")
+
+    def _on_commit(self, conn):
+        self.transactions.append("COMMIT")
+
+    def _on_rollback(self, conn):
+        self.transactions.append("ROLLBACK")
+
+
+@contextmanager
+def count_queries(engine=async_engine):
+    """Count statements executed on ``engine`` inside the block.
+
+    Example:
+        with count_queries() as counter:
+            client.get("/api/v1/conversations")
+        assert counter.count <= 2
+    """
+    counter = QueryCounter()
+    target = getattr(engine, "sync_engine", engine)
+    listeners = [
+        ("before_cursor_execute", counter._on_execute),
+        ("begin", counter._on_begin),
+        ("commit", counter._on_commit),
+        ("rollback", counter._on_rollback),
+    ]
+    for name, fn in listeners:
+        event.listen(target, name, fn)
+    try:
+        yield counter
+    finally:
+        for name, fn in listeners:
+            event.remove(target, name, fn)
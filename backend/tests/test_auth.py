@@ -0,0 +1,140 @@
+"""Tests for resolving the authenticated user."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.user import User, UserRole
+from app.routers import auth
+from app.routers.auth import (
+    MOCK_USERS,
+    create_access_token,
+    get_authenticated_user,
+    require_instructor,
+    token_cache,
+    user_cache,
+)
+from app.services.ttl_cache import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    token_cache.clear()
+    user_cache.clear()
+    yield
+    token_cache.clear()
+    user_cache.clear()
+
+
+def _bearer(user_key: str) -> str:
+    return "Bearer " + create_access_token({"sub": MOCK_USERS[user_key]["id"]})
+
+
+class TestTTLCache:
+    """Tests for the bounded expiring cache."""
+
+    def test_entries_expire(self):
+        """Test an entry is gone once its TTL passes."""
+        cache = TTLCache("test_cache", max_entries=10, ttl_seconds=60)
+        with patch("app.services.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1, ttl_seconds=5)
+        with patch("app.services.ttl_cache.time.monotonic", return_value=104.0):
+            assert cache.get("a") == 1
+        with patch("app.services.ttl_cache.time.monotonic", return_value=106.0):
+            assert cache.get("a") is None
+
+    def test_bounded_by_recent_use(self):
+        """Test the least recently used entry is dropped first."""
+        cache = TTLCache("test_cache", max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["entries"] == 2
+
+
+class TestAuthenticatedUser:
+    """Tests for the shared auth dependency."""
+
+    def test_mock_key_defaults_to_student1(self):
+        """Test requests without credentials act as student1."""
+        user = asyncio.run(get_authenticated_user(user_key=None, authorization=None))
+
+        assert user.id == UUID(MOCK_USERS["student1"]["id"])
+        assert user.role == "student"
+        assert not user.is_instructor
+
+    def test_unknown_mock_key_rejected(self):
+        """Test an unknown user_key is a 401."""
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(get_authenticated_user(user_key="nobody", authorization=None))
+        assert exc.value.status_code == 401
+
+    def test_token_verified_once(self):
+        """Test repeated requests with one token decode it once."""
+        header = _bearer("instructor")
+
+        with patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+            for _ in range(3):
+                user = asyncio.run(get_authenticated_user(user_key=None, authorization=header))
+
+        assert decode.call_count == 1
+        assert user.is_instructor
+
+    def test_token_takes_precedence_over_user_key(self):
+        """Test the bearer token decides the user when both are sent."""
+        user = asyncio.run(
+            get_authenticated_user(user_key="student1", authorization=_bearer("admin"))
+        )
+        assert user.role == "admin"
+
+    def test_invalid_token_rejected_and_not_cached(self):
+        """Test a bad token is a 401 every time."""
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc:
+                asyncio.run(get_authenticated_user(user_key=None, authorization="Bearer junk"))
+            assert exc.value.status_code == 401
+        assert token_cache.stats()["entries"] == 0
+
+    def test_expired_token_rejected(self):
+        """Test an expired token is not accepted."""
+        token = create_access_token(
+            {"sub": MOCK_USERS["student1"]["id"]}, expires_delta=timedelta(seconds=-1)
+        )
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(get_authenticated_user(user_key=None, authorization=f"Bearer {token}"))
+        assert exc.value.status_code == 401
+
+    def test_other_users_read_from_table_once(self):
+        """Test users outside the mock set come from the users table, cached."""
+        row = User(id=uuid4(), email="sam@example.com", name="Sam", role=UserRole.INSTRUCTOR)
+        session = MagicMock()
+        session.get = AsyncMock(return_value=row)
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        header = "Bearer " + create_access_token({"sub": str(row.id)})
+
+        with patch.object(auth, "AsyncSessionLocal", return_value=session):
+            first = asyncio.run(get_authenticated_user(user_key=None, authorization=header))
+            second = asyncio.run(get_authenticated_user(user_key=None, authorization=header))
+
+        assert first == second
+        assert first.name == "Sam" and first.is_instructor
+        session.get.assert_awaited_once()
+
+    def test_require_instructor(self):
+        """Test students are refused instructor-only routes."""
+        student = asyncio.run(get_authenticated_user(user_key="student1", authorization=None))
+        instructor = asyncio.run(get_authenticated_user(user_key="instructor", authorization=None))
+
+        assert asyncio.run(require_instructor(instructor)) is instructor
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(require_instructor(student))
+        assert exc.value.status_code == 403
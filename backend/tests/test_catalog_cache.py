@@ -0,0 +1,186 @@
+"""Tests for the scenario, persona and rubric catalog cache."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.persona import Persona
+from app.services import catalog_cache as catalog_module
+from app.services.catalog_cache import CatalogCache, deserialize, serialize
+from app.services.metrics import metrics
+
+
+class FakeRedis:
+    """Just enough of the async Redis API for the cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+
+def _persona() -> Persona:
+    return Persona(
+        id=uuid4(),
+        name="Dana",
+        title="VP Sales",
+        background="Skeptical of models",
+        concerns=["cost", "accuracy"],
+        required_questions=[],
+        is_active=True,
+        created_at=datetime(2026, 1, 2, 3, 4, 5),
+    )
+
+
+def _db(persona: Persona):
+    db = MagicMock()
+    db.get = AsyncMock(return_value=persona)
+    return db
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(catalog_module, "get_redis", return_value=fake):
+        metrics.reset()
+        yield fake
+
+
+def _cache(check_seconds: float = 60) -> CatalogCache:
+    return CatalogCache(max_entries=2, ttl_seconds=60, generation_check_seconds=check_seconds)
+
+
+class TestSerialization:
+    """Tests for converting rows to and from cached JSON."""
+
+    def test_round_trip(self):
+        """Test a row survives serialization with its column types."""
+        persona = _persona()
+
+        copy = deserialize(Persona, serialize(persona))
+
+        assert copy is not persona
+        assert copy.id == persona.id
+        assert copy.created_at == persona.created_at
+        assert copy.to_prompt_context() == persona.to_prompt_context()
+
+
+class TestCatalogCache:
+    """Tests for the two-level read-through cache."""
+
+    def test_second_lookup_is_local(self, redis):
+        """Test the database is read once and then the LRU answers."""
+        persona = _persona()
+        db = _db(persona)
+        cache = _cache()
+
+        first = asyncio.run(cache.get(db, Persona, persona.id))
+        second = asyncio.run(cache.get(db, Persona, persona.id))
+
+        assert first.name == second.name == "Dana"
+        db.get.assert_awaited_once()
+        assert cache.stats()["local_hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_other_process_reads_redis(self, redis):
+        """Test a second process is served from Redis, not the database."""
+        persona = _persona()
+        asyncio.run(_cache().get(_db(persona), Persona, persona.id))
+
+        db = _db(persona)
+        other = _cache()
+        asyncio.run(other.get(db, Persona, persona.id))
+
+        db.get.assert_not_awaited()
+        assert other.stats()["redis_hits"] == 1
+
+    def test_invalidate_forces_reload(self, redis):
+        """Test a catalog write makes the next lookup hit the database."""
+        persona = _persona()
+        db = _db(persona)
+        cache = _cache()
+        asyncio.run(cache.get(db, Persona, persona.id))
+
+        asyncio.run(cache.invalidate())
+        asyncio.run(cache.get(db, Persona, persona.id))
+
+        assert db.get.await_count == 2
+        assert redis.data["catalog:generation"] == 1
+
+    def test_other_process_sees_invalidation(self, redis):
+        """Test a generation bump elsewhere clears the local LRU."""
+        persona = _persona()
+        db = _db(persona)
+        cache = _cache(check_seconds=0)
+        asyncio.run(cache.get(db, Persona, persona.id))
+
+        asyncio.run(_cache().invalidate())
+        asyncio.run(cache.get(db, Persona, persona.id))
+
+        assert db.get.await_count == 2
+
+    def test_missing_rows_not_cached(self, redis):
+        """Test a missing row is looked up again next time."""
+        db = _db(None)
+        cache = _cache()
+        row_id = uuid4()
+
+        assert asyncio.run(cache.get(db, Persona, row_id)) is None
+        assert asyncio.run(cache.get(db, Persona, row_id)) is None
+        assert db.get.await_count == 2
+
+    def test_lru_evicts_oldest(self, redis):
+        """Test the local LRU is bounded."""
+        cache = _cache()
+        for _ in range(3):
+            persona = _persona()
+            asyncio.run(cache.get(_db(persona), Persona, persona.id))
+
+        assert cache.stats()["entries"] == 2
+
+    def test_works_without_redis(self):
+        """Test lookups fall back to the database when Redis is down."""
+        persona = _persona()
+        db = _db(persona)
+        cache = _cache()
+
+        with patch.object(catalog_module, "get_redis", return_value=None):
+            asyncio.run(cache.get(db, Persona, persona.id))
+            asyncio.run(cache.invalidate())
+            result = asyncio.run(cache.get(db, Persona, persona.id))
+
+        assert result.name == "Dana"
+        assert db.get.await_count == 2
+
+    def test_concurrent_misses_load_once(self, redis):
+        """Test a class opening the same entry at once causes one query."""
+        persona = _persona()
+        db = _db(persona)
+
+        async def slow_get(*args):
+            await asyncio.sleep(0.02)
+            return persona
+
+        db.get.side_effect = slow_get
+        cache = _cache()
+
+        async def scenario():
+            return await asyncio.gather(*[cache.get(db, Persona, persona.id) for _ in range(20)])
+
+        results = asyncio.run(scenario())
+
+        assert db.get.await_count == 1
+        assert all(r.name == "Dana" for r in results)
+        assert cache.stats()["misses"] == 1
@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from uuid import UUID
 
 from app.main import app
+from tests.query_counter import count_queries
 
 client = TestClient(app)
 
@@ -68,6 +69,319 @@ class TestConversationEndpoints:
         assert response.status_code == 404
 
 
+class TestListingQueryCounts:
+    """Listing endpoints issue a fixed number of queries regardless of page size."""
+
+    def _count(self, test_client, url: str) -> int:
+        with count_queries() as counter:
+            response = test_client.get(url)
+        assert response.status_code == 200
+        return counter.count
+
+    def test_list_scenarios_query_count(self):
+        """Test scenarios and their personas load in one query."""
+        with TestClient(app) as test_client:
+            test_client.get("/health/ready")  # Warm up the pool
+            assert self._count(test_client, "/api/v1/conversations/scenarios?user_key=student1") <= 1
+
+    def test_list_conversations_query_count(self):
+        """Test the conversation page size does not change the query count."""
+        with TestClient(app) as test_client:
+            test_client.get("/health/ready")
+            small = self._count(test_client, "/api/v1/conversations?user_key=student1&limit=1")
+            large = self._count(test_client, "/api/v1/conversations?user_key=student1&limit=20")
+        assert small == large
+        assert large <= 1
+
+
+class TestTurnPersistence:
+    """A chat turn is written in one statement without refreshes."""
+
+    def _session(self, conversation, turn_count):
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=conversation)
+        db.execute = AsyncMock(
+            return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=turn_count))
+        )
+        db.scalars = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+        for name in ("commit", "rollback", "close", "refresh", "flush"):
+            setattr(db, name, AsyncMock())
+        return db
+
+    def _send(self, db):
+        from app.database import get_db
+
+        app.dependency_overrides[get_db] = lambda: db
+        try:
+            with patch(
+                "app.routers.conversations.ConversationEngine.get_response",
+                AsyncMock(return_value="Stakeholder reply"),
+            ), patch(
+                "app.routers.conversations.rate_limiter.check", AsyncMock(),
+            ), patch(
+                "app.routers.conversations.catalog_cache.get",
+                AsyncMock(return_value=MagicMock(max_turns=10)),
+            ) as catalog_get:
+                self.catalog_get = catalog_get
+                return client.post(
+                    f"/api/v1/conversations/{self.conversation_id}/messages?user_key=student1",
+                    json={"content": "Hello"},
+                )
+        finally:
+            app.dependency_overrides.clear()
+
+    def _conversation(self):
+        from datetime import datetime
+        from uuid import uuid4
+        from app.models.conversation import ConversationStatus
+        from app.routers.auth import MOCK_USERS
+
+        self.conversation_id = uuid4()
+        return MagicMock(
+            id=self.conversation_id,
+            user_id=UUID(MOCK_USERS["student1"]["id"]),
+            status=ConversationStatus.IN_PROGRESS,
+            started_at=datetime(2026, 1, 1),
+            context=None,
+        )
+
+    def test_turn_written_in_one_statement(self):
+        """Test one read, one history load, one write and a commit per turn."""
+        db = self._session(self._conversation(), turn_count=4)
+
+        response = self._send(db)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["turn_count"] == 4
+        assert data["student_message"]["created_at"] < data["stakeholder_message"]["created_at"]
+        # Scenario and persona come from the catalog cache
+        assert self.catalog_get.await_count == 2
+        assert db.scalar.await_count == 1
+        assert db.execute.await_count == 1
+        assert db.scalars.await_count == 1
+        db.commit.assert_awaited_once()
+        db.refresh.assert_not_awaited()
+        db.flush.assert_not_awaited()
+
+        write = str(db.execute.await_args.args[0])
+        assert write.startswith("WITH inserted_messages AS")
+        assert "UPDATE conversations SET turn_count" in write
+
+    def test_turn_rejected_if_conversation_ended(self):
+        """Test the turn rolls back if the conversation ended during the LLM call."""
+        db = self._session(self._conversation(), turn_count=None)
+
+        response = self._send(db)
+
+        assert response.status_code == 400
+        db.rollback.assert_awaited_once()
+        db.commit.assert_not_awaited()
+
+    def test_turn_round_trips(self):
+        """Test a full turn against the database stays within its round-trip budget."""
+        with TestClient(app) as test_client, patch(
+            "app.routers.conversations.ConversationEngine.get_opening_message",
+            AsyncMock(return_value="Opening"),
+        ), patch(
+            "app.routers.conversations.ConversationEngine.get_response",
+            AsyncMock(return_value="Reply"),
+        ):
+            started = test_client.post(
+                "/api/v1/conversations?user_key=student1",
+                json={"scenario_id": TEST_SCENARIO_ID, "context": "A churn prediction model"},
+            )
+            assert started.status_code == 200
+            url = f"/api/v1/conversations/{started.json()['id']}/messages?user_key=student1"
+
+            with count_queries() as counter:
+                response = test_client.post(url, json={"content": "Hello"})
+
+        assert response.status_code == 200
+        # Read (catalog cache warm): BEGIN, conversation, history, ROLLBACK
+        # Write: BEGIN, insert-and-update, COMMIT
+        assert counter.count == 3
+        assert counter.round_trips <= 7
+
+
+class TestMessagesSince:
+    """Delta sync: only messages after the client's last one."""
+
+    def _get(self, params, owner="student1", messages=(), turn_count=3):
+        from datetime import datetime
+        from uuid import uuid4
+        from app.database import get_db
+        from app.models.conversation import ConversationStatus
+        from app.routers.auth import MOCK_USERS
+
+        conversation = MagicMock(
+            user_id=UUID(MOCK_USERS[owner]["id"]),
+            status=ConversationStatus.IN_PROGRESS,
+            turn_count=turn_count,
+            started_at=datetime(2026, 3, 1, 9, 0),
+            completed_at=None,
+        )
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(first=MagicMock(return_value=conversation)))
+        db.scalars = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=list(messages))))
+        app.dependency_overrides[get_db] = lambda: db
+        try:
+            response = client.get(
+                f"/api/v1/conversations/{uuid4()}/messages",
+                params={"user_key": "student1", **params},
+            )
+        finally:
+            app.dependency_overrides.clear()
+        return response, db
+
+    def _messages(self, count):
+        from datetime import datetime, timedelta
+        from uuid import uuid4
+        from app.models.conversation import Message, MessageRole
+
+        return [
+            Message(
+                id=uuid4(),
+                role=MessageRole.STAKEHOLDER,
+                content=f"Reply {i}",
+                created_at=datetime(2026, 3, 1, 9, 5) + timedelta(seconds=i),
+            )
+            for i in range(count)
+        ]
+
+    def _sql(self, db) -> str:
+        from sqlalchemy.dialects import postgresql
+
+        query = db.scalars.await_args.args[0]
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    def test_returns_new_messages_and_state(self):
+        """Test the payload holds the new messages, status and turn count."""
+        from uuid import uuid4
+
+        new = self._messages(2)
+        response, db = self._get(
+            {"since": "2026-03-01T09:04:00.5", "after": str(uuid4())}, messages=new, turn_count=7
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "in_progress"
+        assert data["turn_count"] == 7
+        assert [m["content"] for m in data["messages"]] == ["Reply 0", "Reply 1"]
+        assert data["has_more"] is False
+        db.execute.assert_awaited_once()
+        db.scalars.assert_awaited_once()
+
+    def test_seeks_past_last_message(self):
+        """Test the query is an index range after (created_at, id), not the transcript."""
+        from uuid import uuid4
+
+        _, db = self._get({"since": "2026-03-01T09:04:00", "after": str(uuid4())})
+        sql = self._sql(db)
+
+        assert "(messages.created_at, messages.id) >" in sql
+        assert "messages.created_at >=" in sql
+        assert "ORDER BY messages.created_at, messages.id" in sql
+
+    def test_timestamp_only_and_timezone(self):
+        """Test a bare, timezone-aware timestamp is compared as naive UTC."""
+        from datetime import datetime
+
+        _, db = self._get({"since": "2026-03-01T10:04:00+01:00"})
+        params = db.scalars.await_args.args[0].compile().params
+
+        assert datetime(2026, 3, 1, 9, 4) in params.values()
+        assert "(messages.created_at, messages.id)" not in self._sql(db)
+
+    def test_has_more_when_over_limit(self):
+        """Test a capped page says more messages follow."""
+        response, _ = self._get({"since": "2026-03-01T09:00:00", "limit": 2}, messages=self._messages(3))
+
+        data = response.json()
+        assert len(data["messages"]) == 2
+        assert data["has_more"] is True
+
+    def test_other_students_refused(self):
+        """Test students cannot read another student's conversation."""
+        response, db = self._get({"since": "2026-03-01T09:00:00"}, owner="student2")
+
+        assert response.status_code == 403
+        db.scalars.assert_not_awaited()
+
+
+class TestKeysetPagination:
+    """Tests for cursor-based pagination of conversation lists."""
+
+    def test_cursor_round_trip(self):
+        """Test a cursor decodes to the sort key it was built from."""
+        from datetime import datetime
+        from uuid import uuid4
+        from app.services.pagination import encode_cursor, decode_cursor
+
+        started_at = datetime(2026, 3, 4, 5, 6, 7, 891011)
+        conversation_id = uuid4()
+        cursor = encode_cursor(started_at, conversation_id)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (started_at, conversation_id)
+
+    def test_invalid_cursor_rejected(self):
+        """Test malformed cursors raise ValueError."""
+        from app.services.pagination import decode_cursor
+
+        for cursor in ["not-a-cursor", "e30", "eyJzIjogMX0"]:
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                decode_cursor(cursor)
+
+    def test_split_page_sets_next_cursor(self):
+        """Test the look-ahead row is dropped and becomes the next cursor."""
+        from datetime import datetime, timedelta
+        from uuid import uuid4
+        from app.services.pagination import split_page, decode_cursor
+
+        now = datetime(2026, 1, 1)
+        rows = [
+            (MagicMock(started_at=now - timedelta(minutes=i), id=uuid4()), f"P{i}")
+            for i in range(3)
+        ]
+
+        page, cursor = split_page(rows, 2, key=lambda r: r[0])
+        assert page == rows[:2]
+        assert decode_cursor(cursor) == (rows[1][0].started_at, rows[1][0].id)
+
+        page, cursor = split_page(rows, 3, key=lambda r: r[0])
+        assert page == rows
+        assert cursor is None
+
+    def test_paginated_query_seeks_past_cursor(self):
+        """Test the query seeks on (started_at, id) instead of using OFFSET."""
+        from datetime import datetime
+        from uuid import uuid4
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from app.models.conversation import Conversation
+        from app.services.pagination import encode_cursor, paginate_conversations
+
+        cursor = encode_cursor(datetime(2026, 1, 1), uuid4())
+        query = paginate_conversations(select(Conversation), cursor, 20)
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        assert "(conversations.started_at, conversations.id) <" in sql
+        assert "ORDER BY conversations.started_at DESC, conversations.id DESC" in sql
+        assert "OFFSET" not in sql
+
+    def test_list_conversations_bad_cursor(self):
+        """Test the endpoint rejects a malformed cursor."""
+        response = client.get("/api/v1/conversations?user_key=student1&cursor=garbage")
+        assert response.status_code == 400
+
+    def test_list_conversations_bad_status_filter(self):
+        """Test unknown status filters are rejected."""
+        response = client.get("/api/v1/conversations?user_key=student1&status=bogus")
+        assert response.status_code == 422
+
+
 class TestConversationEngine:
     """Tests for conversation engine logic."""
 
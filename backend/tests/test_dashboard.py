@@ -0,0 +1,271 @@
+"""Tests for dashboard endpoints."""
+
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from fastapi import Response
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.routers import dashboard
+from app.routers.auth import CurrentUser
+
+client = TestClient(app)
+
+
+class FakeSession:
+    """Returns canned rows per query and records the statements."""
+
+    def __init__(self, scalars=(), ones=(), alls=()):
+        self.scalars = list(scalars)
+        self.ones = list(ones)
+        self.alls = list(alls)
+        self.statements = []
+
+    async def scalar(self, query):
+        self.statements.append(query)
+        return self.scalars.pop(0)
+
+    async def execute(self, query):
+        self.statements.append(query)
+        result = MagicMock()
+        result.one.side_effect = lambda: self.ones.pop(0)
+        result.all.side_effect = lambda: self.alls.pop(0)
+        return result
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+class TestInstructorDashboard:
+    """Tests for the aggregated instructor dashboard."""
+
+    def test_requires_instructor(self):
+        """Test that students cannot load the instructor dashboard."""
+        response = client.get("/api/v1/dashboard/instructor?user_key=student1")
+        assert response.status_code == 403
+
+    def test_class_stats_from_aggregates(self):
+        """Test class stats are built from aggregate rows only."""
+        db = FakeSession(
+            scalars=[120],
+            ones=[(900, 45), (600, Decimal("74.25"), 50, 150, 200, 120, 80)],
+            alls=[[("handling_objections", 40), ("custom_criterion", 12)]],
+        )
+
+        stats = asyncio.run(dashboard._class_stats(db, datetime(2026, 1, 1)))
+
+        assert stats.total_students == 120
+        assert stats.active_students == 45
+        assert stats.total_conversations == 900
+        assert stats.total_graded == 600
+        assert stats.average_score == 74.2
+        assert stats.score_distribution == {
+            "90-100": 50, "80-89": 150, "70-79": 200, "60-69": 120, "Below 60": 80,
+        }
+        assert stats.common_struggles == ["Handling objections", "custom_criterion"]
+
+        # Everything is grouped in SQL; no statement selects whole rows
+        sql = [_sql(q) for q in db.statements]
+        assert all("count(" in s or "avg(" in s for s in sql)
+        assert "jsonb_each(grades.criteria_scores)" in sql[-1]
+        assert "GROUP BY criteria.key" in sql[-1]
+
+    def test_class_stats_empty_class(self):
+        """Test an empty class has no average or struggles."""
+        db = FakeSession(
+            scalars=[0],
+            ones=[(0, 0), (0, None, 0, 0, 0, 0, 0)],
+            alls=[[]],
+        )
+
+        stats = asyncio.run(dashboard._class_stats(db, datetime(2026, 1, 1)))
+
+        assert stats.average_score is None
+        assert stats.common_struggles == []
+
+    def test_student_summaries_grouped(self):
+        """Test student summaries come from one grouped, pre-sorted query."""
+        student_id = uuid4()
+        db = FakeSession(alls=[[
+            (student_id, "Ada", "ada@example.com", 3, Decimal("55.50"), datetime(2026, 1, 5), True),
+            (uuid4(), "Bo", "bo@example.com", 0, None, None, True),
+        ]])
+
+        summaries = asyncio.run(dashboard._student_summaries(db, datetime(2026, 1, 1)))
+
+        assert [s.name for s in summaries] == ["Ada", "Bo"]
+        assert summaries[0].id == student_id
+        assert summaries[0].average_score == 55.5
+        assert summaries[1].average_score is None
+        assert summaries[1].last_active is None
+
+        assert len(db.statements) == 1
+        sql = _sql(db.statements[0])
+        assert "GROUP BY users.id" in sql
+        assert "ORDER BY coalesce(" in sql
+
+
+class TestAnalyticsRollup:
+    """Tests for the daily analytics rollup and trends endpoint."""
+
+    def test_trends_requires_instructor(self):
+        """Test that students cannot load trends."""
+        response = client.get("/api/v1/dashboard/trends?user_key=student1")
+        assert response.status_code == 403
+
+    def test_merge_struggles(self):
+        """Test struggle counts are summed across rows and ranked."""
+        from app.services.analytics_rollup import merge_struggles
+
+        merged = merge_struggles([
+            [{"criterion": "a", "count": 2}, {"criterion": "b", "count": 5}],
+            None,
+            [{"criterion": "a", "count": 4}, {"criterion": "c", "count": 1}],
+        ], limit=2)
+
+        assert merged == [{"criterion": "a", "count": 6}, {"criterion": "b", "count": 5}]
+
+    def test_trends_fill_days_and_weight_averages(self):
+        """Test trend points cover every day and combine courses."""
+        from datetime import date, timedelta
+        from unittest.mock import patch
+
+        today = date(2026, 3, 10)
+        rows = [
+            MagicMock(date=today, total_conversations=4, total_practice=3, total_graded=1,
+                      total_scored=3, avg_score=Decimal("80.00"),
+                      common_struggles=[{"criterion": "a", "count": 2}]),
+            MagicMock(date=today, total_conversations=2, total_practice=2, total_graded=0,
+                      total_scored=1, avg_score=Decimal("60.00"),
+                      common_struggles=[{"criterion": "a", "count": 1}]),
+        ]
+        db = MagicMock()
+        db.scalars = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=rows)))
+        db.scalar = AsyncMock(return_value=None)
+
+        with patch.object(dashboard, "trend_window", return_value=today - timedelta(days=2)):
+            result = asyncio.run(dashboard.get_trends(
+                request=MagicMock(headers={}), response=Response(),
+                db=db, user=CurrentUser(uuid4(), "i@example.com", "Instructor", "instructor"),
+                days=3,
+            ))
+
+        assert [p.date for p in result.points] == [today - timedelta(days=2), today - timedelta(days=1), today]
+        assert result.points[0].total_conversations == 0
+        assert result.points[0].average_score is None
+        last = result.points[-1]
+        assert last.total_conversations == 6
+        assert last.average_score == 75.0
+        assert last.common_struggles[0].count == 3
+
+    def test_rollup_advances_watermark(self):
+        """Test a run with nothing touched still moves the watermark."""
+        from datetime import timedelta
+        from app.models.analytics import RollupState
+        from app.services.analytics_rollup import run_rollup
+
+        state = RollupState(name="daily_analytics", watermark=datetime(2026, 1, 1))
+        db = MagicMock()
+        db.get = AsyncMock(return_value=state)
+        db.scalar = AsyncMock(return_value=0)
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+
+        result = asyncio.run(run_rollup(db, overlap=timedelta(minutes=10)))
+
+        assert result.since == datetime(2026, 1, 1)
+        assert result.days == 0
+        db.execute.assert_not_called()
+        db.commit.assert_awaited_once()
+        assert state.watermark > datetime(2026, 1, 1)
+        assert state.last_run_at - state.watermark == timedelta(minutes=10)
+
+    def test_rollup_limits_work_to_touched_days(self):
+        """Test the rollup queries filter on changes since the watermark."""
+        from app.services.analytics_rollup import _touched_days
+
+        sql = _sql(_touched_days(datetime(2026, 1, 1)))
+        assert "conversations.started_at >=" in sql
+        assert "grades.graded_at >=" in sql
+        assert "UNION" in sql
+        assert "rollup_touched_days.touched_at >=" in sql
+
+    def test_deleted_grade_marks_day(self):
+        """Test deleting a grade marks its conversation's day for the rollup."""
+        from app.services.analytics_rollup import touch_day
+
+        db = MagicMock()
+        db.execute = AsyncMock()
+        conversation = MagicMock(started_at=datetime(2026, 3, 2, 23, 30))
+
+        asyncio.run(touch_day(db, conversation))
+
+        stmt = db.execute.await_args.args[0]
+        assert "INSERT INTO rollup_touched_days" in _sql(stmt)
+        assert "ON CONFLICT (date) DO UPDATE" in _sql(stmt)
+        assert stmt.compile().params["date"] == date(2026, 3, 2)
+
+    def test_rollup_rebuilds_touched_rows(self):
+        """Test touched days' rows are replaced and processed marks pruned."""
+        from datetime import timedelta
+        from app.models.analytics import RollupState
+        from app.services.analytics_rollup import run_rollup
+
+        state = RollupState(name="daily_analytics", watermark=datetime(2026, 1, 1))
+        db = MagicMock()
+        db.get = AsyncMock(return_value=state)
+        db.scalar = AsyncMock(return_value=1)
+        db.execute = AsyncMock(return_value=MagicMock(rowcount=0, all=MagicMock(return_value=[])))
+        db.commit = AsyncMock()
+
+        asyncio.run(run_rollup(db, overlap=timedelta(minutes=10)))
+
+        statements = [_sql(call.args[0]) for call in db.execute.await_args_list]
+        assert statements[0].startswith("DELETE FROM daily_analytics")
+        assert statements[-1].startswith("DELETE FROM rollup_touched_days")
+
+
+class TestStudentDashboard:
+    """Tests for building the cached student dashboard."""
+
+    def test_built_from_one_query(self):
+        """Test stats, recent activity and progress come from one query."""
+        from datetime import timedelta
+        from unittest.mock import patch
+        from app.models.conversation import ConversationMode, ConversationStatus
+
+        start = datetime(2026, 2, 1)
+        convs = [
+            MagicMock(
+                id=uuid4(), mode=ConversationMode.PRACTICE, status=ConversationStatus.COMPLETED,
+                started_at=start + timedelta(days=i), completed_at=start + timedelta(days=i, hours=1),
+            )
+            for i in range(3)
+        ]
+        convs.append(MagicMock(
+            id=uuid4(), mode=ConversationMode.GRADED, status=ConversationStatus.IN_PROGRESS,
+            started_at=start + timedelta(days=5), completed_at=None,
+        ))
+        scores = [Decimal("60"), Decimal("80"), None, None]
+        db = FakeSession(alls=[list(zip(convs, scores))])
+        persona = MagicMock()
+        persona.name = "Dana"
+
+        with patch.object(dashboard.catalog_cache, "get", AsyncMock(return_value=persona)):
+            result = asyncio.run(dashboard._build_student_dashboard(db, uuid4()))
+
+        assert len(db.statements) == 1
+        assert result.stats.total_conversations == 4
+        assert result.stats.completed_conversations == 3
+        assert result.stats.graded_sessions == 1
+        assert result.stats.average_score == 70.0
+        assert result.stats.total_improvement == 20.0
+        assert [r.id for r in result.recent_conversations] == [c.id for c in reversed(convs)]
+        assert [p.score for p in result.progress_history] == [60.0, 80.0]
+        assert result.progress_history[0].persona_name == "Dana"
@@ -0,0 +1,223 @@
+"""Tests for the per-student dashboard cache."""
+
+import asyncio
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.services import dashboard_cache as cache_module
+from app.services.dashboard_cache import StudentDashboardCache
+from app.services.metrics import metrics
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.ops.append(("incr", key))
+
+    def delete(self, key):
+        self.ops.append(("delete", key))
+
+    async def execute(self):
+        for op, key in self.ops:
+            if op == "incr":
+                await self.redis.incr(key)
+            else:
+                self.redis.data.pop(key, None)
+
+
+class FakeRedis:
+    """Just enough of the async Redis API for the dashboard cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, *keys):
+        return [self.data.get(k) for k in keys]
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(cache_module, "get_redis", return_value=fake):
+        metrics.reset()
+        yield fake
+
+
+class Builder:
+    """Counts rebuilds and can be slowed down to overlap requests."""
+
+    def __init__(self, delay: float = 0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"build": self.calls}
+
+
+class TestStudentDashboardCache:
+    """Tests for caching, invalidation and single-flight rebuilds."""
+
+    def test_cached_until_invalidated(self, redis):
+        """Test the payload is reused until the student's data changes."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        build = Builder()
+        student = uuid4()
+
+        async def scenario():
+            first = await cache.get_or_build(student, build)
+            second = await cache.get_or_build(student, build)
+            await cache.invalidate(student)
+            third = await cache.get_or_build(student, build)
+            return first, second, third
+
+        assert asyncio.run(scenario()) == ({"build": 1}, {"build": 1}, {"build": 2})
+        assert cache.stats()["hits"] == 1
+
+    def test_invalidation_is_per_student(self, redis):
+        """Test invalidating one student keeps others cached."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        build = Builder()
+        alice, bob = uuid4(), uuid4()
+
+        async def scenario():
+            await cache.get_or_build(alice, build)
+            await cache.get_or_build(bob, build)
+            await cache.invalidate(alice)
+            await cache.get_or_build(bob, build)
+
+        asyncio.run(scenario())
+        assert build.calls == 2
+
+    def test_concurrent_misses_share_one_rebuild(self, redis):
+        """Test simultaneous loads for one student rebuild once."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        build = Builder(delay=0.05)
+        student = uuid4()
+
+        async def scenario():
+            return await asyncio.gather(*[cache.get_or_build(student, build) for _ in range(10)])
+
+        results = asyncio.run(scenario())
+
+        assert build.calls == 1
+        assert all(r == {"build": 1} for r in results)
+        assert cache.stats()["shared_rebuilds"] == 9
+
+    def test_rebuild_racing_invalidation_not_served(self, redis):
+        """Test a payload built before an invalidation is not served after it."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        student = uuid4()
+
+        async def stale_build():
+            # The student's grade changes while the rebuild is reading
+            await cache.invalidate(student)
+            return {"stale": True}
+
+        async def scenario():
+            await cache.get_or_build(student, stale_build)
+            return await cache.get_or_build(student, Builder())
+
+        assert asyncio.run(scenario()) == {"build": 1}
+
+    def test_failed_rebuild_propagates_to_waiters(self, redis):
+        """Test every waiter sees the rebuild error and the next load retries."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        student = uuid4()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        async def scenario():
+            results = await asyncio.gather(
+                cache.get_or_build(student, failing),
+                cache.get_or_build(student, failing),
+                return_exceptions=True,
+            )
+            return results, await cache.get_or_build(student, Builder())
+
+        results, retry = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert retry == {"build": 1}
+
+    def test_builds_without_redis(self):
+        """Test the dashboard is computed directly when Redis is down."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        build = Builder()
+
+        with patch.object(cache_module, "get_redis", return_value=None):
+            asyncio.run(cache.get_or_build(uuid4(), build))
+
+        assert build.calls == 1
+
+    def test_versions_track_invalidations(self, redis):
+        """Test the student and class versions used as ETags move on writes."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        alice, bob = uuid4(), uuid4()
+
+        async def scenario():
+            before = await cache.version(alice), await cache.class_version()
+            await cache.invalidate(bob)
+            after = await cache.version(alice), await cache.class_version()
+            return before, after, await cache.version(bob)
+
+        result = asyncio.run(scenario())
+        epoch = redis.data[cache_module.EPOCH_KEY]
+        assert result == (
+            (f"{epoch}:0", f"{epoch}:0"), (f"{epoch}:0", f"{epoch}:1"), f"{epoch}:1"
+        )
+
+    def test_versions_change_after_redis_reset(self, redis):
+        """Test counters restarting after a flush do not repeat old versions."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+        alice = uuid4()
+
+        async def scenario():
+            await cache.invalidate(alice)
+            before = await cache.version(alice), await cache.class_version()
+            redis.data.clear()
+            await cache.invalidate(alice)
+            after = await cache.version(alice), await cache.class_version()
+            return before, after
+
+        before, after = asyncio.run(scenario())
+        assert before[0].endswith(":1") and after[0].endswith(":1")
+        assert before[0] != after[0]
+        assert before[1] != after[1]
+
+    def test_no_version_without_redis(self):
+        """Test versions are unknown, not zero, when Redis is down."""
+        cache = StudentDashboardCache(ttl_seconds=60)
+
+        with patch.object(cache_module, "get_redis", return_value=None):
+            assert asyncio.run(cache.version(uuid4())) is None
+            assert asyncio.run(cache.class_version()) is None
@@ -0,0 +1,61 @@
+"""Tests for the instrumented connection pool."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.database import InstrumentedPool, async_engine
+
+
+def _in_greenlet(fn):
+    """Run ``fn`` the way the async engine calls the pool."""
+    return asyncio.run(greenlet_spawn(fn))
+
+
+class TestInstrumentedPool:
+    """Tests for pool checkout statistics."""
+
+    def test_api_engine_uses_instrumented_pool(self):
+        """Test the API engine's pool reports stats."""
+        assert isinstance(async_engine.pool, InstrumentedPool)
+        assert async_engine.pool.stats()["size"] > 0
+
+    def test_counts_checkouts_and_saturation(self):
+        """Test checkouts are counted and saturation follows occupancy."""
+        pool = InstrumentedPool(MagicMock, pool_size=2, max_overflow=0)
+
+        def check_out_two():
+            first, second = pool.connect(), pool.connect()
+            stats = pool.stats()
+            first.close()
+            second.close()
+            return stats
+
+        stats = _in_greenlet(check_out_two)
+
+        assert stats["checkouts"] == 2
+        assert stats["checked_out"] == 2
+        assert stats["saturation"] == 1.0
+        assert pool.stats()["saturation"] == 0.0
+        assert pool.stats()["peak_checked_out"] == 2
+
+    def test_counts_timeouts(self):
+        """Test a checkout on an exhausted pool is recorded as a timeout."""
+        pool = InstrumentedPool(MagicMock, pool_size=1, max_overflow=0, timeout=0.05)
+
+        def exhaust():
+            held = pool.connect()
+            try:
+                with pytest.raises(exc.TimeoutError):
+                    pool.connect()
+            finally:
+                held.close()
+
+        _in_greenlet(exhaust)
+
+        stats = pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["checkouts"] == 1
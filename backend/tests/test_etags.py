@@ -0,0 +1,160 @@
+"""Tests for version-based ETags and conditional GETs."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.main import app
+from app.models.conversation import ConversationMode, ConversationStatus
+from app.routers.auth import MOCK_USERS
+from app.services import etags
+from app.services.etags import etag_matches, make_etag
+from app.services.metrics import metrics
+
+client = TestClient(app)
+
+
+class TestEtagMatching:
+    """Tests for If-None-Match comparison."""
+
+    def test_same_parts_same_tag(self):
+        """Test tags depend only on the version parts."""
+        assert make_etag("a", 1) == make_etag("a", 1)
+        assert make_etag("a", 1) != make_etag("a", 2)
+
+    def test_weak_comparison(self):
+        """Test weak and strong forms of a tag match each other."""
+        etag = make_etag("a", 1)
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag[2:], etag)
+
+    def test_tag_lists_and_wildcard(self):
+        """Test any tag in a list matches, and * matches everything."""
+        etag = make_etag("a", 1)
+        assert etag_matches(f'W/"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('W/"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+@pytest.fixture
+def counters():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestConversationPolling:
+    """Tests for conditional GETs of a conversation."""
+
+    def _conversation(self, turn_count=2):
+        return MagicMock(
+            id=uuid4(),
+            user_id=UUID(MOCK_USERS["student1"]["id"]),
+            scenario_id=uuid4(),
+            mode=ConversationMode.PRACTICE,
+            status=ConversationStatus.IN_PROGRESS,
+            context="Quarterly review of the pilot",
+            turn_count=turn_count,
+            started_at=datetime(2026, 3, 1, 9, 0),
+            completed_at=None,
+        )
+
+    def _get(self, conversation, headers=None):
+        db = MagicMock()
+        db.get = AsyncMock(return_value=conversation)
+        db.scalars = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+        persona = MagicMock(title="VP Sales")
+        persona.name = "Dana"
+        app.dependency_overrides[get_db] = lambda: db
+        try:
+            with patch(
+                "app.routers.conversations.catalog_cache.get",
+                AsyncMock(return_value=persona),
+            ):
+                response = client.get(
+                    f"/api/v1/conversations/{conversation.id}?user_key=student1",
+                    headers=headers or {},
+                )
+        finally:
+            app.dependency_overrides.clear()
+        return response, db
+
+    def test_unchanged_poll_is_304_without_transcript_read(self, counters):
+        """Test a matching poll skips the message query."""
+        conversation = self._conversation()
+        first, _ = self._get(conversation)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second, db = self._get(conversation, {"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        db.scalars.assert_not_awaited()
+        assert etags.stats()["conversation"] == {
+            "requests": 2,
+            "not_modified": 1,
+            "not_modified_ratio": 0.5,
+        }
+
+    def test_new_turn_changes_tag(self, counters):
+        """Test a poll after a new message gets the full response."""
+        conversation = self._conversation()
+        etag = self._get(conversation)[0].headers["etag"]
+
+        conversation.turn_count += 1
+        response, db = self._get(conversation, {"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        db.scalars.assert_awaited_once()
+
+
+class TestStudentDashboardPolling:
+    """Tests for conditional GETs of the student dashboard."""
+
+    def test_version_match_skips_cache_read(self, counters):
+        """Test a matching poll never touches the dashboard payload."""
+        cache = "app.routers.dashboard.student_dashboard_cache"
+        student = UUID(MOCK_USERS["student1"]["id"])
+        etag = make_etag(student, 3)
+
+        with patch(f"{cache}.version", AsyncMock(return_value=3)), patch(
+            f"{cache}.get_or_build", AsyncMock()
+        ) as get_or_build:
+            response = client.get(
+                "/api/v1/dashboard/student?user_key=student1",
+                headers={"If-None-Match": etag},
+            )
+
+        assert response.status_code == 304
+        get_or_build.assert_not_awaited()
+
+    def test_no_tag_without_version(self, counters):
+        """Test no ETag is sent when Redis cannot supply a version."""
+        cache = "app.routers.dashboard.student_dashboard_cache"
+        payload = {
+            "stats": {
+                "total_conversations": 0,
+                "completed_conversations": 0,
+                "practice_sessions": 0,
+                "graded_sessions": 0,
+                "average_score": None,
+                "total_improvement": None,
+            },
+            "recent_conversations": [],
+            "progress_history": [],
+        }
+
+        with patch(f"{cache}.version", AsyncMock(return_value=None)), patch(
+            f"{cache}.get_or_build", AsyncMock(return_value=payload)
+        ):
+            response = client.get("/api/v1/dashboard/student?user_key=student1")
+
+        assert response.status_code == 200
+        assert "etag" not in response.headers
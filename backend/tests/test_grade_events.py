@@ -0,0 +1,230 @@
+"""Tests for grade-ready events over Redis pub/sub and server-sent events."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.main import app
+from app.models.conversation import ConversationStatus
+from app.models.grade import Grade
+from app.routers import grades
+from app.routers.auth import MOCK_USERS
+from app.services import grade_events
+from app.services.grade_events import GradeEvent, GradeEventSubscription
+
+client = TestClient(app)
+
+STUDENT_ID = UUID(MOCK_USERS["student1"]["id"])
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.channels = set()
+        self.queue = []
+        self.closed = False
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+        self.redis.subscribers.append(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        if self.queue:
+            return self.queue.pop(0)
+        await asyncio.sleep(0)
+        return None
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, payload):
+        self.commands.append((channel, payload))
+
+    async def execute(self):
+        for channel, payload in self.commands:
+            self.redis.published.append((channel, payload))
+            for sub in self.redis.subscribers:
+                if channel in sub.channels:
+                    sub.queue.append({"type": "message", "channel": channel, "data": payload})
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published = []
+        self.subscribers = []
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(grade_events, "get_redis", return_value=fake):
+        yield fake
+
+
+def _grade(conversation_id: UUID) -> Grade:
+    return Grade(id=uuid4(), conversation_id=conversation_id, total_score=82, ai_confidence=0.9, feature_anomaly=False)
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    """Parse (event, data) pairs out of an SSE body."""
+    events = []
+    for frame in body.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line)
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestPublish:
+    """Tests for publishing grade events."""
+
+    def test_published_to_conversation_and_student(self, redis):
+        """Test one event reaches both the conversation and student channels."""
+        conversation_id = uuid4()
+        asyncio.run(grade_events.publish(GradeEvent.completed(_grade(conversation_id), STUDENT_ID)))
+
+        channels = [channel for channel, _ in redis.published]
+        assert channels == [
+            f"grade-events:conversation:{conversation_id}",
+            f"grade-events:user:{STUDENT_ID}",
+        ]
+        assert json.loads(redis.published[0][1])["total_score"] == 82
+
+    def test_publish_without_redis(self):
+        """Test grading is unaffected when Redis is unavailable."""
+        with patch.object(grade_events, "get_redis", return_value=None):
+            asyncio.run(grade_events.publish(GradeEvent.completed(_grade(uuid4()), STUDENT_ID)))
+
+    def test_keepalive_when_idle(self, redis):
+        """Test an idle subscription yields keepalives until its deadline."""
+
+        async def collect():
+            subscription = await GradeEventSubscription.open("grade-events:user:x")
+            return [e async for e in subscription.events(heartbeat_seconds=0, max_seconds=0.01)]
+
+        events = asyncio.run(collect())
+        assert events and all(e is None for e in events)
+
+
+class TestPerformGradingPublishes:
+    """Tests for events sent when grading finishes."""
+
+    def _db(self, conversation_id):
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=MagicMock(
+            id=conversation_id, user_id=STUDENT_ID, status=ConversationStatus.COMPLETED,
+        ))
+        return db
+
+    def test_completed(self, redis):
+        """Test a stored grade is announced."""
+        conversation_id = uuid4()
+        grade = _grade(conversation_id)
+        with patch.object(grades, "_grade_conversation", AsyncMock(return_value=grade)):
+            asyncio.run(grades._perform_grading(conversation_id, self._db(conversation_id)))
+
+        event = json.loads(redis.published[0][1])
+        assert event["type"] == "grade.completed"
+        assert event["grade_id"] == str(grade.id)
+
+    def test_failed(self, redis):
+        """Test a grading error is announced and still raised."""
+        conversation_id = uuid4()
+        with patch.object(
+            grades, "_grade_conversation", AsyncMock(side_effect=RuntimeError("LLM timeout"))
+        ), pytest.raises(RuntimeError):
+            asyncio.run(grades._perform_grading(conversation_id, self._db(conversation_id)))
+
+        event = json.loads(redis.published[0][1])
+        assert event["type"] == "grade.failed"
+        assert event["error"] == "LLM timeout"
+
+
+class TestGradeEventStream:
+    """Tests for the server-sent event endpoints."""
+
+    def _get(self, path, db):
+        app.dependency_overrides[get_db] = lambda: db
+        try:
+            return client.get(path)
+        finally:
+            app.dependency_overrides.clear()
+
+    def _db(self, *results):
+        db = MagicMock()
+        db.scalar = AsyncMock(side_effect=list(results))
+        db.close = AsyncMock()
+        return db
+
+    def test_existing_grade_sent_at_once(self, redis):
+        """Test a client arriving after grading gets the grade immediately."""
+        conversation_id = uuid4()
+        response = self._get(
+            f"/api/v1/grades/conversations/{conversation_id}/events?user_key=student1",
+            self._db(STUDENT_ID, _grade(conversation_id)),
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert _events(response.text)[0][0] == "grade.completed"
+        assert redis.subscribers[0].closed
+
+    def test_waits_for_grade_event(self, redis):
+        """Test the stream delivers the next event for the conversation and closes."""
+        conversation_id = uuid4()
+        grade = _grade(conversation_id)
+
+        async def grade_arrives(db):
+            # Grading finishes on another worker after the subscription opened
+            await grade_events.publish(GradeEvent.completed(grade, STUDENT_ID))
+
+        with patch.object(grades, "release_connection", AsyncMock(side_effect=grade_arrives)):
+            response = self._get(
+                f"/api/v1/grades/conversations/{conversation_id}/events?user_key=student1",
+                self._db(STUDENT_ID, None),
+            )
+
+        events = _events(response.text)
+        assert [name for name, _ in events] == ["grade.completed"]
+        assert events[0][1]["grade_id"] == str(grade.id)
+
+    def test_other_students_refused(self, redis):
+        """Test students cannot wait on another student's grade."""
+        response = self._get(
+            f"/api/v1/grades/conversations/{uuid4()}/events?user_key=student1",
+            self._db(uuid4()),
+        )
+        assert response.status_code == 403
+        assert not redis.subscribers
+
+    def test_unavailable_without_redis(self):
+        """Test clients are told to poll when events cannot be delivered."""
+        with patch.object(grade_events, "get_redis", return_value=None):
+            response = self._get(
+                f"/api/v1/grades/conversations/{uuid4()}/events?user_key=student1",
+                self._db(STUDENT_ID),
+            )
+        assert response.status_code == 503
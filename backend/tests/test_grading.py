@@ -51,6 +51,47 @@ class TestGradingEndpoints:
         )
         assert response.status_code == 403
 
+    def test_grading_metrics_requires_instructor(self):
+        """Test that grading metrics require instructor role."""
+        response = client.get("/api/v1/grades/metrics?user_key=student1")
+        assert response.status_code == 403
+
+    def test_grading_metrics_reports_modes(self):
+        """Test that grading metrics report both output modes."""
+        response = client.get("/api/v1/grades/metrics?user_key=instructor")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"json", "tool"}
+        assert "retry_rate" in data["tool"]
+
+    def test_update_rubric_requires_instructor(self):
+        """Test that editing a rubric requires instructor role."""
+        fake_id = "00000000-0000-0000-0000-000000000000"
+        response = client.put(
+            f"/api/v1/grades/rubrics/{fake_id}?user_key=student1",
+            json={
+                "criteria": [{
+                    "name": "clarity",
+                    "display_name": "Clarity",
+                    "description": "Clear explanation",
+                    "max_points": 100,
+                    "scoring_guide": {"100": "Clear"},
+                }],
+            },
+        )
+        assert response.status_code == 403
+
+    def test_regrade_plan_requires_instructor(self):
+        """Test that regrade planning requires instructor role."""
+        response = client.get("/api/v1/grades/regrade-plan?user_key=student1")
+        assert response.status_code == 403
+
+    def test_regrade_progress_idle(self):
+        """Test regrade progress before any run."""
+        response = client.get("/api/v1/grades/regrade-plan/progress?user_key=instructor")
+        assert response.status_code == 200
+        assert response.json()["status"] in ["idle", "running", "completed"]
+
     def test_needs_review_accessible_to_instructor(self):
         """Test that instructor can access needs-review."""
         response = client.get(
@@ -222,3 +263,582 @@ class TestGradingEngine:
         assert grade.total_score == Decimal("80")
         assert grade.graded_by == GradedBy.AI
         assert grade.instructor_override == False
+
+
+class TestProgressiveGrading:
+    """Tests for the running evidence ledger."""
+
+    def _make_rubric(self):
+        from app.models.rubric import Rubric
+
+        rubric = MagicMock(spec=Rubric)
+        rubric.criteria = [
+            {"name": "clarity", "display_name": "Clarity", "max_points": 50},
+            {"name": "honesty", "display_name": "Honesty", "max_points": 50},
+        ]
+        rubric.total_points = 100
+        return rubric
+
+    def _make_message(self, role, content):
+        from app.models.conversation import MessageRole
+
+        msg = MagicMock()
+        msg.role = MessageRole.STUDENT if role == "student" else MessageRole.STAKEHOLDER
+        msg.content = content
+        return msg
+
+    def test_parse_ledger_response_keeps_previous_entries(self):
+        """Criteria missing from the update keep their previous ledger entry."""
+        from app.services.grading_engine import GradingEngine
+
+        engine = GradingEngine(self._make_rubric())
+        previous = {"honesty": {"evidence": ["[Turn 2] Admitted bias"], "provisional_score": 40}}
+        response = '''```json
+        {
+            "clarity": {"evidence": "[Turn 3] Clear summary", "provisional_score": 35},
+            "unknown_criterion": {"evidence": [], "provisional_score": 1}
+        }
+        ```'''
+
+        ledger = engine._parse_ledger_response(response, previous)
+
+        assert ledger["clarity"]["evidence"] == ["[Turn 3] Clear summary"]
+        assert ledger["clarity"]["provisional_score"] == 35
+        assert ledger["honesty"] == previous["honesty"]
+        assert "unknown_criterion" not in ledger
+
+    def test_parse_ledger_response_invalid_json(self):
+        """Unparseable ledger updates raise ValueError."""
+        from app.services.grading_engine import GradingEngine
+
+        engine = GradingEngine(self._make_rubric())
+
+        with pytest.raises(ValueError, match="Failed to parse ledger"):
+            engine._parse_ledger_response("not json", {})
+
+    def test_reconcile_prompt_includes_only_remaining_turns(self):
+        """The reconcile prompt sends the ledger plus turns it does not cover."""
+        from app.services.grading_engine import GradingEngine
+        from app.models.conversation import Conversation
+
+        engine = GradingEngine(self._make_rubric(), output_mode="json")
+
+        conversation = MagicMock(spec=Conversation)
+        conversation.context = "Churn model"
+        conversation.turn_count = 3
+        conversation.messages = [
+            self._make_message("stakeholder", "Early greeting"),
+            self._make_message("student", "Early pitch"),
+            self._make_message("stakeholder", "Late question"),
+            self._make_message("student", "Late answer"),
+        ]
+        conversation.grading_ledger = {
+            "clarity": {"evidence": ["[Turn 2] Clear pitch"], "provisional_score": 40},
+            "honesty": {"evidence": [], "provisional_score": 30},
+        }
+        conversation.ledger_message_count = 2
+
+        persona = MagicMock()
+        persona.name = "Pat"
+        persona.title = "VP"
+        persona.background = None
+
+        assert engine._has_usable_ledger(conversation)
+        prompt = engine._build_reconcile_prompt(conversation, persona)
+
+        assert "Early pitch" not in prompt
+        assert "[Turn 3] Stakeholder:" in prompt
+        assert "Late answer" in prompt
+        assert "[Turn 2] Clear pitch" in prompt
+        assert '"criteria_scores"' in prompt
+
+    def test_ledger_missing_criteria_is_not_usable(self):
+        """A ledger that does not cover every criterion falls back to full grading."""
+        from app.services.grading_engine import GradingEngine
+        from app.models.conversation import Conversation
+
+        engine = GradingEngine(self._make_rubric())
+
+        conversation = MagicMock(spec=Conversation)
+        conversation.grading_ledger = {"clarity": {"evidence": [], "provisional_score": 10}}
+        conversation.ledger_message_count = 4
+
+        assert not engine._has_usable_ledger(conversation)
+
+
+class TestGradeParser:
+    """Tests for the tolerant streaming grade parser."""
+
+    CRITERIA = [
+        {"name": "clarity", "display_name": "Clarity", "max_points": 50},
+        {"name": "honesty", "display_name": "Honesty", "max_points": 50},
+    ]
+
+    def test_repairs_trailing_commas_and_unescaped_quotes(self):
+        """Common JSON defects are repaired before parsing."""
+        from app.services.grade_parser import loads_tolerant
+
+        data = loads_tolerant(
+            '{"evidence": "Student said "we save $2M", then paused", "items": [1, 2,],}'
+        )
+
+        assert data["evidence"] == 'Student said "we save $2M", then paused'
+        assert data["items"] == [1, 2]
+
+    def test_truncated_response_keeps_complete_values(self):
+        """Truncated output is cut back to the last complete value."""
+        from app.services.grade_parser import loads_tolerant
+
+        data = loads_tolerant('{"total_score": 70, "overall_feedback": "Good wo')
+
+        assert data == {"total_score": 70}
+
+    def test_validates_criteria_while_streaming(self):
+        """Criteria are validated against the rubric as chunks arrive."""
+        from app.services.grade_parser import StreamingGradeParser
+
+        parser = StreamingGradeParser(self.CRITERIA)
+        response = (
+            '{"criteria_scores": {"clarity": {"score": 40, "max_score": 50, '
+            '"evidence": "Clear", "feedback": "Good"}, "honesty": {"score": 80, '
+            '"max_score": 50, "evidence": "Hid bias", "feedback": "Be upfront"}}, '
+            '"total_score": 120, "overall_feedback": "Ok", "strengths": [], '
+            '"areas_for_improvement": [], "confid'
+        )
+
+        validated = []
+        for i in range(0, len(response), 20):
+            validated.extend(parser.feed(response[i:i + 20]))
+        parser.finish()
+
+        assert validated == ["clarity"]
+        assert "score must be between 0 and 50" in parser.errors["honesty"]
+        assert parser.missing_fields() == ["confidence", "criteria_scores.honesty"]
+
+    def test_chunk_ending_on_inner_quote_does_not_close_string(self):
+        """A quote at the end of a chunk is not taken as the end of the evidence."""
+        from app.services.grade_parser import StreamingGradeParser
+
+        parser = StreamingGradeParser(self.CRITERIA)
+        chunks = [
+            '{"criteria_scores": {"clarity": {"score": 40, "evidence": "Clear", '
+            '"feedback": "Good"}, "honesty": {"score": 30, "feedback": "Be direct", '
+            '"evidence": "Student said "',
+            'we are 90% sure", then hedged"}}}',
+        ]
+
+        validated = [name for chunk in chunks for name in parser.feed(chunk)]
+        result = parser.finish()
+
+        assert validated == ["clarity", "honesty"]
+        assert result["criteria_scores"]["honesty"]["evidence"] == (
+            'Student said "we are 90% sure", then hedged'
+        )
+
+    def test_merge_fills_missing_fields(self):
+        """A continuation response completes the grade."""
+        from app.services.grade_parser import StreamingGradeParser
+
+        parser = StreamingGradeParser(self.CRITERIA)
+        parser.feed(
+            '{"criteria_scores": {"Clarity": {"score": 40, "evidence": "Clear", '
+            '"feedback": "Good"}}, "overall_feedback": "Ok", "strengths": [], '
+            '"areas_for_improvement": []}'
+        )
+        parser.finish()
+        parser.merge({
+            "criteria_scores": {
+                "honesty": {"score": 30, "evidence": "Hedged", "feedback": "Be direct"}
+            },
+            "confidence": 0.8,
+        })
+
+        result = parser.result()
+        assert parser.missing_fields() == []
+        assert result["total_score"] == 70
+        assert result["criteria_scores"]["clarity"]["max_score"] == 50
+
+    def test_grade_conversation_requests_only_missing_fields(self):
+        """The engine asks the model to continue instead of regrading."""
+        import asyncio
+        from app.services.grading_engine import GradingEngine
+        from app.models.rubric import Rubric
+
+        rubric = MagicMock(spec=Rubric)
+        rubric.criteria = self.CRITERIA
+        rubric.total_points = 100
+
+        async def stream(**kwargs):
+            yield (
+                '{"criteria_scores": {"clarity": {"score": 40, "max_score": 50, '
+                '"evidence": "Clear", "feedback": "Good"}, "honesty": {"score": 3'
+            )
+
+        llm_client = MagicMock()
+        llm_client.stream_json_response = stream
+        llm_client.generate_json_response = AsyncMock(return_value='''{
+            "criteria_scores": {"honesty": {"score": 30, "max_score": 50,
+                "evidence": "Hedged", "feedback": "Be direct"}},
+            "total_score": 70, "overall_feedback": "Ok", "strengths": [],
+            "areas_for_improvement": [], "confidence": 0.8
+        }''')
+
+        engine = GradingEngine(rubric, llm_client=llm_client, output_mode="json")
+        engine._build_grading_prompt = MagicMock(return_value="grade this")
+        conversation = MagicMock(grading_ledger=None, ledger_message_count=0)
+        conversation.messages = [MagicMock()]
+
+        result = asyncio.run(engine.grade_conversation(conversation, MagicMock()))
+
+        assert result["total_score"] == 70
+        assert result["criteria_scores"]["honesty"]["score"] == 30
+        continuation = llm_client.generate_json_response.call_args.kwargs["messages"][-1]
+        assert "criteria_scores.honesty" in continuation["content"]
+        assert "criteria_scores.clarity" not in continuation["content"]
+
+
+class TestStructuredGrading:
+    """Tests for schema-enforced grading via tool use."""
+
+    def _make_rubric(self):
+        from app.models.rubric import Rubric
+
+        rubric = MagicMock(spec=Rubric)
+        rubric.criteria = [
+            {"name": "clarity", "display_name": "Clarity", "max_points": 40},
+            {"name": "honesty", "display_name": "Honesty", "max_points": 60},
+        ]
+        rubric.total_points = 100
+        return rubric
+
+    def test_schema_uses_rubric_names_and_ranges(self):
+        """The schema lists exact criterion names and max_points ranges."""
+        from app.services.grading_engine import GradingEngine
+
+        engine = GradingEngine(self._make_rubric(), output_mode="tool")
+        schema = engine.build_grade_schema()
+
+        criteria = schema["properties"]["criteria_scores"]
+        assert criteria["required"] == ["clarity", "honesty"]
+        assert criteria["additionalProperties"] is False
+        assert criteria["properties"]["honesty"]["properties"]["score"]["maximum"] == 60
+        assert schema["properties"]["total_score"]["maximum"] == 100
+        assert set(schema["required"]) == {
+            "criteria_scores", "total_score", "overall_feedback",
+            "strengths", "areas_for_improvement", "confidence",
+        }
+
+    def test_schema_restricted_to_missing_fields(self):
+        """Continuation schemas only ask for the missing fields."""
+        from app.services.grading_engine import GradingEngine
+
+        engine = GradingEngine(self._make_rubric(), output_mode="tool")
+        schema = engine.build_grade_schema(["confidence", "criteria_scores.honesty"])
+
+        assert schema["required"] == ["confidence", "criteria_scores"]
+        assert list(schema["properties"]["criteria_scores"]["properties"]) == ["honesty"]
+
+    def test_grade_conversation_with_tool(self):
+        """Tool-use grading returns schema-valid data and records metrics."""
+        import asyncio
+        from app.services.grading_engine import GradingEngine
+        from app.services.metrics import metrics
+
+        tool_input = {
+            "criteria_scores": {
+                "clarity": {"score": 30, "max_score": 40, "evidence": "e", "feedback": "f"},
+                "honesty": {"score": 50, "max_score": 60, "evidence": "e", "feedback": "f"},
+            },
+            "total_score": 80,
+            "overall_feedback": "Good",
+            "strengths": ["Clear"],
+            "areas_for_improvement": ["Numbers"],
+            "confidence": 0.9,
+        }
+        llm_client = MagicMock()
+        llm_client.generate_tool_response = AsyncMock(return_value=tool_input)
+
+        engine = GradingEngine(self._make_rubric(), llm_client=llm_client, output_mode="tool")
+        engine._build_grading_prompt = MagicMock(return_value="grade this")
+        conversation = MagicMock(grading_ledger=None, ledger_message_count=0)
+        conversation.messages = [MagicMock()]
+
+        metrics.reset()
+        result = asyncio.run(engine.grade_conversation(conversation, MagicMock()))
+
+        assert result["total_score"] == 80
+        tool = llm_client.generate_tool_response.call_args.kwargs["tool"]
+        assert tool["name"] == "submit_grade"
+        assert metrics.get("grading.tool.requests") == 1
+        assert metrics.get("grading.tool.retries") == 0
+
+
+class TestTranscriptFeatures:
+    """Tests for the local transcript feature extractor."""
+
+    def _make_persona(self):
+        persona = MagicMock()
+        persona.to_prompt_context.return_value = {
+            "name": "Pat",
+            "title": "CFO",
+            "background": "",
+            "personality": "",
+            "concerns": ["Implementation cost and budget"],
+            "required_questions": ["How much money will this save?"],
+        }
+        return persona
+
+    def _make_message(self, role, content):
+        from app.models.conversation import MessageRole
+
+        msg = MagicMock()
+        msg.role = MessageRole.STUDENT if role == "student" else MessageRole.STAKEHOLDER
+        msg.content = content
+        return msg
+
+    def test_extract_features(self):
+        """Features capture jargon, quantified claims, coverage and talk ratio."""
+        from app.services.transcript_features import extract_features
+
+        messages = [
+            self._make_message("stakeholder", "How much money will this save?"),
+            self._make_message(
+                "student",
+                "It will save $2M a year, a 15% cut. The implementation cost fits our budget.",
+            ),
+            self._make_message("stakeholder", "And how accurate is it?"),
+            self._make_message("student", "The XGBoost classifier has high precision and recall."),
+        ]
+
+        features = extract_features(messages, self._make_persona())
+
+        assert features["student_turns"] == 2
+        assert features["jargon_count"] == 4
+        assert features["quantified_claims"] == 1
+        assert features["required_question_coverage"] == 1.0
+        assert features["concern_coverage"] == 1.0
+        assert 0.5 < features["student_talk_ratio"] < 1
+
+    def test_plain_numbers_are_not_quantified_claims(self):
+        """Only amounts with a unit or currency count as quantified claims."""
+        from app.services.transcript_features import _QUANTITY_RE
+
+        for claim in ["It saves $2M", "a 15% cut", "3 hours a week", "1,200 customers",
+                      "about 4.5 million users", "€300 per seat"]:
+            assert _QUANTITY_RE.search(claim), claim
+        for plain in ["I have 2 kids", "see you at 3", "step 1 is cleaning the data",
+                      "the 2nd option", "version 10 of the model"]:
+            assert not _QUANTITY_RE.search(plain), plain
+
+    def test_prediction_rewards_business_framing(self):
+        """Quantified, jargon-free answers predict a higher score."""
+        from app.services.transcript_features import extract_features, predict_score_pct
+
+        persona = self._make_persona()
+        strong = extract_features([
+            self._make_message("stakeholder", "How much money will this save?"),
+            self._make_message("student", "About $500K per year, within the implementation budget."),
+        ], persona)
+        weak = extract_features([
+            self._make_message("stakeholder", "How much money will this save?"),
+            self._make_message("student", "The neural network uses gradient boosting and embedding layers."),
+        ], persona)
+
+        assert predict_score_pct(strong) > predict_score_pct(weak)
+
+    def test_is_anomalous(self):
+        """Scores far from the prediction are flagged."""
+        from app.services.transcript_features import is_anomalous
+
+        assert is_anomalous(95, 50, threshold=25)
+        assert not is_anomalous(70, 60, threshold=25)
+
+
+class FakeRegradeRedis:
+    """Lock and progress keys shared by every "worker" in a test."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if self.data.get(key) != token:
+            return 0
+        if "DEL" in script:
+            del self.data[key]
+        return 1
+
+    def pipeline(self, transaction=True):
+        redis, commands = self, []
+
+        class Pipeline:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def set(self, *args, **kwargs):
+                commands.append(redis.set(*args, **kwargs))
+
+            def eval(self, *args):
+                commands.append(redis.eval(*args))
+
+            async def execute(self):
+                return [await command for command in commands]
+
+        return Pipeline()
+
+
+class TestRegradePlanner:
+    """Tests for regrade plan bookkeeping."""
+
+    def test_one_run_across_workers(self):
+        """Only one worker can start a regrade; every worker sees its progress."""
+        import asyncio
+        from app.services import regrade_planner
+        from app.services.regrade_planner import RegradePlan, RegradeTracker
+
+        fake = FakeRegradeRedis()
+        worker_a, worker_b = RegradeTracker(), RegradeTracker()
+
+        async def scenario():
+            assert await worker_a.acquire()
+            assert not await worker_b.acquire()
+
+            await worker_a.start(RegradePlan(items=[]))
+            worker_a.progress.completed = 3
+            await worker_a.save()
+            running = await worker_b.get()
+
+            await worker_a.finish()
+            return running, await worker_b.get(), await worker_b.acquire()
+
+        with patch.object(regrade_planner, "get_redis", return_value=fake):
+            running, finished, next_run = asyncio.run(scenario())
+
+        assert running.status == "running"
+        assert running.completed == 3
+        assert running.started_at == worker_a.progress.started_at
+        assert finished.status == "completed"
+        assert next_run
+
+    def test_override_after_planning_survives_run(self):
+        """A grade overridden between planning and the run is not regraded."""
+        import asyncio
+        from contextlib import asynccontextmanager
+        from datetime import datetime
+        from app.routers import grades
+        from app.services import regrade_planner
+        from app.services.regrade_planner import RegradeItem, RegradePlan, RegradeTracker
+
+        overridden, stale = uuid4(), uuid4()
+        items = [
+            RegradeItem(
+                grade_id=uuid4(), conversation_id=conversation_id, rubric_id=uuid4(),
+                mode="graded", graded_at=datetime.utcnow(), from_version=1, to_version=2,
+                estimated_input_tokens=2000,
+            )
+            for conversation_id in (overridden, stale)
+        ]
+        tracker = RegradeTracker()
+        db = MagicMock()
+
+        @asynccontextmanager
+        async def session():
+            yield db
+
+        async def still_needs_regrade(_, conversation_id):
+            # The instructor overrode the first grade after the plan was built
+            return conversation_id != overridden
+
+        async def scenario():
+            await tracker.acquire()
+            await tracker.start(RegradePlan(items=items))
+            await grades._run_regrade_plan(items, interval_seconds=0)
+
+        with patch.object(regrade_planner, "get_redis", return_value=None), \
+             patch.object(grades, "regrade_tracker", tracker), \
+             patch.object(grades, "AsyncSessionLocal", session), \
+             patch.object(grades, "still_needs_regrade", still_needs_regrade), \
+             patch.object(grades, "_perform_grading", AsyncMock()) as perform:
+            asyncio.run(scenario())
+
+        perform.assert_awaited_once_with(stale, db, replace_existing=True)
+        assert tracker.progress.skipped == 1
+        assert tracker.progress.completed == 1
+        assert tracker.progress.estimated_tokens_remaining == 0
+        assert tracker.progress.status == "completed"
+
+    def test_still_needs_regrade_excludes_overrides_and_current(self):
+        """The recheck uses the plan's staleness rule and skips overrides."""
+        import asyncio
+        from sqlalchemy.dialects import postgresql
+        from app.services.regrade_planner import still_needs_regrade
+
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=0)
+
+        assert not asyncio.run(still_needs_regrade(db, uuid4()))
+
+        sql = str(db.scalar.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "coalesce(grades.rubric_version" in sql
+        assert "< rubrics.version" in sql
+        assert "grades.instructor_override IS false" in sql
+
+    def test_tracked_in_process_without_redis(self):
+        """Without Redis a second run in the same process is still refused."""
+        import asyncio
+        from app.services import regrade_planner
+        from app.services.regrade_planner import RegradeTracker
+
+        tracker = RegradeTracker()
+
+        async def scenario():
+            first = await tracker.acquire()
+            second = await tracker.acquire()
+            await tracker.release()
+            return first, second, await tracker.acquire()
+
+        with patch.object(regrade_planner, "get_redis", return_value=None):
+            assert asyncio.run(scenario()) == (True, False, True)
+
+    def test_progress_start_resets_counters(self):
+        """Starting a run resets counters and sums the token estimate."""
+        from datetime import datetime
+        from app.services.regrade_planner import (
+            RegradeItem,
+            RegradePlan,
+            RegradeProgress,
+        )
+
+        items = [
+            RegradeItem(
+                grade_id=uuid4(),
+                conversation_id=uuid4(),
+                rubric_id=uuid4(),
+                mode=mode,
+                graded_at=datetime.utcnow(),
+                from_version=1,
+                to_version=2,
+                estimated_input_tokens=2000,
+            )
+            for mode in ["graded", "practice"]
+        ]
+        progress = RegradeProgress(completed=5, failed=2, errors=["old"])
+
+        progress.start(RegradePlan(items=items))
+
+        assert progress.status == "running"
+        assert progress.total == 2
+        assert progress.completed == 0
+        assert progress.errors == []
+        assert progress.estimated_tokens_remaining == 2 * (2000 + 1500)
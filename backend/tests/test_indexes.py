@@ -0,0 +1,172 @@
+"""Tests for the performance indexes on hot query paths."""
+
+import importlib.util
+import json
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import Base, engine
+import app.models  # noqa: F401  (registers tables on Base.metadata)
+
+MIGRATION = (
+    Path(__file__).resolve().parents[1]
+    / "alembic" / "versions" / "3f9a1c2b7d4e_performance_indexes.py"
+)
+
+BENCH_USERS = 500
+BENCH_CONVERSATIONS = 50_000
+MESSAGES_PER_CONVERSATION = 6
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("performance_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestIndexDefinitions:
+    """The migration and the model metadata declare the same indexes."""
+
+    def test_migration_matches_models(self):
+        """Test every migration index is declared on its model's table."""
+        migration = _load_migration()
+        for name, table, _, _ in migration.INDEXES:
+            model_indexes = {ix.name for ix in Base.metadata.tables[table].indexes}
+            assert name in model_indexes, f"{name} missing from {table} model"
+
+    def test_review_queue_index_is_partial(self):
+        """Test the review queue index only covers unreviewed grades."""
+        index = next(
+            ix for ix in Base.metadata.tables["grades"].indexes
+            if ix.name == "ix_grades_needs_review"
+        )
+        where = str(index.dialect_options["postgresql"]["where"])
+        assert "instructor_override = false" in where
+        assert "ai_confidence < 0.7" in where
+
+
+@pytest.fixture(scope="module")
+def seeded_connection():
+    """A connection with a large synthetic dataset, rolled back afterwards."""
+    try:
+        conn = engine.connect()
+    except OperationalError:
+        pytest.skip("PostgreSQL is not available")
+
+    trans = conn.begin()
+    try:
+        scenario = conn.execute(text("SELECT id, rubric_id FROM scenarios LIMIT 1")).first()
+        if scenario is None:
+            pytest.skip("No scenarios; run python -m app.scripts.seed first")
+
+        conn.execute(text("""
+            INSERT INTO users (id, email, name, role, created_at)
+            SELECT gen_random_uuid(), 'idx-bench-' || i || '@example.com',
+                   'Bench ' || i, 'STUDENT'::userrole, now()
+            FROM generate_series(1, :n) i
+        """), {"n": BENCH_USERS})
+
+        conn.execute(text("""
+            INSERT INTO conversations (id, user_id, scenario_id, mode, status,
+                                       started_at, completed_at, turn_count,
+                                       ledger_message_count)
+            SELECT gen_random_uuid(), u.ids[1 + i % :users], :scenario_id,
+                   'PRACTICE'::conversationmode, 'COMPLETED'::conversationstatus, now() - i * interval '1 minute',
+                   now() - i * interval '1 minute' + interval '10 minutes', 6, 0
+            FROM generate_series(1, :n) i,
+                 (SELECT array_agg(id) AS ids FROM users
+                  WHERE email LIKE 'idx-bench-%') u
+        """), {"n": BENCH_CONVERSATIONS, "users": BENCH_USERS, "scenario_id": scenario.id})
+
+        conn.execute(text("""
+            INSERT INTO messages (id, conversation_id, role, content, created_at)
+            SELECT gen_random_uuid(), c.id, 'STUDENT'::messagerole, 'message ' || n,
+                   c.started_at + n * interval '1 minute'
+            FROM conversations c
+            JOIN users u ON u.id = c.user_id AND u.email LIKE 'idx-bench-%',
+                 generate_series(1, :per) n
+        """), {"per": MESSAGES_PER_CONVERSATION})
+
+        # About 5% of grades land in the review queue
+        conn.execute(text("""
+            INSERT INTO grades (id, conversation_id, rubric_id, criteria_scores,
+                                total_score, ai_confidence, graded_by,
+                                instructor_override, graded_at, feature_anomaly)
+            SELECT gen_random_uuid(), c.id, :rubric_id, '{}'::jsonb, 80,
+                   CASE WHEN row_number() OVER () % 20 = 0 THEN 0.55 ELSE 0.90 END,
+                   'AI'::gradedby, false, c.completed_at, false
+            FROM conversations c
+            JOIN users u ON u.id = c.user_id AND u.email LIKE 'idx-bench-%'
+        """), {"rubric_id": scenario.rubric_id})
+
+        for table in ("users", "conversations", "messages", "grades"):
+            conn.execute(text(f"ANALYZE {table}"))
+
+        yield conn
+    finally:
+        trans.rollback()
+        conn.close()
+
+
+def _plan(conn, sql: str, params: dict) -> str:
+    """Return the JSON query plan for ``sql`` as text."""
+    rows = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+    return json.dumps(rows)
+
+
+def _bench_user(conn):
+    return conn.execute(
+        text("SELECT id FROM users WHERE email = 'idx-bench-1@example.com'")
+    ).scalar()
+
+
+class TestIndexUsage:
+    """EXPLAIN the hot queries against a large dataset."""
+
+    def test_user_conversation_list_uses_index(self, seeded_connection):
+        """Test a student's newest conversations come from the composite index."""
+        plan = _plan(seeded_connection, """
+            SELECT * FROM conversations
+            WHERE user_id = :user_id
+            ORDER BY started_at DESC
+            LIMIT 20
+        """, {"user_id": _bench_user(seeded_connection)})
+        assert "ix_conversations_user_started" in plan
+
+    def test_transcript_load_uses_index(self, seeded_connection):
+        """Test loading a transcript in order uses the message index."""
+        conversation_id = seeded_connection.execute(
+            text("SELECT id FROM conversations WHERE user_id = :u LIMIT 1"),
+            {"u": _bench_user(seeded_connection)},
+        ).scalar()
+        plan = _plan(seeded_connection, """
+            SELECT * FROM messages
+            WHERE conversation_id = :conversation_id
+            ORDER BY created_at
+        """, {"conversation_id": conversation_id})
+        # messages is partitioned; each partition has its own copy of the index
+        assert "conversation_id_created_at_idx" in plan
+
+    def test_review_queue_uses_partial_index(self, seeded_connection):
+        """Test the needs-review queue reads the partial index."""
+        plan = _plan(seeded_connection, """
+            SELECT * FROM grades
+            WHERE (ai_confidence < 0.7 OR feature_anomaly = true)
+              AND instructor_override = false
+            ORDER BY feature_anomaly DESC, ai_confidence ASC, graded_at DESC
+            LIMIT 20
+        """, {})
+        assert "ix_grades_needs_review" in plan
+
+    def test_assignment_attempts_use_index(self, seeded_connection):
+        """Test counting a student's attempts at an assignment uses the index."""
+        plan = _plan(seeded_connection, """
+            SELECT * FROM conversations
+            WHERE assignment_id = :assignment_id AND user_id = :user_id
+        """, {"assignment_id": uuid4(), "user_id": _bench_user(seeded_connection)})
+        assert "ix_conversations_assignment_user" in plan
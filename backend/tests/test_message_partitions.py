@@ -0,0 +1,90 @@
+"""Tests for monthly message partition maintenance."""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.models import Message
+from app.services import message_partitions
+from app.services.message_partitions import (
+    add_months,
+    archive_partitions,
+    ensure_partitions,
+    partition_month,
+    partition_name,
+)
+
+
+def _executed(conn) -> list[str]:
+    return [str(call.args[0]) for call in conn.execute.call_args_list]
+
+
+class TestMonthHelpers:
+    """Tests for month arithmetic and naming."""
+
+    def test_add_months_crosses_years(self):
+        """Test month arithmetic wraps around year boundaries."""
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partition_name_round_trip(self):
+        """Test partition names encode their month."""
+        assert partition_name(date(2026, 3, 1)) == "messages_p202603"
+        assert partition_month("messages_p202603") == date(2026, 3, 1)
+        assert partition_month("messages_default") is None
+
+
+class TestPartitionMaintenance:
+    """Tests for creating and archiving partitions."""
+
+    def test_model_is_partitioned(self):
+        """Test the messages table is created partitioned with created_at in the key."""
+        ddl = str(CreateTable(Message.__table__).compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY RANGE (created_at)" in ddl
+        assert "PRIMARY KEY (id, created_at)" in ddl
+
+    def test_creates_missing_months_ahead(self):
+        """Test only missing months up to the horizon are created."""
+        conn = MagicMock()
+        conn.scalar.return_value = False
+        attached = ["messages_default", "messages_p202610"]
+
+        with patch.object(message_partitions, "attached_partitions", return_value=attached):
+            created = ensure_partitions(conn, months_ahead=2, today=date(2026, 10, 19))
+
+        assert created == ["messages_p202611", "messages_p202612"]
+        sql = _executed(conn)
+        assert any("PARTITION OF messages DEFAULT" in s for s in sql)
+        assert any(
+            "messages_p202612 PARTITION OF messages "
+            "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')" in s
+            for s in sql
+        )
+
+    def test_moves_stranded_rows_from_default(self):
+        """Test rows already in the default partition move to the new month."""
+        conn = MagicMock()
+        conn.scalar.return_value = True
+
+        with patch.object(message_partitions, "attached_partitions", return_value=["messages_default"]):
+            message_partitions.create_partition(conn, date(2026, 11, 5))
+
+        sql = _executed(conn)
+        assert "DETACH PARTITION messages_default" in sql[0]
+        assert "DELETE FROM messages_default" in sql[2]
+        assert "ATTACH PARTITION messages_default DEFAULT" in sql[3]
+
+    def test_archives_months_past_retention(self):
+        """Test partitions older than the retention period move to the archive schema."""
+        conn = MagicMock()
+        attached = ["messages_default", "messages_p202607", "messages_p202608", "messages_p202610"]
+
+        with patch.object(message_partitions, "attached_partitions", return_value=attached):
+            archived = archive_partitions(conn, retain_months=3, today=date(2026, 10, 19))
+
+        assert archived == ["messages_p202607"]
+        sql = _executed(conn)
+        assert "ALTER TABLE messages DETACH PARTITION messages_p202607" in sql
+        assert "ALTER TABLE messages_p202607 SET SCHEMA archive" in sql
@@ -0,0 +1,179 @@
+"""Tests for the Redis sliding-window rate limits on LLM endpoints."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.course import Course
+from app.models.scenario import Scenario
+from app.services import rate_limit as rate_limit_module
+from app.services.rate_limit import (
+    RateLimit,
+    RateLimitExceeded,
+    SlidingWindowLimiter,
+    limits_for,
+)
+
+client = TestClient(app)
+
+
+class FakeRedis:
+    """Runs the sliding-window script's logic in Python."""
+
+    def __init__(self):
+        self.windows = {}
+
+    async def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        now, member = int(argv[0]), argv[1]
+        wait = 0
+        for i, key in enumerate(keys):
+            limit, window = int(argv[2 + 2 * i]), int(argv[3 + 2 * i])
+            entries = sorted(e for e in self.windows.get(key, []) if e[0] > now - window)
+            self.windows[key] = entries
+            if len(entries) >= limit:
+                wait = max(wait, entries[len(entries) - limit][0] + window - now)
+        if wait:
+            return wait
+        for key in keys:
+            self.windows.setdefault(key, []).append((now, member))
+        return 0
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(rate_limit_module, "get_redis", return_value=fake):
+        yield fake
+
+
+def _at(seconds: float):
+    """Freeze the limiter's clock."""
+    return patch.object(rate_limit_module.time, "time", return_value=seconds)
+
+
+class TestRateLimitParsing:
+    """Tests for limit strings."""
+
+    def test_parse(self):
+        """Test counts per period, plurals and disabling."""
+        assert RateLimit.parse("20/minute") == RateLimit(20, 60)
+        assert RateLimit.parse("5/hours") == RateLimit(5, 3600)
+        assert RateLimit.parse("off") is None
+        with pytest.raises(ValueError):
+            RateLimit.parse("lots/minute")
+
+    def test_zero_rejected(self):
+        """Test a limit allowing no requests is invalid rather than sent to Redis."""
+        with pytest.raises(ValueError):
+            RateLimit.parse("0/minute")
+        scenario = Scenario(id=uuid4(), rate_limits={"message": "0/minute"})
+        assert limits_for("message", uuid4(), scenario, None)[0][1] == RateLimit(20, 60)
+
+
+class TestLimitResolution:
+    """Tests for defaults and per-course and per-scenario overrides."""
+
+    def test_scenario_overrides_course_overrides_default(self):
+        """Test the most specific limit wins and the course cap applies."""
+        user_id = uuid4()
+        course = Course(
+            id=uuid4(),
+            name="DS 101",
+            rate_limits={"message": "30/minute", "course": "100/minute"},
+        )
+        scenario = Scenario(id=uuid4(), course_id=course.id, rate_limits={"message": "5/minute"})
+
+        checks = dict(limits_for("message", user_id, scenario, course))
+
+        assert checks[f"ratelimit:message:user:{user_id}"] == RateLimit(5, 60)
+        assert checks[f"ratelimit:llm:course:{course.id}"] == RateLimit(100, 60)
+        assert dict(limits_for("start", user_id, scenario, course))[
+            f"ratelimit:start:user:{user_id}"
+        ] == RateLimit(10, 3600)
+
+    def test_without_course_only_user_limit(self):
+        """Test scenarios outside a course have no course cap."""
+        checks = limits_for("grade", uuid4(), Scenario(id=uuid4(), rate_limits=None), None)
+        assert [limit for _, limit in checks] == [RateLimit(10, 3600)]
+
+    def test_invalid_override_falls_back(self):
+        """Test a malformed override does not break the endpoint."""
+        scenario = Scenario(id=uuid4(), rate_limits={"message": "many"})
+        assert limits_for("message", uuid4(), scenario, None)[0][1] == RateLimit(20, 60)
+
+
+class TestSlidingWindow:
+    """Tests for counting requests in Redis."""
+
+    def test_blocks_over_limit_until_window_slides(self, redis):
+        """Test the limit holds and frees up as old requests age out."""
+        limiter = SlidingWindowLimiter()
+        checks = [("ratelimit:test", RateLimit(2, 60))]
+
+        with _at(1000):
+            assert asyncio.run(limiter.hit(checks)) == 0
+        with _at(1030):
+            assert asyncio.run(limiter.hit(checks)) == 0
+        with _at(1040):
+            assert asyncio.run(limiter.hit(checks)) == 20
+        with _at(1061):
+            assert asyncio.run(limiter.hit(checks)) == 0
+
+    def test_rejected_request_not_counted(self, redis):
+        """Test a request blocked by the course cap does not use the user's quota."""
+        limiter = SlidingWindowLimiter()
+        user = ("ratelimit:message:user:a", RateLimit(5, 60))
+        course = ("ratelimit:llm:course:c", RateLimit(1, 60))
+
+        with _at(1000):
+            asyncio.run(limiter.hit([course]))
+            assert asyncio.run(limiter.hit([user, course])) > 0
+
+        assert not redis.windows.get(user[0])
+
+    def test_allows_without_redis(self):
+        """Test requests pass when Redis is unavailable."""
+        with patch.object(rate_limit_module, "get_redis", return_value=None):
+            assert asyncio.run(SlidingWindowLimiter().hit([("k", RateLimit(0, 60))])) == 0
+
+    def test_check_raises_with_retry_after(self, redis):
+        """Test an over-limit user gets the seconds to wait."""
+        limiter = SlidingWindowLimiter()
+        scenario = Scenario(id=uuid4(), rate_limits={"start": "1/minute"})
+        user_id = uuid4()
+
+        with _at(1000):
+            asyncio.run(limiter.check(MagicMock(), "start", user_id, scenario))
+        with _at(1015.5), pytest.raises(RateLimitExceeded) as exc:
+            asyncio.run(limiter.check(MagicMock(), "start", user_id, scenario))
+
+        assert exc.value.retry_after_seconds == 45
+
+
+class TestRateLimitedEndpoints:
+    """Tests for the 429 response."""
+
+    def test_start_returns_429_with_retry_after(self):
+        """Test an over-limit start is refused before calling the LLM."""
+        scenario = MagicMock(id=uuid4(), persona_id=uuid4())
+        with patch(
+            "app.routers.conversations.catalog_cache.get", AsyncMock(return_value=scenario)
+        ), patch(
+            "app.routers.conversations.rate_limiter.check",
+            AsyncMock(side_effect=RateLimitExceeded("start", 12.2)),
+        ), patch(
+            "app.routers.conversations.ConversationEngine.get_opening_message", AsyncMock()
+        ) as opening:
+            response = client.post(
+                "/api/v1/conversations?user_key=student1",
+                json={"scenario_id": str(scenario.id), "context": "Churn model for retail"},
+            )
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "13"
+        opening.assert_not_awaited()
@@ -0,0 +1,128 @@
+"""Tests for read-replica routing with read-your-writes."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import pytest
+from starlette.requests import Request
+
+from app import database
+from app.database import RecentWriters, get_db, get_read_db
+from app.routers.auth import MOCK_USERS, create_access_token
+
+STUDENT1 = UUID(MOCK_USERS["student1"]["id"])
+STUDENT2 = UUID(MOCK_USERS["student2"]["id"])
+
+
+def _factory(name: str):
+    """A session factory yielding a mock session tagged with ``name``."""
+    session = MagicMock(name=name)
+    session.sync_session.info = {}
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory, session
+
+
+def _request(user_key: str = None, token: str = None) -> Request:
+    """A request authenticated by a mock user key or a bearer token."""
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    query = f"user_key={user_key}".encode() if user_key else b""
+    return Request({"type": "http", "query_string": query, "headers": headers})
+
+
+def _authenticated(user_id: UUID) -> Request:
+    """A request on which get_authenticated_user already ran."""
+    request = _request()
+    request.state.user_id = user_id
+    return request
+
+
+async def _resolve(dependency, request: Request):
+    """Run a generator dependency to completion and return its session."""
+    gen = dependency(request)
+    session = await gen.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+    return session
+
+
+@pytest.fixture
+def sessions():
+    """Patch primary and replica factories and start with no recent writers."""
+    primary_factory, primary = _factory("primary")
+    replica_factory, replica = _factory("replica")
+    writers = RecentWriters(window_seconds=60)
+    with patch.object(database, "AsyncSessionLocal", primary_factory), \
+         patch.object(database, "ReadSessionLocal", replica_factory), \
+         patch.object(database, "recent_writers", writers):
+        yield primary, replica, writers
+
+
+class TestRecentWriters:
+    """Tests for the read-your-writes tracker."""
+
+    def test_marked_user_is_recent(self):
+        """Test a user is recent after a write and others are not."""
+        writers = RecentWriters(window_seconds=60)
+        writers.mark(STUDENT1)
+        assert writers.is_recent(STUDENT1)
+        assert not writers.is_recent(STUDENT2)
+
+    def test_window_expires(self):
+        """Test a write stops pinning reads once the window passes."""
+        writers = RecentWriters(window_seconds=0)
+        writers.mark(STUDENT1)
+        assert not writers.is_recent(STUDENT1)
+
+
+class TestReadRouting:
+    """Tests for the session dependencies."""
+
+    def test_reads_go_to_replica(self, sessions):
+        """Test read-only endpoints use the replica by default."""
+        _, replica, _ = sessions
+        assert asyncio.run(_resolve(get_read_db, _request("student1"))) is replica
+
+    def test_recent_writer_reads_primary(self, sessions):
+        """Test a user who just wrote reads from the primary."""
+        primary, _, writers = sessions
+        writers.mark(STUDENT1)
+        assert asyncio.run(_resolve(get_read_db, _request("student1"))) is primary
+        assert asyncio.run(_resolve(get_read_db, _request("student2"))) is not primary
+
+    def test_token_users_tracked_separately(self, sessions):
+        """Test one token user's write does not pin another's reads."""
+        primary, _, writers = sessions
+        writers.mark(STUDENT1)
+        student1 = create_access_token({"sub": str(STUDENT1)})
+        student2 = create_access_token({"sub": str(STUDENT2)})
+
+        assert asyncio.run(_resolve(get_read_db, _request(token=student1))) is primary
+        assert asyncio.run(_resolve(get_read_db, _request(token=student2))) is not primary
+
+    def test_commit_marks_user(self, sessions):
+        """Test committing through get_db pins the user's reads to the primary."""
+        primary, _, writers = sessions
+        primary.sync_session.info["committed"] = True
+
+        asyncio.run(_resolve(get_db, _authenticated(STUDENT2)))
+
+        assert writers.is_recent(STUDENT2)
+        assert not writers.is_recent(STUDENT1)
+
+    def test_no_commit_does_not_mark(self, sessions):
+        """Test read-only use of get_db leaves the user on the replica."""
+        _, _, writers = sessions
+        asyncio.run(_resolve(get_db, _authenticated(STUDENT2)))
+        assert not writers.is_recent(STUDENT2)
+
+    def test_no_replica_uses_primary(self, sessions):
+        """Test everything reads from the primary when no replica is set."""
+        primary, _, _ = sessions
+        with patch.object(database, "ReadSessionLocal", None):
+            assert asyncio.run(_resolve(get_read_db, _request("student1"))) is primary
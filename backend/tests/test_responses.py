@@ -0,0 +1,137 @@
+"""Tests for fast JSON rendering and response compression."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.main import app
+from app.models.conversation import ConversationMode, ConversationStatus, Message, MessageRole
+from app.routers.auth import MOCK_USERS
+from app.schemas.conversation import ConversationResponse, MessageResponse
+from app.services.responses import CompressionMiddleware, trusted_response
+
+client = TestClient(app)
+
+
+def _messages(count: int) -> list[Message]:
+    start = datetime(2026, 3, 1, 9, 0, 0, 250000)
+    return [
+        Message(
+            id=uuid4(),
+            role=MessageRole.STUDENT if i % 2 == 0 else MessageRole.STAKEHOLDER,
+            content=f"Turn {i}: what does a false positive cost the retention team?",
+            created_at=start + timedelta(seconds=30 * i),
+        )
+        for i in range(count)
+    ]
+
+
+def _get_conversation(messages, headers=None):
+    conversation = MagicMock(
+        id=uuid4(),
+        user_id=UUID(MOCK_USERS["student1"]["id"]),
+        scenario_id=uuid4(),
+        mode=ConversationMode.PRACTICE,
+        status=ConversationStatus.IN_PROGRESS,
+        context="Churn model for a subscription retailer",
+        turn_count=len(messages) // 2,
+        started_at=datetime(2026, 3, 1, 9, 0),
+        completed_at=None,
+    )
+    db = MagicMock()
+    db.get = AsyncMock(return_value=conversation)
+    db.scalars = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=messages)))
+    persona = MagicMock(title="VP Sales")
+    persona.name = "Dana"
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with patch(
+            "app.routers.conversations.catalog_cache.get", AsyncMock(return_value=persona)
+        ):
+            response = client.get(
+                f"/api/v1/conversations/{conversation.id}?user_key=student1",
+                headers=headers or {},
+            )
+    finally:
+        app.dependency_overrides.clear()
+    return conversation, response
+
+
+class TestTrustedResponse:
+    """Tests for rendering rows without revalidation."""
+
+    def test_conversation_matches_validated_response(self):
+        """Test the fast path renders exactly what the response model would."""
+        messages = _messages(200)
+        conversation, response = _get_conversation(messages)
+
+        expected = ConversationResponse(
+            id=conversation.id,
+            scenario_id=conversation.scenario_id,
+            persona_name="Dana",
+            persona_title="VP Sales",
+            mode="practice",
+            status="in_progress",
+            context=conversation.context,
+            turn_count=conversation.turn_count,
+            started_at=conversation.started_at,
+            messages=[
+                MessageResponse(id=m.id, role=m.role.value, content=m.content, created_at=m.created_at)
+                for m in messages
+            ],
+        )
+        assert response.status_code == 200
+        assert response.json() == expected.model_dump(mode="json")
+
+    def test_keeps_endpoint_headers(self):
+        """Test headers set on the injected response survive."""
+        injected = Response()
+        injected.headers["ETag"] = 'W/"abc"'
+
+        result = trusted_response({"id": uuid4()}, injected)
+
+        assert result.headers["etag"] == 'W/"abc"'
+        assert result.media_type == "application/json"
+
+
+class TestCompression:
+    """Tests for gzip negotiation."""
+
+    def test_large_response_gzipped_when_accepted(self):
+        """Test a long transcript is gzipped for clients that accept it."""
+        _, gzipped = _get_conversation(_messages(200), {"Accept-Encoding": "gzip"})
+        _, plain = _get_conversation(_messages(200), {"Accept-Encoding": "identity"})
+
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in gzipped.headers["vary"].lower()
+        assert int(gzipped.headers["content-length"]) < len(plain.content) / 3
+        assert "content-encoding" not in plain.headers
+
+    def test_small_response_not_gzipped(self):
+        """Test responses under the threshold are sent as they are."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_event_streams_not_gzipped(self):
+        """Test server-sent events are not buffered in a gzip stream."""
+        stream_app = FastAPI()
+        stream_app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+        @stream_app.get("/events")
+        async def events():
+            async def body():
+                for i in range(50):
+                    yield f"data: event {i}\n\n"
+
+            return StreamingResponse(body(), media_type="text/event-stream")
+
+        response = TestClient(stream_app).get(
+            "/events", headers={"Accept": "text/event-stream", "Accept-Encoding": "gzip"}
+        )
+        assert "content-encoding" not in response.headers
+        assert "data: event 49" in response.text
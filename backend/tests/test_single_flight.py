@@ -0,0 +1,253 @@
+"""Tests for single-flight coalescing of expensive shared reads."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.database import get_read_db
+from app.main import app
+from app.routers import assignments
+from app.services import single_flight as flight_module
+from app.services.metrics import metrics
+from app.services.single_flight import SingleFlight
+
+
+class FakeRedis:
+    """Locks and results shared by every "worker" in a test."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, *keys):
+        return [self.data.get(k) for k in keys]
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(flight_module, "get_redis", return_value=fake):
+        metrics.reset()
+        yield fake
+
+
+class Compute:
+    """Counts computations and can be slowed down to overlap calls."""
+
+    def __init__(self, delay: float = 0.02, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("query failed")
+        return {"result": self.calls}
+
+
+class TestInProcess:
+    """Tests for coalescing within one worker."""
+
+    def test_concurrent_calls_share_one_computation(self):
+        """Test identical concurrent calls run once and share the result."""
+        metrics.reset()
+        flight = SingleFlight("test_flight")
+        compute = Compute()
+
+        async def scenario():
+            return await asyncio.gather(*[flight.do("k", compute) for _ in range(10)])
+
+        results = asyncio.run(scenario())
+
+        assert compute.calls == 1
+        assert all(r == {"result": 1} for r in results)
+        assert flight.stats()["shared"] == 9
+
+    def test_different_keys_not_shared(self):
+        """Test calls with different parameters compute separately."""
+        flight = SingleFlight("test_flight")
+        compute = Compute()
+
+        async def scenario():
+            return await asyncio.gather(flight.do("a", compute), flight.do("b", compute))
+
+        asyncio.run(scenario())
+        assert compute.calls == 2
+
+    def test_nothing_kept_afterwards(self):
+        """Test a later call computes again."""
+        flight = SingleFlight("test_flight")
+        compute = Compute(delay=0)
+
+        asyncio.run(flight.do("k", compute))
+        asyncio.run(flight.do("k", compute))
+
+        assert compute.calls == 2
+
+    def test_failure_reaches_every_caller(self):
+        """Test waiters see the error and the next call retries."""
+        flight = SingleFlight("test_flight")
+
+        async def scenario():
+            results = await asyncio.gather(
+                *[flight.do("k", Compute(fail=True)) for _ in range(3)], return_exceptions=True
+            )
+            return results, await flight.do("k", Compute())
+
+        results, retry = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert retry == {"result": 1}
+
+    def test_cancelled_caller_does_not_cancel_waiters(self):
+        """Test a waiter computes the result itself when the first caller goes away."""
+        flight = SingleFlight("test_flight")
+        first, second, third = Compute(delay=0.1), Compute(), Compute()
+
+        async def scenario():
+            leader = asyncio.create_task(flight.do("k", first))
+            await asyncio.sleep(0.01)
+            waiters = asyncio.gather(flight.do("k", second), flight.do("k", third))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await waiters, leader
+
+        results, leader = asyncio.run(scenario())
+
+        assert leader.cancelled()
+        assert results == [{"result": 1}, {"result": 1}]
+        assert second.calls + third.calls == 1
+
+    def test_cancelled_waiter_does_not_cancel_computation(self):
+        """Test a waiter going away leaves the computation to the others."""
+        flight = SingleFlight("test_flight")
+        compute = Compute(delay=0.05)
+
+        async def scenario():
+            leader = asyncio.create_task(flight.do("k", compute))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(flight.do("k", compute))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            return await leader, waiter
+
+        result, waiter = asyncio.run(scenario())
+
+        assert waiter.cancelled()
+        assert result == {"result": 1}
+        assert compute.calls == 1
+
+
+class TestAcrossWorkers:
+    """Tests for coalescing across workers with a Redis lock."""
+
+    def test_follower_uses_leader_result(self, redis):
+        """Test a second worker waits for the first instead of recomputing."""
+        worker_a = SingleFlight("test_shared", distributed=True)
+        worker_b = SingleFlight("test_shared", distributed=True)
+        compute_a, compute_b = Compute(delay=0.1), Compute()
+
+        async def scenario():
+            leader = asyncio.create_task(worker_a.do("k", compute_a))
+            await asyncio.sleep(0.01)
+            return await asyncio.gather(leader, worker_b.do("k", compute_b))
+
+        results = asyncio.run(scenario())
+
+        assert results == [{"result": 1}, {"result": 1}]
+        assert compute_b.calls == 0
+        assert worker_a.stats()["shared_across_workers"] == 1
+        # The lock is released; only the short-lived result remains
+        assert list(redis.data) == [k for k in redis.data if ":result:" in k]
+
+    def test_follower_computes_if_leader_fails(self, redis):
+        """Test a failed leader does not leave other workers without a result."""
+        worker_a = SingleFlight("test_shared", distributed=True)
+        worker_b = SingleFlight("test_shared", distributed=True)
+
+        async def scenario():
+            leader = asyncio.create_task(worker_a.do("k", Compute(delay=0.1, fail=True)))
+            await asyncio.sleep(0.01)
+            follower = await worker_b.do("k", Compute())
+            with pytest.raises(RuntimeError):
+                await leader
+            return follower
+
+        assert asyncio.run(scenario()) == {"result": 1}
+
+    def test_without_redis(self):
+        """Test each worker computes when Redis is unavailable."""
+        with patch.object(flight_module, "get_redis", return_value=None):
+            result = asyncio.run(SingleFlight("test_shared", distributed=True).do("k", Compute()))
+        assert result == {"result": 1}
+
+
+class TestCoalescedEndpoints:
+    """Tests for endpoints built through single-flight."""
+
+    def test_assignment_list_shared_by_concurrent_instructors(self):
+        """Test instructors loading the list together trigger one build."""
+        item = MagicMock(model_dump=MagicMock(return_value={"id": str(uuid4())}))
+
+        async def slow_list(*args):
+            await asyncio.sleep(0.05)
+            return [item]
+
+        app.dependency_overrides[get_read_db] = lambda: MagicMock()
+        try:
+            with patch.object(flight_module, "get_redis", return_value=None), patch.object(
+                assignments, "_list_assignments", AsyncMock(side_effect=slow_list)
+            ) as build:
+
+                async def scenario():
+                    transport = httpx.ASGITransport(app=app)
+                    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+                        return await asyncio.gather(
+                            *[c.get("/api/v1/assignments?user_key=instructor") for _ in range(5)]
+                        )
+
+                responses = asyncio.run(scenario())
+        finally:
+            app.dependency_overrides.clear()
+
+        assert all(r.status_code == 200 for r in responses)
+        assert all(r.json() == [item.model_dump.return_value] for r in responses)
+        build.assert_awaited_once()
+
+    def test_assignment_list_counts_in_one_query(self):
+        """Test submission counts for every assignment come from one grouped query."""
+        listed = [MagicMock(id=uuid4(), title=f"Pitch {i}", due_date=None, max_attempts=3,
+                            is_active=True) for i in range(3)]
+        db = MagicMock()
+        db.scalars = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=listed)))
+        db.execute = AsyncMock(return_value=MagicMock(
+            all=MagicMock(return_value=[(listed[0].id, 4, 3), (listed[2].id, 1, 0)])
+        ))
+        persona = MagicMock()
+        persona.name = "Dana"
+
+        with patch.object(assignments.catalog_cache, "get", AsyncMock(return_value=persona)):
+            items = asyncio.run(assignments._list_assignments(db, None, False))
+
+        db.scalars.assert_awaited_once()
+        db.execute.assert_awaited_once()
+        assert "GROUP BY conversations.assignment_id" in str(db.execute.await_args.args[0])
+        assert [(i.total_submissions, i.graded_submissions) for i in items] == [(4, 3), (0, 0), (1, 0)]
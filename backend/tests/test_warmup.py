@@ -0,0 +1,135 @@
+"""Tests for startup warmup, compiled prompts and readiness gating."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.main import app
+from app.models.persona import Persona
+from app.models.rubric import Rubric
+from app.services import warmup
+from app.services.conversation_engine import ConversationEngine, _compile_prompt
+from app.services.grading_engine import criteria_text
+from app.services.warmup import run_warmup, warmup_state
+
+client = TestClient(app)
+
+
+def _persona(name: str = "Dana") -> Persona:
+    return Persona(
+        id=uuid4(),
+        name=name,
+        title="VP Sales",
+        background="Runs a team of 40",
+        personality="Blunt",
+        concerns=["cost"],
+        required_questions=["What does it save us?"],
+    )
+
+
+class TestCompiledPrompts:
+    """Tests for prompt text compiled once and reused."""
+
+    def test_persona_prompt_compiled_once(self):
+        """Test turns for the same persona reuse the compiled prompt."""
+        _compile_prompt.cache_clear()
+        persona = _persona()
+
+        first = ConversationEngine(persona, "Churn model", llm_client=MagicMock())
+        second = ConversationEngine(persona, "Fraud model", llm_client=MagicMock())
+        prompts = first.build_system_prompt(), second.build_system_prompt()
+
+        assert "Churn model" in prompts[0] and "Fraud model" in prompts[1]
+        assert "You are Dana, VP Sales" in prompts[0]
+        assert _compile_prompt.cache_info().misses == 1
+        assert _compile_prompt.cache_info().hits == 1
+
+    def test_criteria_text_follows_rubric_version(self):
+        """Test criteria text is reused until the rubric version changes."""
+        criterion = {"name": "clarity", "display_name": "Clarity", "max_points": 10}
+        rubric = Rubric(id=uuid4(), name="R", criteria=[criterion], version=1)
+        assert "Clarity (10 points)" in criteria_text(rubric)
+
+        edited = Rubric(id=rubric.id, name="R", criteria=[dict(criterion, max_points=20)], version=2)
+        assert "Clarity (20 points)" in criteria_text(edited)
+
+
+@pytest.fixture
+def steps():
+    """Replace the warmup steps with mocks."""
+    with patch.object(warmup, "open_pools", AsyncMock(return_value={"primary": 5})) as pools, \
+            patch.object(warmup, "preload_catalog", AsyncMock(return_value={"personas": 2})) as catalog:
+        yield pools, catalog
+    warmup_state.reset()
+
+
+class TestRunWarmup:
+    """Tests for the warmup sequence."""
+
+    def test_marks_ready_with_step_results(self, steps):
+        """Test every step runs and the worker becomes ready."""
+        warmup_state.reset()
+        assert not warmup_state.ready
+
+        state = asyncio.run(run_warmup(include_llm=False))
+
+        assert state.ready
+        assert state.steps["db_pool"]["primary"] == 5
+        assert state.steps["catalog"]["personas"] == 2
+        assert "llm" not in state.steps
+
+    def test_failed_step_does_not_block_readiness(self, steps):
+        """Test a failing step is recorded and later steps still run."""
+        pools, catalog = steps
+        pools.side_effect = ConnectionRefusedError("db down")
+
+        state = asyncio.run(run_warmup(include_llm=False))
+
+        assert state.ready
+        assert "db down" in state.steps["db_pool"]["error"]
+        catalog.assert_awaited_once()
+
+    def test_hanging_step_times_out(self, steps):
+        """Test a step that never finishes is cut off."""
+        pools, _ = steps
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        pools.side_effect = hang
+
+        with patch.object(warmup.get_settings(), "warmup_timeout_seconds", 0.05):
+            state = asyncio.run(run_warmup(include_llm=False))
+
+        assert state.ready
+        assert state.steps["db_pool"] == {"error": "timed out"}
+
+
+class TestReadiness:
+    """Tests for /health/ready gating on warmup."""
+
+    def _ready(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        app.dependency_overrides[get_db] = lambda: db
+        try:
+            return client.get("/health/ready")
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_not_ready_until_warmup_finishes(self, steps):
+        """Test a worker reports 503 while warming up and 200 after."""
+        warmup_state.reset()
+        response = self._ready()
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+
+        asyncio.run(run_warmup(include_llm=False))
+
+        response = self._ready()
+        assert response.status_code == 200
+        assert response.json()["warmup"]["ready"] is True